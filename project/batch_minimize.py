@@ -0,0 +1,283 @@
+import os
+import glob
+import json
+import time
+import shlex
+import getopt
+import logging
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from typing import Callable, Optional, TextIO
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from parse_sum_of_products_input import parse_sop_minterms
+from format_sum_of_products import format_sum_of_products, parse_label_input
+from generate_prime_implicants import format_bitmask_implicant
+from quine_mccluskey import load_input_file, minimize_minterms
+from solve_limits import SolveLimits, solving_within, solve_limits_for, parse_time_limit, parse_memory_size
+
+logger = get_logger(__name__)
+
+
+def collect_batch_jobs(
+        batchSource: str,
+        defaults: dict[str, any]
+    ) -> list[dict[str, any]]:
+
+    """
+    Turn a batch source into a list of jobs. The source is either a directory (every truth table directly inside
+    it), a glob pattern, or a manifest file. Each manifest line describes one job with the same flags as a single
+    run, e.g. `tables/adder.csv -s petrick` or `-m 0,1,5 -d 7 -n 3 -l a,b,c`; blank lines and `#` comments are
+    skipped, relative paths are resolved against the manifest's directory.
+    Solver, engine, strategy, labels, result cache use and time and memory limits of the command line are the
+    defaults of every job, the limits apply to each job on its own.
+    """
+
+    batchSource = os.path.expanduser(batchSource)
+    inputExtensions: list[str] = ALLOWED_EXTENSIONS + [BINARY_EXTENSION]
+    jobDefaults: dict[str, any] = {
+        "labels": defaults.get("labels"),
+        "solver": defaults.get("solver", "branch-and-bound"),
+        "engine": defaults.get("engine", "exact"),
+        "strategy": defaults.get("strategy", "hash"),
+        "cache": defaults.get("cache", False),
+        "timeLimit": defaults.get("timeLimit"),
+        "memoryLimit": defaults.get("memoryLimit")
+    }
+
+    jobs: list[dict[str, any]] = []
+
+    if os.path.isdir(batchSource) or glob.has_magic(batchSource):
+        if os.path.isdir(batchSource):
+            paths: list[str] = [os.path.join(batchSource, entry) for entry in os.listdir(batchSource)]
+        else:
+            paths = glob.glob(batchSource)
+        for path in sorted(paths):
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in inputExtensions:
+                jobs.append({**jobDefaults, "name": path, "path": path})
+
+    elif os.path.isfile(batchSource):
+        manifestDirectory: str = os.path.dirname(os.path.abspath(batchSource))
+        with open(batchSource, "r") as f:
+            for lineNumber, line in enumerate(f, start = 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                jobs.append(parse_manifest_line(line, lineNumber, manifestDirectory, jobDefaults))
+
+    else:
+        raise FileNotFoundError(f"Batch source `{batchSource}` is not a directory, glob or manifest file.")
+
+    if not jobs:
+        raise ValueError(f"Batch source `{batchSource}` holds no jobs.")
+
+    logger.info("Collected %d batch jobs from `%s`", len(jobs), batchSource)
+
+    return jobs
+
+
+def parse_manifest_line(
+        line: str,
+        lineNumber: int,
+        manifestDirectory: str,
+        jobDefaults: dict[str, any]
+    ) -> dict[str, any]:
+
+    try:
+        jobArguments: list[str] = shlex.split(line)
+    except ValueError as e:
+        raise SyntaxError(f"Manifest line {lineNumber}: {e}")
+
+    return parse_job_arguments(jobArguments, f"Manifest line {lineNumber}", f"line {lineNumber}", manifestDirectory, jobDefaults)
+
+
+def parse_job_arguments(
+        jobArguments: list[str],
+        context: str,
+        jobName: str,
+        baseDirectory: str,
+        jobDefaults: dict[str, any]
+    ) -> dict[str, any]:
+
+    # The flags of a single run, as found on a manifest line or sent to the daemon. `context` prefixes the errors
+    try:
+        options, arguments = getopt.gnu_getopt(jobArguments, BATCH_JOB_OPTIONS, BATCH_JOB_LONG_OPTIONS)
+    except getopt.GetoptError as e:
+        raise SyntaxError(f"{context}: {e}")
+
+    job: dict[str, any] = {**jobDefaults, "name": jobName, "path": None, "minterms": None, "dontcares": None, "inputs": None}
+
+    for argument, value in options:
+        if argument in ("-m", "--minterms"):
+            job["minterms"] = value
+        elif argument in ("-d", "--dontcares"):
+            job["dontcares"] = value
+        elif argument in ("-l", "--labels"):
+            job["labels"] = value
+        elif argument in ("-n", "--inputs"):
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"{context}: input count `{value}` must be a positive integer.")
+            job["inputs"] = int(value)
+        elif argument in ("-s", "--solver"):
+            if value not in COVER_SOLVERS:
+                raise ValueError(f"{context}: solver `{value}` not supported, must be one of: {COVER_SOLVERS}")
+            job["solver"] = value
+        elif argument in ("-e", "--engine"):
+            if value not in MINIMIZATION_ENGINES:
+                raise ValueError(f"{context}: engine `{value}` not supported, must be one of: {MINIMIZATION_ENGINES}")
+            job["engine"] = value
+        elif argument == "--strategy":
+            if value not in COMBINATION_STRATEGIES:
+                raise ValueError(f"{context}: combination strategy `{value}` not supported, must be one of: {COMBINATION_STRATEGIES}")
+            job["strategy"] = value
+        elif argument == "--no-cache":
+            job["cache"] = False
+        elif argument == "--time-limit":
+            try:
+                job["timeLimit"] = parse_time_limit(value)
+            except ValueError as e:
+                raise ValueError(f"{context}: {e}")
+        elif argument == "--memory-limit":
+            try:
+                job["memoryLimit"] = parse_memory_size(value)
+            except ValueError as e:
+                raise ValueError(f"{context}: {e}")
+
+    if job["minterms"] is not None:
+        if arguments:
+            raise SyntaxError(f"{context}: a job takes either an input file or minterms, not both.")
+    elif len(arguments) == 1:
+        job["path"] = os.path.join(baseDirectory, os.path.expanduser(arguments[0]))
+        job["name"] = arguments[0]
+    else:
+        raise SyntaxError(f"{context}: expected one input file or `-m` minterms.")
+
+    return job
+
+
+def run_batch(
+        jobs: list[dict[str, any]],
+        workers: int,
+        output: TextIO
+    ) -> int:
+
+    """
+    Minimize every job, in a pool of `workers` processes when more than one is asked for, and write one JSON line
+    per job to `output` as soon as it finishes. A failing job is reported in its line and does not stop the batch,
+    neither does a worker process dying: the jobs it took down are reported as failed and the pool is restarted.
+    Returns the number of failed jobs.
+    """
+
+    batchStart: float = time.perf_counter()
+    failed: int = 0
+
+    def emit(result: dict[str, any]) -> None:
+        nonlocal failed
+        if result["status"] != "ok":
+            failed += 1
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        silence_batch_logging()
+        for index, job in enumerate(jobs):
+            emit(run_batch_job(index, job))
+    else:
+        # Only a few jobs per worker are in flight at once, so huge manifests do not queue up in memory
+        jobIterator = iter(enumerate(jobs))
+        poolBroken: bool = True
+        while poolBroken:
+            poolBroken = False
+            pending: dict[Future, tuple[int, dict[str, any]]] = {}
+            with ProcessPoolExecutor(max_workers = workers, initializer = silence_batch_logging) as executor:
+                while not poolBroken:
+                    for index, job in jobIterator:
+                        pending[executor.submit(run_batch_job, index, job)] = (index, job)
+                        if len(pending) >= workers * PARALLEL_TASKS_PER_WORKER:
+                            break
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when = FIRST_COMPLETED)
+                    for future in done:
+                        poolBroken = emit_batch_future(future, *pending.pop(future), emit) or poolBroken
+                    if poolBroken:
+                        # A dead worker takes every job in flight with it, those that finished before keep their result
+                        for future in wait(pending).done:
+                            emit_batch_future(future, *pending[future], emit)
+            if poolBroken:
+                logger.warning("A batch worker died, the remaining jobs go to a new pool")
+
+    logger.warning("Batch finished: %d jobs, %d failed, %.3fs", len(jobs), failed, time.perf_counter() - batchStart)
+
+    return failed
+
+
+def emit_batch_future(
+        future: Future,
+        index: int,
+        job: dict[str, any],
+        emit: Callable[[dict[str, any]], None]
+    ) -> bool:
+
+    # `run_batch_job` reports its own errors, what is left is the pool failing, returns whether the pool broke
+    try:
+        result: dict[str, any] = future.result()
+    except Exception as e:
+        emit({"index": index, "job": job["name"], "status": "error", "error": f"{type(e).__name__}: {e}"})
+        return isinstance(e, BrokenProcessPool)
+
+    emit(result)
+    return False
+
+
+def run_batch_job(
+        index: int,
+        job: dict[str, any]
+    ) -> dict[str, any]:
+
+    # Everything that goes wrong inside a job is reported in its result instead of raised
+    result: dict[str, any] = {"index": index, "job": job["name"]}
+    jobStart: float = time.perf_counter()
+
+    try:
+        fileLabels: Optional[list[str]] = None
+        if job["path"] is not None:
+            mintermLength, onset, dontCares, fileLabels = load_input_file(job["path"])
+        else:
+            mintermLength, onset, dontCares = parse_sop_minterms(job["minterms"], job["dontcares"], job["inputs"])
+        loadSeconds: float = time.perf_counter() - jobStart
+
+        # The limits count from here like in a single run, loading the job is not part of them
+        limits: Optional[SolveLimits] = solve_limits_for(job.get("timeLimit"), job.get("memoryLimit"))
+        with solving_within(limits):
+            cover: list[tuple[int, int]] = minimize_minterms(onset, dontCares, mintermLength, job["solver"], job["engine"], 1, job["strategy"], job["cache"])
+        minimizeSeconds: float = time.perf_counter() - jobStart - loadSeconds
+        limitReached: Optional[str] = limits.limitReached if limits is not None else None
+
+        labels: Optional[list[str]] = parse_label_input(job["labels"]) if job["labels"] else fileLabels
+        result.update({
+            "status": "ok",
+            "inputs": mintermLength,
+            "sop": format_sum_of_products(cover, mintermLength, labels),
+            "cubes": [format_bitmask_implicant(value, mask, mintermLength) for value, mask in cover],
+            "optimal": job["engine"] == "exact" and limitReached is None,
+            "limit_reached": limitReached,
+            "load_seconds": round(loadSeconds, 6),
+            "minimize_seconds": round(minimizeSeconds, 6)
+        })
+    except Exception as e:
+        result.update({
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}"
+        })
+
+    result["seconds"] = round(time.perf_counter() - jobStart, 6)
+
+    return result
+
+
+def silence_batch_logging() -> None:
+
+    # Per-job info logs would cost more than most jobs, only warnings and errors get through
+    logging.disable(INFO)
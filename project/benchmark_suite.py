@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: minimizes seeded random functions over a sweep of input counts, on-set densities and don't care
+ratios, times every stage of each pipeline, records peak memory and writes everything as JSON.
+
+Pipelines:
+    current    streamed parse, bitmask prime implicants, cover selection
+    heuristic  streamed parse, Espresso style heuristic
+    minimize   streamed parse, `minimize_minterms` with its library, NP and exact paths (no result cache)
+    legacy     `sanitize_file_input` (parse, sort and fill), `recursive_generate_prime_implicants`
+
+Wide sparse cases (`--wide`, inputs:minterms pairs, empty for none) add a few functions with many inputs and few
+minterms after the sweep, where prime generation finds little to merge and the heuristic has a large off-set.
+
+The old/old_quine_mccluskey.py implementation is not benchmarked, it fails on its first combining round.
+
+Usage: benchmark_suite.py [--inputs=3-8] [--densities=0.25,0.5] [--dontcares=0,0.1] [--samples=3] [--seed=1]
+                          [--legacy-max-inputs=8] [--wide=16:8000,20:2000] [--no-memory] [--output=results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import getopt
+import random
+import logging
+import platform
+import tempfile
+import tracemalloc
+from logger_setup import get_logger, configure_logging
+from logging import *
+from global_constants import *
+from statistics import median
+from typing import Callable, Optional
+from sanitize_qm_input import sanitize_file_input, stream_truth_table
+from generate_prime_implicants import generate_prime_implicants_bitmask, recursive_generate_prime_implicants
+from select_minimum_cover import select_minimum_cover
+from espresso_heuristic import espresso_minimize
+from quine_mccluskey import minimize_minterms
+
+logger = get_logger(__name__)
+
+BENCHMARK_OPTIONS: str = "o:h"
+BENCHMARK_LONG_OPTIONS: list[str] = ["inputs=", "densities=", "dontcares=", "samples=", "seed=", "legacy-max-inputs=", "wide=", "no-memory", "output=", "help"]
+WIDE_SPARSE_CASES: list[tuple[int, int]] = [(16, 8000), (20, 2000)]
+
+
+def generate_random_function(
+        rng: random.Random,
+        mintermLength: int,
+        density: float,
+        dontCareRatio: float
+    ) -> tuple[list[int], list[int]]:
+
+    """
+    Random function with round(2^n * density) on-set and round(2^n * dontCareRatio) don't care minterms, the rest
+    being the off-set. The same generator state always gives the same function.
+    """
+
+    rowCount: int = 1 << mintermLength
+    onsetCount: int = min(rowCount, round(rowCount * density))
+    dontCareCount: int = min(rowCount - onsetCount, round(rowCount * dontCareRatio))
+    chosen: list[int] = rng.sample(range(rowCount), onsetCount + dontCareCount)
+
+    return sorted(chosen[:onsetCount]), sorted(chosen[onsetCount:])
+
+
+def write_truth_table(
+        filePath: str,
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int
+    ) -> None:
+
+    onsetSet: set[int] = set(onset)
+    dontCareSet: set[int] = set(dontCares)
+    with open(filePath, "w") as f:
+        for minterm in range(1 << mintermLength):
+            output: str = "1" if minterm in onsetSet else "x" if minterm in dontCareSet else "0"
+            f.write(",".join(format(minterm, f"0{mintermLength}b")) + "," + output + "\n")
+
+
+def run_stages(
+        stages: list[tuple[str, Callable]],
+        measureMemory: bool
+    ) -> dict[str, any]:
+
+    """
+    Run the stages in order, each one getting the previous result, and time every one of them. With memory
+    measurement on, the whole chain is run a second time under `tracemalloc` so that tracing does not distort the
+    times. Returns the stage times, the total, the peak traced memory and the last stage's result, or the error.
+    """
+
+    record: dict[str, any] = {"stages": {}}
+    result: any = None
+    try:
+        start: float = time.perf_counter()
+        for name, stage in stages:
+            stageStart: float = time.perf_counter()
+            result = stage(result)
+            record["stages"][name] = round(time.perf_counter() - stageStart, 6)
+        record["seconds"] = round(time.perf_counter() - start, 6)
+
+        if measureMemory:
+            tracemalloc.start()
+            try:
+                traced: any = None
+                for _, stage in stages:
+                    traced = stage(traced)
+                record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    record["result"] = result
+    return record
+
+
+def benchmark_function(
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int,
+        tablePath: str,
+        runLegacy: bool,
+        measureMemory: bool
+    ) -> dict[str, dict[str, any]]:
+
+    pipelines: dict[str, list[tuple[str, Callable]]] = {
+        "current": [
+            ("parse", lambda _: stream_truth_table(tablePath)),
+            ("primes", lambda loaded: (loaded[1], generate_prime_implicants_bitmask(loaded[1], loaded[2], loaded[0]))),
+            ("cover", lambda primes: (primes[1], select_minimum_cover(primes[1], len(primes[0]), mintermLength)))
+        ],
+        "heuristic": [
+            ("parse", lambda _: stream_truth_table(tablePath)),
+            ("cover", lambda loaded: espresso_minimize(loaded[1], loaded[2], loaded[0]))
+        ],
+        "minimize": [
+            ("parse", lambda _: stream_truth_table(tablePath)),
+            ("cover", lambda loaded: minimize_minterms(loaded[1], loaded[2], loaded[0]))
+        ]
+    }
+    if runLegacy:
+        pipelines["legacy"] = [
+            ("parse_sort_fill", lambda _: sanitize_file_input(tablePath)),
+            ("primes", lambda table: recursive_generate_prime_implicants(table, mintermLength))
+        ]
+
+    records: dict[str, dict[str, any]] = {}
+    for name, stages in pipelines.items():
+        records[name] = run_stages(stages, measureMemory)
+
+    # Results are compared here and only summaries kept, the raw results do not go into the JSON
+    exactPrimes: Optional[set[tuple[int, int]]] = None
+    if "result" in records["current"]:
+        primeImplicants, cover = records["current"]["result"]
+        exactPrimes = {(value, mask) for value, mask, _ in primeImplicants}
+        records["current"]["primes"] = len(exactPrimes)
+        records["current"]["result"] = cover
+
+    for name, record in records.items():
+        result: any = record.pop("result", None)
+        if "error" in record:
+            continue
+        if name in ("current", "heuristic", "minimize"):
+            record["cubes"] = len(result)
+            record["literals"] = sum(mintermLength - mask.bit_count() for _, mask in result)
+            record["valid"] = cover_is_valid(result, onset, dontCares, mintermLength)
+        elif name == "legacy":
+            legacyPrimes: set[tuple[int, int]] = {row_to_cube(row, mintermLength) for row in result}
+            record["primes"] = len(legacyPrimes)
+            record["matches_current"] = legacyPrimes == exactPrimes
+
+    if "cubes" in records["current"] and "cubes" in records["minimize"]:
+        records["minimize"]["matches_current"] = (records["minimize"]["cubes"], records["minimize"]["literals"]) == (records["current"]["cubes"], records["current"]["literals"])
+
+    return records
+
+
+def cover_is_valid(
+        cover: list[tuple[int, int]],
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int
+    ) -> bool:
+
+    # Every on-set minterm covered and no off-set minterm covered
+    covered: set[int] = set()
+    for value, mask in cover:
+        freeBits: list[int] = [1 << position for position in range(mintermLength) if mask >> position & 1]
+        for combination in range(1 << len(freeBits)):
+            minterm: int = value
+            for idx, bit in enumerate(freeBits):
+                if combination >> idx & 1:
+                    minterm |= bit
+            covered.add(minterm)
+    return covered.issuperset(onset) and covered.issubset(set(onset) | set(dontCares))
+
+
+def row_to_cube(
+        row: list[any],
+        mintermLength: int
+    ) -> tuple[int, int]:
+
+    value: int = 0
+    mask: int = 0
+    for cell in row[-mintermLength - 1:-1]:
+        value <<= 1
+        mask <<= 1
+        if cell == "-":
+            mask |= 1
+        elif cell == 1:
+            value |= 1
+    return value, mask
+
+
+def run_benchmark_suite(
+        inputCounts: list[int],
+        densities: list[float],
+        dontCareRatios: list[float],
+        samples: int,
+        seed: int,
+        legacyMaxInputs: int,
+        measureMemory: bool,
+        wideCases: list[tuple[int, int]] = WIDE_SPARSE_CASES
+    ) -> dict[str, any]:
+
+    # (inputs, density, don't care ratio, sample, wide sparse)
+    cases: list[tuple[int, float, float, int, bool]] = [
+        (mintermLength, density, dontCareRatio, sample, False)
+        for mintermLength in inputCounts for density in densities for dontCareRatio in dontCareRatios for sample in range(samples)
+        ]
+    cases += [(mintermLength, mintermCount / (1 << mintermLength), 0.0, 0, True) for mintermLength, mintermCount in wideCases]
+
+    results: list[dict[str, any]] = []
+    with tempfile.TemporaryDirectory() as temporaryDirectory:
+        tablePath: str = os.path.join(temporaryDirectory, "function.csv")
+        for mintermLength, density, dontCareRatio, sample, wide in cases:
+            # Every case has its own seed, so a single case can be rerun on its own
+            caseSeed: int = hash((seed, mintermLength, density, dontCareRatio, sample)) & 0xFFFFFFFF
+            onset, dontCares = generate_random_function(random.Random(caseSeed), mintermLength, density, dontCareRatio)
+            write_truth_table(tablePath, onset, dontCares, mintermLength)
+
+            records: dict[str, dict[str, any]] = benchmark_function(
+                onset,
+                dontCares,
+                mintermLength,
+                tablePath,
+                mintermLength <= legacyMaxInputs,
+                measureMemory
+                )
+            results.append({
+                "inputs": mintermLength,
+                "density": density,
+                "dontcare_ratio": dontCareRatio,
+                "sample": sample,
+                "seed": caseSeed,
+                "wide": wide,
+                "onset": len(onset),
+                "dontcares": len(dontCares),
+                "pipelines": records
+            })
+            logger.warning("%d inputs, density %s, don't cares %s, sample %d: current %.4fs, heuristic %.4fs",
+                mintermLength, density, dontCareRatio, sample, records["current"].get("seconds", float("nan")), records["heuristic"].get("seconds", float("nan")))
+
+    return {
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "inputs": inputCounts,
+            "densities": densities,
+            "dontcare_ratios": dontCareRatios,
+            "samples": samples,
+            "legacy_max_inputs": legacyMaxInputs,
+            "wide": wideCases,
+            "memory": measureMemory
+        },
+        "results": results,
+        "summary": summarize_results(results)
+    }
+
+
+def summarize_results(
+        results: list[dict[str, any]]
+    ) -> dict[str, dict[str, any]]:
+
+    # Median total time and peak memory per pipeline and input count, wide sparse cases apart
+    summary: dict[str, dict[str, any]] = {}
+    for result in results:
+        for name, record in result["pipelines"].items():
+            if "seconds" not in record:
+                continue
+            inputsKey: str = f"{result['inputs']} wide" if result.get("wide") else str(result["inputs"])
+            entry: dict[str, list] = summary.setdefault(name, {}).setdefault(inputsKey, {"seconds": [], "peak_bytes": []})
+            entry["seconds"].append(record["seconds"])
+            if "peak_bytes" in record:
+                entry["peak_bytes"].append(record["peak_bytes"])
+
+    for name, byInputs in summary.items():
+        for inputs, entry in byInputs.items():
+            byInputs[inputs] = {
+                "runs": len(entry["seconds"]),
+                "median_seconds": round(median(entry["seconds"]), 6),
+                "median_peak_bytes": round(median(entry["peak_bytes"])) if entry["peak_bytes"] else None
+            }
+
+    return summary
+
+
+def parse_number_list(
+        value: str,
+        cast: Callable
+    ) -> list:
+
+    # "3-8" ranges for integers, comma separated values otherwise
+    if cast is int and "-" in value:
+        low, high = value.split("-", 1)
+        return list(range(int(low), int(high) + 1))
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    try:
+        options, arguments = getopt.getopt(sys.argv[1:], BENCHMARK_OPTIONS, BENCHMARK_LONG_OPTIONS)
+    except getopt.GetoptError as e:
+        print(str(e))
+        sys.exit(1)
+
+    settings: dict[str, any] = {
+        "inputs": list(range(3, 9)),
+        "densities": [0.25, 0.5],
+        "dontcares": [0.0, 0.1],
+        "samples": 3,
+        "seed": 1,
+        "legacyMaxInputs": 8,
+        "wide": WIDE_SPARSE_CASES,
+        "memory": True,
+        "output": None
+    }
+
+    for argument, value in options:
+        if argument == "--inputs":
+            settings["inputs"] = parse_number_list(value, int)
+        elif argument == "--densities":
+            settings["densities"] = parse_number_list(value, float)
+        elif argument == "--dontcares":
+            settings["dontcares"] = parse_number_list(value, float)
+        elif argument == "--samples":
+            settings["samples"] = int(value)
+        elif argument == "--seed":
+            settings["seed"] = int(value)
+        elif argument == "--legacy-max-inputs":
+            settings["legacyMaxInputs"] = int(value)
+        elif argument == "--wide":
+            settings["wide"] = [tuple(int(number) for number in case.split(":", 1)) for case in value.split(",") if case.strip()]
+        elif argument == "--no-memory":
+            settings["memory"] = False
+        elif argument in ("-o", "--output"):
+            settings["output"] = value
+        elif argument in ("-h", "--help"):
+            print(__doc__)
+            sys.exit(0)
+
+    # Only the progress lines and problems are shown, the pipelines' own logs would swamp the timings
+    configure_logging()
+    logging.disable(INFO)
+
+    report: dict[str, any] = run_benchmark_suite(
+        settings["inputs"],
+        settings["densities"],
+        settings["dontcares"],
+        settings["samples"],
+        settings["seed"],
+        settings["legacyMaxInputs"],
+        settings["memory"],
+        settings["wide"]
+        )
+
+    if settings["output"]:
+        with open(settings["output"], "w") as f:
+            json.dump(report, f, indent = 2)
+    else:
+        json.dump(report, sys.stdout, indent = 2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import mmap
+import struct
+from array import array
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from typing import Optional, Sequence
+from sanitize_qm_input import resolve_input_file_path, stream_truth_table, bitmap_to_indices, bitmap_length
+
+logger = get_logger(__name__)
+
+# Layout of a packed truth table, all integers little endian:
+#   magic (4 bytes) | version (u8) | input count (u8) | label byte count (u16)
+#   labels, utf-8 and comma separated, zero padded to a multiple of 8 bytes
+#   on-set bit-plane | don't care bit-plane, each 2^n bits rounded up to whole 64 bit words
+# Bit i of a plane is row i (first input column being the most significant bit), stored in byte i // 8 at bit i % 8.
+# Rows in neither plane are in the off-set.
+BINARY_MAGIC: bytes = b"QMTT"
+BINARY_VERSION: int = 1
+BINARY_HEADER: struct.Struct = struct.Struct("<4sBBH")
+
+
+def read_binary_truth_table(
+        inputFilePath: str
+    ) -> tuple[int, array, array, Optional[list[str]]]:
+
+    """
+    Read a packed truth table through `mmap`. The bit-planes are never decoded row by row, only their set bits
+    become index arrays.
+    Returns (input count, sorted on-set indices, sorted don't care indices, labels or None), like `stream_truth_table`.
+    """
+
+    file = resolve_input_file_path(inputFilePath)
+
+    with open(file, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mapped:
+            if len(mapped) < BINARY_HEADER.size:
+                raise ValueError(f"File `{file}` is too short to be a packed truth table.")
+
+            magic, version, mintermLength, labelByteCount = BINARY_HEADER.unpack_from(mapped, 0)
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"File `{file}` is not a packed truth table.")
+            if version != BINARY_VERSION:
+                raise ValueError(f"Packed truth table version {version} is not supported, expected {BINARY_VERSION}.")
+
+            labelOffset: int = BINARY_HEADER.size
+            labels: Optional[list[str]] = None
+            if labelByteCount:
+                labels = mapped[labelOffset:labelOffset + labelByteCount].decode("utf-8").split(",")
+
+            planeLength: int = bitmap_length(mintermLength)
+            onsetOffset: int = labelOffset + padded_length(labelByteCount)
+            dontCareOffset: int = onsetOffset + planeLength
+            if len(mapped) < dontCareOffset + planeLength:
+                raise ValueError(f"Packed truth table `{file}` is truncated, expected {dontCareOffset + planeLength} bytes.")
+
+            with memoryview(mapped) as view:
+                onset: array = bitmap_to_indices(view[onsetOffset:dontCareOffset])
+                dontCares: array = bitmap_to_indices(view[dontCareOffset:dontCareOffset + planeLength])
+
+    logger.info("Loaded packed truth table `%s`: %d inputs, %d on-set and %d don't care minterms", file, mintermLength, len(onset), len(dontCares))
+
+    return mintermLength, onset, dontCares, labels
+
+
+def write_binary_truth_table(
+        outputFilePath: str,
+        mintermLength: int,
+        onset: Sequence[int],
+        dontCares: Sequence[int],
+        labels: Optional[list[str]] = None
+    ) -> None:
+
+    if mintermLength > 255:
+        raise ValueError(f"Packed truth tables hold at most 255 inputs, got {mintermLength}.")
+
+    labelBytes: bytes = ",".join(labels).encode("utf-8") if labels else b""
+    if len(labelBytes) > 0xFFFF:
+        raise ValueError(f"Labels take {len(labelBytes)} bytes, packed truth tables hold at most {0xFFFF}.")
+
+    onsetPlane: bytearray = bytearray(bitmap_length(mintermLength))
+    dontCarePlane: bytearray = bytearray(bitmap_length(mintermLength))
+    for plane, indices in ((onsetPlane, onset), (dontCarePlane, dontCares)):
+        for index in indices:
+            plane[index >> 3] |= 1 << (index & 7)
+
+    with open(outputFilePath, "wb") as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, mintermLength, len(labelBytes)))
+        f.write(labelBytes.ljust(padded_length(len(labelBytes)), b"\0"))
+        f.write(onsetPlane)
+        f.write(dontCarePlane)
+
+
+def convert_truth_table_to_binary(
+        inputFilePath: str,
+        outputFilePath: str
+    ) -> None:
+
+    # Missing rows of the text table end up in the don't care plane, as they would when minimizing the text file
+    mintermLength, onset, dontCares, labels = stream_truth_table(inputFilePath)
+    write_binary_truth_table(outputFilePath, mintermLength, onset, dontCares, labels)
+    logger.info("Converted `%s` to packed truth table `%s` (%d bytes)", inputFilePath, outputFilePath, os.path.getsize(outputFilePath))
+
+
+def padded_length(
+        byteCount: int
+    ) -> int:
+
+    return (byteCount + 7) // 8 * 8
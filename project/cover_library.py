@@ -0,0 +1,123 @@
+import os
+import sys
+import struct
+from logger_setup import get_logger
+from array import array
+from logging import *
+from global_constants import *
+from typing import Optional, Sequence
+
+logger = get_logger(__name__)
+
+# Library layout: header (magic, version, input count, cube slots per function), then for every function, indexed by
+# its truth table, a minimum cover as one byte per cube (value << 4 | mask, unused slots 0xFF), then for every
+# function the cost of that cover (cubes * 64 + literals) as little endian u16
+LIBRARY_MAGIC: bytes = b"QMCL"
+LIBRARY_VERSION: int = 1
+LIBRARY_HEADER: struct.Struct = struct.Struct("<4sBBH")
+LIBRARY_MINTERM_LENGTH: int = 4
+LIBRARY_CUBE_SLOTS: int = 8
+LIBRARY_FUNCTION_COUNT: int = 1 << (1 << LIBRARY_MINTERM_LENGTH)
+LIBRARY_EMPTY_SLOT: int = 0xFF
+COVER_LIBRARY_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), COVER_LIBRARY_FILE_NAME)
+
+# Loaded on first use, a failed load is not retried
+libraryCovers: Optional[bytes] = None
+libraryCosts: Optional[array] = None
+libraryUnavailable: bool = False
+
+
+def lookup_library_cover(
+        onset: Sequence[int],
+        dontCares: Sequence[int],
+        mintermLength: int
+    ) -> Optional[list[tuple[int, int]]]:
+
+    """
+    Minimum cover of a function of at most 4 inputs, read from the precomputed library.
+    Functions of fewer inputs are widened to 4 inputs the result does not depend on, which a minimum cover never
+    has literals of. With don't cares, every way of assigning them is a fully specified function of the library, and
+    the cheapest of those covers is a minimum cover of the function.
+    Returns None when the function is out of reach of the library or the library file is missing.
+    """
+
+    if mintermLength > LIBRARY_MINTERM_LENGTH or len(dontCares) > COVER_LIBRARY_MAX_DONT_CARES:
+        return None
+    if not load_cover_library():
+        return None
+
+    # Every extra input doubles the table
+    onsetTable: int = 0
+    for minterm in onset:
+        onsetTable |= 1 << minterm
+    dontCareBits: list[int] = [1 << minterm for minterm in dontCares if not onsetTable >> minterm & 1]
+    for width in range(mintermLength, LIBRARY_MINTERM_LENGTH):
+        onsetTable |= onsetTable << (1 << width)
+        dontCareBits = [bit | bit << (1 << width) for bit in dontCareBits]
+
+    # Walk all don't care assignments in Gray code order, one bit flip per step
+    bestTable: int = onsetTable
+    bestCost: int = libraryCosts[onsetTable]
+    table: int = onsetTable
+    for step in range(1, 1 << len(dontCareBits)):
+        table ^= dontCareBits[(step & -step).bit_length() - 1]
+        cost: int = libraryCosts[table]
+        if cost < bestCost:
+            bestTable, bestCost = table, cost
+
+    widthMask: int = (1 << mintermLength) - 1
+    cover: list[tuple[int, int]] = []
+    offset: int = bestTable * LIBRARY_CUBE_SLOTS
+    for cube in libraryCovers[offset:offset + LIBRARY_CUBE_SLOTS]:
+        if cube == LIBRARY_EMPTY_SLOT:
+            break
+        cover.append((cube >> 4 & widthMask, cube & widthMask))
+
+    return cover
+
+
+def load_cover_library() -> bool:
+
+    global libraryCovers, libraryCosts, libraryUnavailable
+
+    if libraryCovers is not None:
+        return True
+    if libraryUnavailable:
+        return False
+
+    try:
+        with open(COVER_LIBRARY_PATH, "rb") as f:
+            data: bytes = f.read()
+        magic, version, mintermLength, cubeSlots = LIBRARY_HEADER.unpack_from(data, 0)
+        coverBytes: int = LIBRARY_FUNCTION_COUNT * LIBRARY_CUBE_SLOTS
+        if (magic, version, mintermLength, cubeSlots) != (LIBRARY_MAGIC, LIBRARY_VERSION, LIBRARY_MINTERM_LENGTH, LIBRARY_CUBE_SLOTS) \
+                or len(data) != LIBRARY_HEADER.size + coverBytes + 2 * LIBRARY_FUNCTION_COUNT:
+            raise ValueError(f"not a version {LIBRARY_VERSION} cover library")
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning("Cover library `%s` unavailable, small functions are minimized the regular way: %s", COVER_LIBRARY_PATH, e)
+        libraryUnavailable = True
+        return False
+
+    costs: array = array("H")
+    costs.frombytes(data[LIBRARY_HEADER.size + coverBytes:])
+    if sys.byteorder == "big":
+        costs.byteswap()
+
+    libraryCovers = data[LIBRARY_HEADER.size:LIBRARY_HEADER.size + coverBytes]
+    libraryCosts = costs
+    logger.debug("Loaded cover library `%s`", COVER_LIBRARY_PATH)
+
+    return True
+
+
+def encode_library_entry(
+        cover: list[tuple[int, int]]
+    ) -> tuple[bytes, int]:
+
+    if len(cover) > LIBRARY_CUBE_SLOTS:
+        raise ValueError(f"Cover of {len(cover)} cubes does not fit the {LIBRARY_CUBE_SLOTS} library slots.")
+
+    entry: bytes = bytes(value << 4 | mask for value, mask in cover).ljust(LIBRARY_CUBE_SLOTS, bytes([LIBRARY_EMPTY_SLOT]))
+    cost: int = len(cover) * 64 + sum(LIBRARY_MINTERM_LENGTH - mask.bit_count() for _, mask in cover)
+
+    return entry, cost
@@ -0,0 +1,396 @@
+from logger_setup import get_logger, lazy_pformat
+from logging import *
+from global_constants import *
+from typing import Iterator, Optional
+from select_minimum_cover import iterate_bits
+
+logger = get_logger(__name__)
+
+
+def espresso_minimize(
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int
+    ) -> list[tuple[int, int]]:
+
+    """
+    Heuristic two-level minimization in the style of Espresso, working directly on (value, mask) cubes.
+    The on-set minterms are the starting cover and the off-set is computed once as the complement of on-set and
+    don't cares. Expand, irredundant and reduce are repeated while the cost (cubes, then literals) keeps dropping.
+    Prime implicants are never enumerated, so the result is near-minimal rather than guaranteed minimal.
+    """
+
+    if not onset:
+        return []
+
+    fullMask: int = (1 << mintermLength) - 1
+    cover: list[tuple[int, int]] = [(minterm, 0) for minterm in onset]
+    dontCareCover: list[tuple[int, int]] = [(minterm, 0) for minterm in dontCares]
+
+    offset: list[tuple[int, int]] = complement_cover(cover + dontCareCover, fullMask)
+    logger.debug("Espresso start: %d on-set cubes, %d don't care cubes, %d off-set cubes", len(cover), len(dontCareCover), len(offset))
+
+    offsetLiterals: list[list[int]] = index_cube_literals(offset, fullMask)
+    cover = expand_cover(cover, offsetLiterals, fullMask)
+    cover = irredundant_cover(cover, dontCareCover, fullMask)
+    bestCost: tuple[int, int] = cover_cost(cover, fullMask)
+    logger.debug("Espresso initial cost: %s", bestCost)
+
+    while True:
+        candidate: list[tuple[int, int]] = reduce_cover(cover, dontCareCover, fullMask)
+        candidate = expand_cover(candidate, offsetLiterals, fullMask)
+        candidate = irredundant_cover(candidate, dontCareCover, fullMask)
+        candidateCost: tuple[int, int] = cover_cost(candidate, fullMask)
+        logger.debug("Espresso iteration cost: %s", candidateCost)
+        if candidateCost >= bestCost:
+            break
+        cover, bestCost = candidate, candidateCost
+
+    logger.debug("Espresso cover:\n%s", lazy_pformat(cover))
+
+    return cover
+
+
+def expand_cover(
+        cover: list[tuple[int, int]],
+        offsetLiterals: list[list[int]],
+        fullMask: int
+    ) -> list[tuple[int, int]]:
+
+    # Grow every cube one literal at a time for as long as it stays clear of the off-set, largest cubes first so
+    # that the smaller ones have a chance of being swallowed
+    pending: list[tuple[int, int]] = sorted(set(cover), key=lambda cube: -cube[1].bit_count())
+
+    # Per variable, how many cubes fix it to 1 and to 0
+    positions: range = range(fullMask.bit_length())
+    oneCounts: list[int] = [0] * len(positions)
+    zeroCounts: list[int] = [0] * len(positions)
+    for value, mask in pending:
+        for position in positions:
+            if not mask >> position & 1:
+                if value >> position & 1:
+                    oneCounts[position] += 1
+                else:
+                    zeroCounts[position] += 1
+
+    # Expanded cubes by mask, a containing cube has a superset mask and agrees on the value outside it
+    expanded: dict[tuple[int, int], None] = {}
+    expandedValues: dict[int, set[int]] = {}
+    for value, mask in pending:
+        if any(otherMask & mask == mask and value & ~otherMask in values for otherMask, values in expandedValues.items()):
+            continue
+
+        # Raise first the literals most other cubes disagree with, those are the raises that can make this cube
+        # absorb its neighbours
+        literalPositions: list[int] = [position for position in positions if not mask >> position & 1]
+        literalPositions.sort(key=lambda position: -(zeroCounts[position] if value >> position & 1 else oneCounts[position]))
+
+        # Per literal, the off-set cubes it keeps apart from this cube, as a bitset over the off-set. A literal can be
+        # raised unless it is the only one keeping some off-set cube away
+        conflicts: dict[int, int] = {position: offsetLiterals[value >> position & 1 ^ 1][position] for position in literalPositions}
+        lockedBits: int = locked_literals(conflicts)
+        for position in literalPositions:
+            if lockedBits == fullMask & ~mask:
+                break
+            bit: int = 1 << position
+            if lockedBits & bit:
+                continue
+            mask |= bit
+            value &= ~bit
+            del conflicts[position]
+            lockedBits = locked_literals(conflicts)
+
+        for otherMask in [otherMask for otherMask in expandedValues if otherMask & mask == otherMask]:
+            values: set[int] = expandedValues[otherMask]
+            # Walk whichever is smaller, the cubes with this mask or the subcubes of the new cube with it
+            if 1 << (mask & ~otherMask).bit_count() < len(values):
+                containedValues: list[int] = [value | subMask for subMask in iterate_submasks(mask & ~otherMask) if value | subMask in values]
+            else:
+                containedValues = [otherValue for otherValue in values if otherValue & ~mask == value]
+            for otherValue in containedValues:
+                values.remove(otherValue)
+                del expanded[(otherValue, otherMask)]
+            if not values:
+                del expandedValues[otherMask]
+
+        expanded[(value, mask)] = None
+        expandedValues.setdefault(mask, set()).add(value)
+
+    return list(expanded)
+
+
+def locked_literals(
+        conflicts: dict[int, int]
+    ) -> int:
+
+    # Literals that are the only conflict left for at least one off-set cube
+    single: int = 0
+    multiple: int = 0
+    for conflict in conflicts.values():
+        multiple |= single & conflict
+        single |= conflict
+    onlyConflict: int = single & ~multiple
+
+    lockedBits: int = 0
+    for position, conflict in conflicts.items():
+        if conflict & onlyConflict:
+            lockedBits |= 1 << position
+    return lockedBits
+
+
+def index_cube_literals(
+        cubes: list[tuple[int, int]],
+        fullMask: int
+    ) -> list[list[int]]:
+
+    # For polarity 0 and 1 and each variable, the cubes fixing the variable to that polarity, as a bitset over cube
+    # indices
+    byteCount: int = len(cubes) // 8 + 1
+    literalBits: list[list[bytearray]] = [[bytearray(byteCount) for _ in range(fullMask.bit_length())] for _ in (0, 1)]
+    for idx, (value, mask) in enumerate(cubes):
+        for position in iterate_bits(fullMask & ~mask):
+            literalBits[value >> position & 1][position][idx >> 3] |= 1 << (idx & 7)
+    return [[int.from_bytes(bits, "little") for bits in polarityBits] for polarityBits in literalBits]
+
+
+def disjoint_cubes(
+        cubeLiterals: list[list[int]],
+        cube: tuple[int, int],
+        fullMask: int
+    ) -> int:
+
+    # Indexed cubes fixing some variable to the opposite of what `cube` fixes it to, none of them meets it
+    value, mask = cube
+    disjoint: int = 0
+    for position in iterate_bits(fullMask & ~mask):
+        disjoint |= cubeLiterals[value >> position & 1 ^ 1][position]
+    return disjoint
+
+
+def iterate_submasks(
+        mask: int
+    ) -> Iterator[int]:
+
+    subMask: int = mask
+    while True:
+        yield subMask
+        if subMask == 0:
+            return
+        subMask = (subMask - 1) & mask
+
+
+def irredundant_cover(
+        cover: list[tuple[int, int]],
+        dontCareCover: list[tuple[int, int]],
+        fullMask: int
+    ) -> list[tuple[int, int]]:
+
+    # Drop cubes that the rest of the cover together with the don't cares already cover, smallest cubes first. Only
+    # the cubes meeting a cube matter for it, the others are filtered out through the literal index
+    remaining: list[tuple[int, int]] = sorted(cover, key=lambda cube: cube[1].bit_count())
+    cubes: list[tuple[int, int]] = remaining + dontCareCover
+    cubeLiterals: list[list[int]] = index_cube_literals(cubes, fullMask)
+    keptCubes: int = (1 << len(cubes)) - 1
+    for idx, cube in enumerate(remaining):
+        candidates: int = keptCubes & ~(1 << idx) & ~disjoint_cubes(cubeLiterals, cube, fullMask)
+        if cover_contains_cube([cubes[other] for other in iterate_bits(candidates)], cube, fullMask):
+            keptCubes &= ~(1 << idx)
+    return [cube for idx, cube in enumerate(remaining) if keptCubes >> idx & 1]
+
+
+def reduce_cover(
+        cover: list[tuple[int, int]],
+        dontCareCover: list[tuple[int, int]],
+        fullMask: int
+    ) -> list[tuple[int, int]]:
+
+    # Shrink every cube to the smallest cube holding the minterms that nothing else covers, so that the next expand
+    # can grow it in a different direction. Reduced cubes stay inside the indexed ones, so the index still rules out
+    # every cube that cannot meet them
+    remaining: list[tuple[int, int]] = sorted(cover, key=lambda cube: -cube[1].bit_count())
+    cubes: list[tuple[int, int]] = remaining + dontCareCover
+    cubeLiterals: list[list[int]] = index_cube_literals(cubes, fullMask)
+    keptCubes: int = (1 << len(cubes)) - 1
+    for idx in range(len(remaining)):
+        value, mask = cubes[idx]
+        candidates: int = keptCubes & ~(1 << idx) & ~disjoint_cubes(cubeLiterals, (value, mask), fullMask)
+        others: list[tuple[int, int]] = [cubes[other] for other in iterate_bits(candidates)]
+        uncovered: list[tuple[int, int]] = complement_cover(cofactor_cover(others, (value, mask), fullMask), fullMask)
+        if not uncovered:
+            keptCubes &= ~(1 << idx)
+            continue
+        superValue, superMask = supercube(uncovered)
+        cubes[idx] = (value | (superValue & mask & ~superMask), mask & superMask)
+    return [cubes[idx] for idx in range(len(remaining)) if keptCubes >> idx & 1]
+
+
+def complement_cover(
+        cover: list[tuple[int, int]],
+        fullMask: int
+    ) -> list[tuple[int, int]]:
+
+    """
+    Complement of a cover, by recursive Shannon expansion on the most binate variable.
+    """
+
+    if not cover:
+        return [(0, fullMask)]
+    if any(mask == fullMask for _, mask in cover):
+        return []
+
+    if len(cover) == 1:
+        # De Morgan: one cube per literal with that literal flipped and the earlier ones kept, so they are disjoint
+        value, mask = cover[0]
+        complement: list[tuple[int, int]] = []
+        keptValue: int = 0
+        keptMask: int = fullMask
+        for position in range(fullMask.bit_length()):
+            bit: int = 1 << position
+            if mask & bit:
+                continue
+            complement.append((keptValue | (value & bit ^ bit), keptMask & ~bit))
+            keptValue |= value & bit
+            keptMask &= ~bit
+        return complement
+
+    splitBit: int = select_split_bit(cover, fullMask)
+    zeroComplement: list[tuple[int, int]] = complement_cover(cofactor_literal(cover, splitBit, 0), fullMask)
+    oneComplement: list[tuple[int, int]] = complement_cover(cofactor_literal(cover, splitBit, 1), fullMask)
+
+    # Cubes found on both sides do not depend on the split variable
+    oneSet: set[tuple[int, int]] = set(oneComplement)
+    shared: set[tuple[int, int]] = oneSet.intersection(zeroComplement)
+    complement = list(shared)
+    complement += [(value, mask & ~splitBit) for value, mask in zeroComplement if (value, mask) not in shared]
+    complement += [(value | splitBit, mask & ~splitBit) for value, mask in oneComplement if (value, mask) not in shared]
+    return complement
+
+
+def cover_contains_cube(
+        cover: list[tuple[int, int]],
+        cube: tuple[int, int],
+        fullMask: int
+    ) -> bool:
+
+    # A cube is covered when the cover, restricted to the cube, is a tautology
+    return is_tautology(cofactor_cover(cover, cube, fullMask), fullMask)
+
+
+def is_tautology(
+        cover: list[tuple[int, int]],
+        fullMask: int
+    ) -> bool:
+
+    if not cover:
+        return False
+    if any(mask == fullMask for _, mask in cover):
+        return True
+
+    # A unate cover is a tautology only if it holds the universal cube, which was checked above
+    splitBit: Optional[int] = select_binate_bit(cover, fullMask)
+    if splitBit is None:
+        return False
+
+    return is_tautology(cofactor_literal(cover, splitBit, 0), fullMask) and is_tautology(cofactor_literal(cover, splitBit, 1), fullMask)
+
+
+def cofactor_cover(
+        cover: list[tuple[int, int]],
+        cube: tuple[int, int],
+        fullMask: int
+    ) -> list[tuple[int, int]]:
+
+    # Restrict the cover to `cube`: keep the cubes that intersect it and free the variables the cube fixes
+    cubeValue, cubeMask = cube
+    fixedBits: int = fullMask & ~cubeMask
+    cofactor: list[tuple[int, int]] = []
+    for value, mask in cover:
+        if (value ^ cubeValue) & ~(mask | cubeMask) & fullMask:
+            continue
+        cofactor.append((value & ~fixedBits, mask | fixedBits))
+    return cofactor
+
+
+def cofactor_literal(
+        cover: list[tuple[int, int]],
+        bit: int,
+        polarity: int
+    ) -> list[tuple[int, int]]:
+
+    literalValue: int = bit if polarity else 0
+    cofactor: list[tuple[int, int]] = []
+    for value, mask in cover:
+        if mask & bit:
+            cofactor.append((value, mask))
+        elif value & bit == literalValue:
+            cofactor.append((value & ~bit, mask | bit))
+    return cofactor
+
+
+def select_binate_bit(
+        cover: list[tuple[int, int]],
+        fullMask: int
+    ) -> Optional[int]:
+
+    # The variable appearing most often in both polarities, None when the cover is unate
+    bestBit: Optional[int] = None
+    bestCount: int = 0
+    for position in range(fullMask.bit_length()):
+        bit: int = 1 << position
+        ones: int = 0
+        zeros: int = 0
+        for value, mask in cover:
+            if mask & bit:
+                continue
+            if value & bit:
+                ones += 1
+            else:
+                zeros += 1
+        if ones and zeros and ones + zeros > bestCount:
+            bestBit, bestCount = bit, ones + zeros
+    return bestBit
+
+
+def select_split_bit(
+        cover: list[tuple[int, int]],
+        fullMask: int
+    ) -> int:
+
+    # Prefer a binate variable, otherwise the variable fixed in the most cubes
+    binateBit: Optional[int] = select_binate_bit(cover, fullMask)
+    if binateBit is not None:
+        return binateBit
+    counts: list[int] = [0] * fullMask.bit_length()
+    for _, mask in cover:
+        for position in range(len(counts)):
+            if not mask & (1 << position):
+                counts[position] += 1
+    return 1 << max(range(len(counts)), key=lambda position: counts[position])
+
+
+def supercube(
+        cubes: list[tuple[int, int]]
+    ) -> tuple[int, int]:
+
+    value, mask = cubes[0]
+    for otherValue, otherMask in cubes[1:]:
+        mask |= otherMask | (value ^ otherValue)
+        value &= ~mask
+    return value & ~mask, mask
+
+
+def cube_contains(
+        outer: tuple[int, int],
+        inner: tuple[int, int]
+    ) -> bool:
+
+    return not inner[1] & ~outer[1] and inner[0] & ~outer[1] == outer[0]
+
+
+def cover_cost(
+        cover: list[tuple[int, int]],
+        fullMask: int
+    ) -> tuple[int, int]:
+
+    mintermLength: int = fullMask.bit_length()
+    return len(cover), sum(mintermLength - mask.bit_count() for _, mask in cover)
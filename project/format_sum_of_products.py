@@ -0,0 +1,55 @@
+from global_constants import *
+from typing import Optional
+
+
+def format_sum_of_products(
+        cover: list[tuple[int, int]],
+        mintermLength: int,
+        labels: Optional[list[str]] = None
+    ) -> str:
+
+    """
+    Render a cover of (value, mask) cubes as a sum of products, e.g. `A'B + CD'`.
+    The first label belongs to the most significant bit. Labels default to A, B, C, ...
+    """
+
+    if labels is None:
+        labels = generate_default_labels(mintermLength)
+    elif len(labels) != mintermLength:
+        raise ValueError(f"{len(labels)} labels given for {mintermLength} inputs.")
+
+    if not cover:
+        return "0"
+
+    products: list[str] = []
+    for value, mask in cover:
+        literals: list[str] = []
+        for column, label in enumerate(labels):
+            bit: int = 1 << (mintermLength - 1 - column)
+            if mask & bit:
+                continue
+            literals.append(label if value & bit else label + "'")
+        if not literals:
+            return "1"
+        products.append("".join(literals))
+
+    return " + ".join(products)
+
+
+def generate_default_labels(
+        mintermLength: int
+    ) -> list[str]:
+
+    if mintermLength <= 26:
+        return [chr(ord("A") + idx) for idx in range(mintermLength)]
+    return [f"x{idx}" for idx in range(mintermLength)]
+
+
+def parse_label_input(
+        labelInputString: str
+    ) -> list[str]:
+
+    labels: list[str] = [label.strip() for label in labelInputString.split(",")]
+    if not all(labels):
+        raise SyntaxError(f"Invalid label specification. Labels must be separated by commas.\n{USAGE_TEXT}")
+    return labels
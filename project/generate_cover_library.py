@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Writes the cover library read by cover_library.py: a minimum cover of every 4 input function, found by running each
+through the regular prime implicant generation and cover selection.
+
+Usage: generate_cover_library.py [output path]
+"""
+
+import sys
+import time
+import logging
+from logger_setup import get_logger, configure_logging
+from array import array
+from logging import *
+from global_constants import *
+from generate_prime_implicants import generate_prime_implicants_bitmask
+from select_minimum_cover import select_minimum_cover
+from cover_library import LIBRARY_MAGIC, LIBRARY_VERSION, LIBRARY_HEADER, LIBRARY_MINTERM_LENGTH, LIBRARY_CUBE_SLOTS, LIBRARY_FUNCTION_COUNT, COVER_LIBRARY_PATH, encode_library_entry
+
+logger = get_logger(__name__)
+
+
+def generate_cover_library(
+        outputFilePath: str
+    ) -> None:
+
+    mintermCount: int = 1 << LIBRARY_MINTERM_LENGTH
+    covers: bytearray = bytearray()
+    costs: array = array("H")
+
+    start: float = time.perf_counter()
+    for truthTable in range(LIBRARY_FUNCTION_COUNT):
+        onset: list[int] = [minterm for minterm in range(mintermCount) if truthTable >> minterm & 1]
+        primeImplicants: list[tuple[int, int, int]] = generate_prime_implicants_bitmask(onset, [], LIBRARY_MINTERM_LENGTH)
+        cover: list[tuple[int, int]] = select_minimum_cover(primeImplicants, len(onset), LIBRARY_MINTERM_LENGTH)
+
+        entry, cost = encode_library_entry(cover)
+        covers += entry
+        costs.append(cost)
+
+        if truthTable & 0x1FFF == 0x1FFF:
+            logger.info("%d of %d functions, %.1fs", truthTable + 1, LIBRARY_FUNCTION_COUNT, time.perf_counter() - start)
+
+    if sys.byteorder == "big":
+        costs.byteswap()
+
+    with open(outputFilePath, "wb") as f:
+        f.write(LIBRARY_HEADER.pack(LIBRARY_MAGIC, LIBRARY_VERSION, LIBRARY_MINTERM_LENGTH, LIBRARY_CUBE_SLOTS))
+        f.write(covers)
+        f.write(costs.tobytes())
+
+    logger.info("Wrote cover library `%s` in %.1fs", outputFilePath, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    configure_logging()
+    # Per-function logs would dominate the run, the engines only log them below INFO
+    logging.disable(DEBUG)
+    generate_cover_library(sys.argv[1] if len(sys.argv) > 1 else COVER_LIBRARY_PATH)
@@ -1,10 +1,19 @@
-import logger_setup
 from logging import *
 from global_constants import *
-from typing import Optional
-from pprint import pformat
+from typing import TYPE_CHECKING, Iterator, Optional
+from logger_setup import get_logger, VERBOSE, LazyFormat, lazy_pformat, pretty_format
+import stats_collector
+import solve_limits
 
-logger = getLogger(__name__)
+# The process pool and NumPy take longer to import than most runs take, both are loaded on first use
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = get_logger(__name__)
+
+# NumPy is optional, the "numpy" combination strategy falls back to "hash" without it
+numpy: any = None
+numpyUnavailable: bool = False
 
 def recursive_generate_prime_implicants(
         combinedMintermTableAndIndices: list[list[any]],
@@ -13,6 +22,21 @@ def recursive_generate_prime_implicants(
         fullyMinimizedMinterms: Optional[list[list[any]]] = None
     ) -> tuple[Optional[list[list[any]]], Optional[list[list[any]]]]:
 
+    # Nothing combined in the previous round, so everything found so far is final
+    if not combinedMintermTableAndIndices:
+        return fullyMinimizedMinterms or []
+
+    stats: Optional[stats_collector.StatsCollector] = stats_collector.activeCollector
+    if stats is not None:
+        levelStart: tuple[float, Optional[list[int]]] = stats.start_level()
+
+    # Rows missing from a table placed by index are built here as don't cares, this engine needs every row
+    if recursionLevel == 0 and None in combinedMintermTableAndIndices:
+        combinedMintermTableAndIndices = [
+            row if row is not None else [index] + [int(bit) for bit in format(index, f"0{mintermLength}b")] + ["x"]
+            for index, row in enumerate(combinedMintermTableAndIndices)
+            ]
+
     # Determine the number of bits at the beginning of each term that are not part of the minterm itself
     binaryValue: str = ""
     for idx in range(recursionLevel + 1):
@@ -28,29 +52,38 @@ def recursive_generate_prime_implicants(
         if group:
             mintermGroupCount += 1
 
-    logger.debug(f"Recursion level: {recursionLevel}", color = WHITE + BG_RED)
-    logger.debug(f"Disregarded bit count: {disregardedBitCount}", color = WHITE + BG_RED)
-    logger.debug(f"Combined minterm table:\n{pformat(mintermTable)}", color = WHITE + BG_RED)
-    logger.debug(f"Groups of minterms to check: {mintermGroupCount}", color = WHITE + BG_RED)
-    logger.debug(f"Fully minimized implicants: {fullyMinimizedMinterms}", color = WHITE + BG_RED)
+    logger.debug("Recursion level: %d", recursionLevel, color = WHITE + BG_RED)
+    logger.debug("Disregarded bit count: %d", disregardedBitCount, color = WHITE + BG_RED)
+    logger.debug("Combined minterm table:\n%s", lazy_pformat(mintermTable), color = WHITE + BG_RED)
+    logger.debug("Groups of minterms to check: %d", mintermGroupCount, color = WHITE + BG_RED)
+    logger.debug("Fully minimized implicants: %s", fullyMinimizedMinterms, color = WHITE + BG_RED)
 
     if mintermGroupCount <= 1:
-        logger.debug(f"Minterm table length ({mintermGroupCount}) is insufficient for combining terms, returning it:\n{combinedMintermTableAndIndices}\n")
-        return fullyMinimizedMinterms + mintermTable[0]
+        logger.debug("Minterm table length (%d) is insufficient for combining terms, returning it:\n%s\n", mintermGroupCount, combinedMintermTableAndIndices)
+        if stats is not None:
+            stats.record_level(levelStart, "legacy", recursionLevel, sum(map(len, mintermTable)), mintermGroupCount, 0, 0, 0, len(mintermTable[0]))
+        return (fullyMinimizedMinterms or []) + mintermTable[0]
     
     newPrimeImplicants: list[list[any]] = []
     usedImplicants: list[list[any]] = []
- 
+
+    # Checked once, the loops below stay free of logging calls unless tracing
+    traceEnabled: bool = logger.isEnabledFor(VERBOSE)
+
+    comparisons: int = 0
     i: int = 0
     while True:
 
-        logger.verbose(f"i: {i}")
+        if traceEnabled:
+            logger.verbose("i: %d", i)
 
         groupOne: list[any] = mintermTable[i]
         groupTwo: list[any] = mintermTable[i + 1]
+        comparisons += len(groupOne) * len(groupTwo)
 
 
-        logger.verbose(f"Group {i}: {groupOne}\nGroup {i + 1}: {groupTwo}")
+        if traceEnabled:
+            logger.verbose("Group %d: %s\nGroup %d: %s", i, groupOne, i + 1, groupTwo)
 
         for termOne in groupOne:
             for termTwo in groupTwo:
@@ -78,7 +111,8 @@ def recursive_generate_prime_implicants(
                         else: break
 
                 if newTerm:
-                    logger.verbose(f"New combined term:`{newTerm}`")
+                    if traceEnabled:
+                        logger.verbose("New combined term:`%s`", newTerm)
                     usedImplicants.append(termOne)
                     usedImplicants.append(termTwo)
                     combinedNewTerm: list[any] = combinedNewTermIndex + newTerm + newMintermOperand
@@ -90,31 +124,32 @@ def recursive_generate_prime_implicants(
             break
 
     # Remove duplicate minterms. Very important step, as the script takes far longer to run if this is omitted
+    mergeCount: int = len(newPrimeImplicants)
     newPrimeImplicants = remove_duplicate_minterms(newPrimeImplicants, mintermLength)
 
-    logger.debug(f"New prime implicants:\n{pformat(newPrimeImplicants)}", color = CYAN)
-    logger.verbose(f"Used implicants:\n{pformat(usedImplicants)}")
+    logger.debug("New prime implicants:\n%s", lazy_pformat(newPrimeImplicants), color = CYAN)
+    logger.verbose("Used implicants:\n%s", lazy_pformat(usedImplicants))
 
     # Create unique list of all implicants that were used
     uniqueUsedImplicants: list[list[any]] = []
     for term in usedImplicants:
         if term not in uniqueUsedImplicants:
             uniqueUsedImplicants.append(term)
-    logger.verbose(f"Unique used implicants:\n{pformat(uniqueUsedImplicants)}")
+    logger.verbose("Unique used implicants:\n%s", lazy_pformat(uniqueUsedImplicants))
                 
     # Flatten the nested original implicants into one list
     originalImplicants: list[list[any]] = []
     for group in mintermTable:
         for term in group:
             originalImplicants.append(term)
-    logger.verbose(f"Original implicants:\n{pformat(originalImplicants)}")
+    logger.verbose("Original implicants:\n%s", lazy_pformat(originalImplicants))
     
     # Find all implicants that were not used
     unusedImplicants: list[list[any]] = []
     for term in originalImplicants:
         if term not in uniqueUsedImplicants:
             unusedImplicants.append(term)
-    logger.debug(f"Terms not used in this round:\n{pformat(unusedImplicants)}")
+    logger.debug("Terms not used in this round:\n%s", lazy_pformat(unusedImplicants))
 
     # Carry over previous fully minimized terms and add new ones
     newFullyMinimizedMinterms: list[list[any]] = []
@@ -123,9 +158,21 @@ def recursive_generate_prime_implicants(
         for term in unusedImplicants:
             if term[-1] == 1:
                 newFullyMinimizedMinterms.append(term)
+    if stats is not None:
+        stats.record_level(
+            levelStart,
+            "legacy",
+            recursionLevel,
+            len(originalImplicants),
+            mintermGroupCount,
+            comparisons,
+            mergeCount,
+            mergeCount - len(newPrimeImplicants),
+            len(newFullyMinimizedMinterms)
+            )
     if fullyMinimizedMinterms:
-        logger.debug(f"Add previous fully minimized minterms:\n{pformat(fullyMinimizedMinterms)}")
-        newFullyMinimizedMinterms.append(fullyMinimizedMinterms)
+        logger.debug("Add previous fully minimized minterms:\n%s", lazy_pformat(fullyMinimizedMinterms))
+        newFullyMinimizedMinterms.extend(fullyMinimizedMinterms)
 
     return recursive_generate_prime_implicants(newPrimeImplicants, mintermLength, recursionLevel + 1, newFullyMinimizedMinterms)
 
@@ -147,7 +194,7 @@ def generate_minterm_table_index(
                     numOnes += 1
             mintermTable[numOnes].append(row)
 
-    logger.verbose(f"Minterm table:\n{pformat(mintermTable)}")
+    logger.verbose("Minterm table:\n%s", lazy_pformat(mintermTable))
 
     return mintermTable
     
@@ -173,9 +220,460 @@ def remove_duplicate_minterms(
             uniquePrimeImplicants.append(primeImplicantList[idx])
             uniqueMinterms.append(minterm)
 
-    logger.verbose(f"Provided minterms:\n{pformat(minterms)}")
-    logger.verbose(f"Unique minterms:\n{pformat(uniqueMinterms)}")
-    logger.verbose(f"Provided prime implicants:\n{pformat(primeImplicantList)}")
-    logger.verbose(f"Unique prime implicants:\n{pformat(uniquePrimeImplicants)}")
+    logger.verbose("Provided minterms:\n%s", lazy_pformat(minterms))
+    logger.verbose("Unique minterms:\n%s", lazy_pformat(uniqueMinterms))
+    logger.verbose("Provided prime implicants:\n%s", lazy_pformat(primeImplicantList))
+    logger.verbose("Unique prime implicants:\n%s", lazy_pformat(uniquePrimeImplicants))
+
+    return uniquePrimeImplicants
+
+
+def generate_prime_implicants_bitmask(
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int,
+        strategy: str = "hash",
+        workers: int = 1
+    ) -> list[tuple[int, int, int]]:
+
+    """
+    Bitmask counterpart of `recursive_generate_prime_implicants`.
+    Each cube is a (value, mask) pair of ints: set bits in `mask` are the "-" positions and `value` holds the fixed
+    bits (always 0 under the mask). Covered on-set minterms are an int bitset where bit i stands for `onset[i]`,
+    so a cube that only covers don't care minterms has a coverage of 0.
+    Returns every prime implicant covering at least one on-set minterm as (value, mask, coverage).
+    `strategy` picks how merge partners are found: "hash" flips single bits and looks partners up, "pairwise"
+    compares every term of adjacent groups and "numpy" does the bit flips and lookups on whole arrays at once
+    (up to 32 inputs, falling back to "hash" otherwise). With more than one worker, large levels are combined in a process pool.
+    """
+
+    primeImplicants: list[tuple[int, int, int]] = list(iterate_prime_implicants(onset, dontCares, mintermLength, strategy, workers))
+
+    logger.debug("Bitmask prime implicants:\n%s", LazyFormat(format_bitmask_cover, primeImplicants, mintermLength), color = CYAN)
+
+    return primeImplicants
+
+
+def iterate_prime_implicants(
+        onset: list[int],
+        dontCares: list[int],
+        mintermLength: int,
+        strategy: str = "hash",
+        workers: int = 1
+    ) -> Iterator[tuple[int, int, int]]:
+
+    """
+    Level by level generator behind `generate_prime_implicants_bitmask`.
+    Prime implicants are yielded as soon as the level they belong to has been combined, and only that level and the
+    one being built from it are alive at any time.
+    """
+
+    if strategy not in COMBINATION_STRATEGIES:
+        raise ValueError(f"Unknown combination strategy `{strategy}`, must be one of: {COMBINATION_STRATEGIES}")
+    if workers < 1:
+        raise ValueError(f"Worker count must be at least 1, got {workers}")
+    if strategy == "numpy" and (mintermLength > NUMPY_MAX_MINTERM_LENGTH or not load_numpy()):
+        logger.warning("NumPy combination needs NumPy installed and at most %d inputs, using hash combination instead.", NUMPY_MAX_MINTERM_LENGTH)
+        strategy = "hash"
+
+    # Every level is keyed by (value, mask), which also takes care of removing duplicate terms
+    level: dict[tuple[int, int], int] = {}
+    for rank, minterm in enumerate(onset):
+        level[(minterm, 0)] = 1 << rank
+    for minterm in dontCares:
+        level.setdefault((minterm, 0), 0)
+
+    # The pool is only started once a level is big enough to be worth shipping to other processes
+    executor: Optional["ProcessPoolExecutor"] = None
+
+    stats: Optional[stats_collector.StatsCollector] = stats_collector.activeCollector
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+
+    levelCount: int = 0
+    try:
+        while level:
+            logger.debug("Bitmask level %d: %d terms", levelCount, len(level), color = WHITE + BG_RED)
+            if stats is not None:
+                levelStart: tuple[float, Optional[list[int]]] = stats.start_level()
+
+            nextLevel: dict[tuple[int, int], int]
+            usedTerms: set[tuple[int, int]]
+            if workers > 1 and len(level) >= PARALLEL_MIN_LEVEL_SIZE:
+                if executor is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                nextLevel, usedTerms = combine_bitmask_level_parallel(level, mintermLength, executor, workers)
+            elif strategy == "numpy":
+                nextLevel, usedTerms = combine_bitmask_level_numpy(level, mintermLength)
+            elif strategy == "hash":
+                nextLevel, usedTerms = combine_bitmask_level_hashed(level, mintermLength)
+            else:
+                nextLevel, usedTerms = combine_bitmask_level(level)
+
+            if stats is not None:
+                record_bitmask_level(stats, levelStart, levelCount, level, nextLevel, usedTerms, mintermLength, strategy)
+
+            # Out of budget, possibly halfway through the level: every term of this level and of the next one built so
+            # far is an implicant, and together with the primes already yielded they still cover the on-set
+            if limits is not None and limits.reached():
+                for (value, mask), coverage in (*level.items(), *nextLevel.items()):
+                    if coverage:
+                        yield value, mask, coverage
+                return
+
+            # Drop the used terms before yielding, whatever is left could not be combined any further and is prime
+            for term in usedTerms:
+                del level[term]
+            del usedTerms
+
+            # Skip the prime implicants that only cover don't cares
+            for (value, mask), coverage in level.items():
+                if coverage:
+                    yield value, mask, coverage
+
+            level = nextLevel
+            del nextLevel
+            levelCount += 1
+    finally:
+        if executor is not None:
+            # Out of budget the tasks still queued are dropped and running ones are not waited for
+            outOfBudget: bool = limits is not None and limits.limitReached is not None
+            executor.shutdown(wait = not outOfBudget, cancel_futures = outOfBudget)
+
+
+def load_numpy() -> bool:
+
+    global numpy, numpyUnavailable
+
+    if numpy is None and not numpyUnavailable:
+        try:
+            import numpy as numpyModule
+            numpy = numpyModule
+        except ImportError:
+            numpyUnavailable = True
+
+    return numpy is not None
+
+
+def record_bitmask_level(
+        stats: stats_collector.StatsCollector,
+        levelStart: tuple[float, Optional[list[int]]],
+        levelCount: int,
+        level: dict[tuple[int, int], int],
+        nextLevel: dict[tuple[int, int], int],
+        usedTerms: set[tuple[int, int]],
+        mintermLength: int,
+        strategy: str
+    ) -> None:
+
+    # The combiners only hand back the deduplicated level, so comparisons and merges are counted again here, which
+    # is only paid for with a collector installed. Groups are the (mask, number of ones) classes
+    fullMask: int = (1 << mintermLength) - 1
+    groups: dict[tuple[int, int], int] = {}
+    lookups: int = 0
+    merges: int = 0
+    for value, mask in level:
+        key: tuple[int, int] = (mask, value.bit_count())
+        groups[key] = groups.get(key, 0) + 1
+        freeBits: int = fullMask & ~mask & ~value
+        lookups += freeBits.bit_count()
+        while freeBits:
+            bit: int = freeBits & -freeBits
+            freeBits ^= bit
+            if (value | bit, mask) in level:
+                merges += 1
+
+    comparisons: int = lookups
+    if strategy == "pairwise":
+        weights: dict[int, int] = {}
+        for (_, weight), count in groups.items():
+            weights[weight] = weights.get(weight, 0) + count
+        comparisons = sum(count * weights.get(weight + 1, 0) for weight, count in weights.items())
+
+    primes: int = sum(1 for term, coverage in level.items() if coverage and term not in usedTerms)
+
+    stats.record_level(levelStart, strategy, levelCount, len(level), len(groups), comparisons, merges, merges - len(nextLevel), primes)
+
+
+def combine_bitmask_level(
+        level: dict[tuple[int, int], int]
+    ) -> tuple[dict[tuple[int, int], int], set[tuple[int, int]]]:
+
+    # Group terms by the number of ones in their value, only adjacent groups can combine
+    groups: dict[int, list[tuple[int, int, int]]] = {}
+    for (value, mask), coverage in level.items():
+        groups.setdefault(value.bit_count(), []).append((value, mask, coverage))
+
+    nextLevel: dict[tuple[int, int], int] = {}
+    usedTerms: set[tuple[int, int]] = set()
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+    for weight, groupOne in groups.items():
+        groupTwo: Optional[list[tuple[int, int, int]]] = groups.get(weight + 1)
+        if not groupTwo:
+            continue
+
+        for valueOne, maskOne, coverageOne in groupOne:
+            # Every term is compared against a whole group, checking the limits per term costs next to nothing
+            if limits is not None and limits.reached():
+                break
+            for valueTwo, maskTwo, coverageTwo in groupTwo:
+                # Terms combine when their dashes line up and their values differ in exactly one bit
+                if maskOne != maskTwo:
+                    continue
+                difference: int = valueOne ^ valueTwo
+                if difference & (difference - 1):
+                    continue
+
+                nextLevel[(valueOne, maskOne | difference)] = coverageOne | coverageTwo
+                usedTerms.add((valueOne, maskOne))
+                usedTerms.add((valueTwo, maskTwo))
+
+    return nextLevel, usedTerms
+
+
+def combine_bitmask_level_hashed(
+        level: dict[tuple[int, int], int],
+        mintermLength: int
+    ) -> tuple[dict[tuple[int, int], int], set[tuple[int, int]]]:
+
+    # The level is already indexed by (value, mask). The only possible partner with one more 1 for a term is the term
+    # with the same mask and one of its free 0 bits set, so each term costs one lookup per variable instead of a scan
+    fullMask: int = (1 << mintermLength) - 1
+    nextLevel: dict[tuple[int, int], int] = {}
+    usedTerms: set[tuple[int, int]] = set()
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+    checkCountdown: int = LIMIT_CHECK_INTERVAL
+    for (value, mask), coverage in level.items():
+        if limits is not None:
+            checkCountdown -= 1
+            if not checkCountdown:
+                if limits.reached():
+                    break
+                checkCountdown = LIMIT_CHECK_INTERVAL
+        freeBits: int = fullMask & ~mask & ~value
+        while freeBits:
+            bit: int = freeBits & -freeBits
+            freeBits ^= bit
+            partner: tuple[int, int] = (value | bit, mask)
+            partnerCoverage: Optional[int] = level.get(partner)
+            if partnerCoverage is None:
+                continue
+
+            nextLevel[(value, mask | bit)] = coverage | partnerCoverage
+            usedTerms.add((value, mask))
+            usedTerms.add(partner)
+
+    return nextLevel, usedTerms
+
+
+def combine_bitmask_level_numpy(
+        level: dict[tuple[int, int], int],
+        mintermLength: int
+    ) -> tuple[dict[tuple[int, int], int], set[tuple[int, int]]]:
+
+    """
+    NumPy version of `combine_bitmask_level_hashed`.
+    Values and masks live in uint64 arrays and each term is packed into one (mask, value) key. For every bit
+    position, all terms with that bit free are flipped at once and their partners found by a binary search over the
+    sorted keys. Python only loops over the distinct merged cubes, to combine their coverage bitsets.
+    The solve limits are checked once per bit position and every LIMIT_CHECK_INTERVAL merged cubes.
+    """
+
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+
+    terms: list[tuple[int, int]] = list(level)
+    termCount: int = len(terms)
+    values = numpy.fromiter((value for value, _ in terms), dtype=numpy.uint64, count=termCount)
+    masks = numpy.fromiter((mask for _, mask in terms), dtype=numpy.uint64, count=termCount)
+    packedKeys = (masks << numpy.uint64(mintermLength)) | values
+    keyOrder = numpy.argsort(packedKeys)
+    sortedKeys = packedKeys[keyOrder]
+    occupiedBits = values | masks
+
+    lowerParts: list = []
+    upperParts: list = []
+    bitParts: list = []
+    for position in range(mintermLength):
+        if limits is not None and limits.reached():
+            break
+        bit = numpy.uint64(1 << position)
+        lowerIndices = numpy.flatnonzero((occupiedBits & bit) == 0)
+        if not lowerIndices.size:
+            continue
+        partnerKeys = packedKeys[lowerIndices] | bit
+        found = numpy.minimum(numpy.searchsorted(sortedKeys, partnerKeys), termCount - 1)
+        hits = sortedKeys[found] == partnerKeys
+        lowerParts.append(lowerIndices[hits])
+        upperParts.append(keyOrder[found[hits]])
+        bitParts.append(numpy.full(int(hits.sum()), bit, dtype=numpy.uint64))
+
+    nextLevel: dict[tuple[int, int], int] = {}
+    usedTerms: set[tuple[int, int]] = set()
+    if not lowerParts:
+        return nextLevel, usedTerms
+
+    lowerIndices = numpy.concatenate(lowerParts)
+    upperIndices = numpy.concatenate(upperParts)
+    mergedBits = numpy.concatenate(bitParts)
+    if not lowerIndices.size:
+        return nextLevel, usedTerms
+
+    usedFlags = numpy.zeros(termCount, dtype=bool)
+    usedFlags[lowerIndices] = True
+    usedFlags[upperIndices] = True
+    usedTerms = {terms[idx] for idx in numpy.flatnonzero(usedFlags).tolist()}
+
+    # A cube with k dashes is produced by k different pairs but always covers the same minterms, so only the first
+    # pair of each cube has its coverage combined
+    mergedMasks = masks[lowerIndices] | mergedBits
+    _, firstPairs = numpy.unique((mergedMasks << numpy.uint64(mintermLength)) | values[lowerIndices], return_index=True)
+    firstPairs.sort()
+    checkCountdown: int = LIMIT_CHECK_INTERVAL
+    for lowerIndex, upperIndex, mergedMask in zip(lowerIndices[firstPairs].tolist(), upperIndices[firstPairs].tolist(), mergedMasks[firstPairs].tolist()):
+        if limits is not None:
+            checkCountdown -= 1
+            if not checkCountdown:
+                if limits.reached():
+                    break
+                checkCountdown = LIMIT_CHECK_INTERVAL
+        lowerTerm: tuple[int, int] = terms[lowerIndex]
+        nextLevel[(lowerTerm[0], mergedMask)] = level[lowerTerm] | level[terms[upperIndex]]
+
+    return nextLevel, usedTerms
+
+
+def combine_bitmask_level_parallel(
+        level: dict[tuple[int, int], int],
+        mintermLength: int,
+        executor: "ProcessPoolExecutor",
+        workers: int
+    ) -> tuple[dict[tuple[int, int], int], set[tuple[int, int]]]:
+
+    """
+    Process pool version of `combine_bitmask_level_hashed`.
+    Terms are bucketed by (ones count, mask) since only equal masks in adjacent groups can merge. Each task gets a
+    few whole buckets as plain value lists, so every term is pickled once per group pair it belongs to and the
+    coverage bitsets never leave this process. Results are merged in submission order, keeping levels deterministic.
+    Under solve limits the wait for each task wakes up every LIMIT_POLL_SECONDS to check them, and once they are
+    reached the tasks not merged yet are cancelled and the level is left partial.
+    """
+
+    from concurrent.futures import Future, TimeoutError
+
+    buckets: dict[tuple[int, int], list[int]] = {}
+    for value, mask in level:
+        buckets.setdefault((value.bit_count(), mask), []).append(value)
+
+    tasks: list[list[tuple[int, list[int], list[int]]]] = []
+    taskSize: int = max(1, len(level) // (workers * PARALLEL_TASKS_PER_WORKER))
+    currentTask: list[tuple[int, list[int], list[int]]] = []
+    currentSize: int = 0
+    for (weight, mask), lowerValues in buckets.items():
+        upperValues: Optional[list[int]] = buckets.get((weight + 1, mask))
+        if not upperValues:
+            continue
+        currentTask.append((mask, lowerValues, upperValues))
+        currentSize += len(lowerValues) + len(upperValues)
+        if currentSize >= taskSize:
+            tasks.append(currentTask)
+            currentTask, currentSize = [], 0
+    if currentTask:
+        tasks.append(currentTask)
+
+    logger.verbose("Parallel level: %d buckets in %d tasks", len(buckets), len(tasks))
+
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+    futures: list[Future] = [executor.submit(find_bucket_merges, task, mintermLength) for task in tasks]
+
+    nextLevel: dict[tuple[int, int], int] = {}
+    usedTerms: set[tuple[int, int]] = set()
+    for index, future in enumerate(futures):
+        merges: Optional[list[tuple[int, int, int]]] = None
+        while merges is None:
+            if limits is not None and limits.reached():
+                for pendingFuture in futures[index:]:
+                    pendingFuture.cancel()
+                return nextLevel, usedTerms
+            try:
+                merges = future.result(timeout = LIMIT_POLL_SECONDS if limits is not None else None)
+            except TimeoutError:
+                pass
+        for value, mask, bit in merges:
+            partner: tuple[int, int] = (value | bit, mask)
+            nextLevel[(value, mask | bit)] = level[(value, mask)] | level[partner]
+            usedTerms.add((value, mask))
+            usedTerms.add(partner)
+
+    return nextLevel, usedTerms
+
+
+def find_bucket_merges(
+        task: list[tuple[int, list[int], list[int]]],
+        mintermLength: int
+    ) -> list[tuple[int, int, int]]:
+
+    # Runs in a worker process: returns (value, mask, bit) for every lower term whose partner value | bit exists
+    fullMask: int = (1 << mintermLength) - 1
+    merges: list[tuple[int, int, int]] = []
+    for mask, lowerValues, upperValues in task:
+        upperSet: set[int] = set(upperValues)
+        for value in lowerValues:
+            freeBits: int = fullMask & ~mask & ~value
+            while freeBits:
+                bit: int = freeBits & -freeBits
+                freeBits ^= bit
+                if value | bit in upperSet:
+                    merges.append((value, mask, bit))
+    return merges
+
+
+def split_minterm_table(
+        completeImplicantTable: list[list[any]],
+        mintermLength: int
+    ) -> tuple[list[int], list[int]]:
+
+    # Rebuild the integer value of every row from its bits, the first column is the most significant bit.
+    # Empty slots of a table placed by index are implied don't cares
+    onset: list[int] = []
+    dontCares: list[int] = []
+    for index, row in enumerate(completeImplicantTable):
+        if row is None:
+            dontCares.append(index)
+            continue
+        outputBit: any = row[-1]
+        if outputBit not in {1, "x"}:
+            continue
+        value: int = 0
+        for bit in row[-mintermLength - 1:-1]:
+            value = (value << 1) | bit
+        if outputBit == 1:
+            onset.append(value)
+        else:
+            dontCares.append(value)
+
+    return onset, dontCares
+
+
+def format_bitmask_implicant(
+        value: int,
+        mask: int,
+        mintermLength: int
+    ) -> str:
+
+    characters: list[str] = []
+    for position in range(mintermLength - 1, -1, -1):
+        bit: int = 1 << position
+        if mask & bit:
+            characters.append("-")
+        else:
+            characters.append("1" if value & bit else "0")
+    return "".join(characters)
+
+
+def format_bitmask_cover(
+        cubes: list[tuple[int, ...]],
+        mintermLength: int
+    ) -> str:
 
-    return uniquePrimeImplicants
\ No newline at end of file
+    # Pretty printed cubes of a cover, or of (value, mask, coverage) prime implicants, for the logs
+    return pretty_format([format_bitmask_implicant(cube[0], cube[1], mintermLength) for cube in cubes])
@@ -16,7 +16,60 @@ BG_RED: str     = "\x1b[41m"
 RESET = "\033[0m"
 
 
-OPTIONS: str = "m:d:l:yh"
-LONG_OPTIONS: list[str] = ["minterms=", "dontcares=", "labels=", "yes", "help"]
+OPTIONS: str = "m:d:l:n:s:e:j:b:cyh"
+LONG_OPTIONS: list[str] = ["minterms=", "dontcares=", "labels=", "inputs=", "solver=", "engine=", "jobs=", "strategy=", "outputs=", "batch=", "no-cache", "clear-cache", "stats=", "startup-report", "serve=", "connect=", "time-limit=", "memory-limit=", "convert", "yes", "help"]
 ALLOWED_EXTENSIONS: list[str] = [".txt", ".md", ".tsv", ".csv"]
-USAGE_TEXT: str = "[USAGE]"
\ No newline at end of file
+BINARY_EXTENSION: str = ".qmb"
+USAGE_TEXT: str = "[USAGE]"
+COMBINATION_STRATEGIES: list[str] = ["hash", "pairwise", "numpy"]
+COVER_SOLVERS: list[str] = ["branch-and-bound", "petrick"]
+MINIMIZATION_ENGINES: list[str] = ["exact", "heuristic"]
+STATS_FORMATS: list[str] = ["table", "json"]
+
+# Levels smaller than this are combined in-process even when workers are available
+PARALLEL_MIN_LEVEL_SIZE: int = 4096
+PARALLEL_TASKS_PER_WORKER: int = 4
+
+# Options a batch manifest line may set for its own job
+BATCH_JOB_OPTIONS: str = "m:d:l:n:s:e:"
+BATCH_JOB_LONG_OPTIONS: list[str] = ["minterms=", "dontcares=", "labels=", "inputs=", "solver=", "engine=", "strategy=", "no-cache", "time-limit=", "memory-limit="]
+
+# Packed (mask, value) keys of the NumPy combination have to fit in a uint64
+NUMPY_MAX_MINTERM_LENGTH: int = 32
+
+# Persistent result cache, the directory can be moved with the environment variable
+RESULT_CACHE_ENVIRONMENT_VARIABLE: str = "QM_CACHE_DIR"
+RESULT_CACHE_DEFAULT_DIRECTORY: str = "~/.cache/quine_mccluskey"
+RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+# Eviction trims the cache to this fraction of its cap
+RESULT_CACHE_LOW_WATER_MARK: float = 0.75
+# Temporary files younger than this may belong to a store still in flight, eviction and clearing leave them alone
+RESULT_CACHE_STALE_TEMPORARY_SECONDS: int = 3600
+
+# Functions this small are minimized through the representative of their class under input permutation and negation
+NP_MAX_MINTERM_LENGTH: int = 6
+# Functions with more symmetric variables than this many transforms to try go the regular way
+NP_MAX_CANDIDATES: int = 1024
+NP_MEMO_SIZE: int = 65536
+
+# Precomputed minimum covers of every 4 input function, written by generate_cover_library.py
+COVER_LIBRARY_FILE_NAME: str = "cover_library_4.qml"
+# Every don't care doubles the number of library lookups
+COVER_LIBRARY_MAX_DONT_CARES: int = 10
+
+# Imports plus setup of one command line run, reported by --startup-report
+STARTUP_BUDGET_SECONDS: float = 0.05
+
+# Longest request line the minimization daemon accepts
+DAEMON_MAX_REQUEST_BYTES: int = 16 * 1024 * 1024
+
+# Exit status of a run whose cover a time or memory limit cut short, the cover is valid but may not be minimum
+LIMIT_REACHED_EXIT_STATUS: int = 3
+# Suffixes --memory-limit accepts
+MEMORY_SIZE_SUFFIXES: dict[str, int] = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+# Terms combined between two checks of the time and memory limits
+LIMIT_CHECK_INTERVAL: int = 4096
+# Resident memory is sampled at most this often, the time limit is checked on every call
+LIMIT_MEMORY_CHECK_SECONDS: float = 0.01
+# Waits on worker processes wake up this often to check the limits
+LIMIT_POLL_SECONDS: float = 0.01
\ No newline at end of file
@@ -0,0 +1,402 @@
+import time
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from typing import Iterator, Optional
+from minimization_api import MinimizationResult, MintermSet, minterm_list, check_minimization_input
+from select_minimum_cover import select_minimum_cover, iterate_bits
+
+logger = get_logger(__name__)
+
+
+class IncrementalSession:
+
+    """
+    Minimization of one function that is edited a few minterms at a time. The session keeps every prime implicant of
+    the on-set plus don't cares, including those only covering don't cares, with its coverage over chart columns, and
+    for every minterm the primes containing it. Each on-set minterm owns one column, so an edit only touches the
+    primes and chart rows around the minterms it changes instead of generating the primes again. The chart falls apart
+    into components that share no prime, only those an edit touched are solved again.
+    """
+
+    __slots__ = (
+        "mintermLength", "solver", "onsetColumns", "columnMinterms", "dontCares", "primes", "mintermPrimes",
+        "components", "mintermComponents", "nextComponent", "dirtyMinterms", "lastCover"
+        )
+
+    def __init__(
+            self,
+            on: MintermSet,
+            dc: Optional[MintermSet] = None,
+            n: Optional[int] = None,
+            solver: str = "branch-and-bound",
+            strategy: str = "hash"
+        ) -> None:
+
+        onset: list[int] = minterm_list(on, "on-set")
+        dontCares: list[int] = minterm_list(dc, "don't care set") if dc is not None else []
+        self.mintermLength: int = check_minimization_input(onset, dontCares, n, solver, "exact", strategy)
+        self.solver: str = solver
+
+        self.onsetColumns: dict[int, int] = {minterm: column for column, minterm in enumerate(onset)}
+        self.columnMinterms: list[int] = onset
+        self.dontCares: set[int] = set(dontCares)
+        self.primes: dict[tuple[int, int], int] = {}
+        self.mintermPrimes: dict[int, set[tuple[int, int]]] = {}
+
+        # Components are numbered as they are solved, each holds its on-set minterms and their minimum cover
+        self.components: dict[int, tuple[list[int], list[tuple[int, int]]]] = {}
+        self.mintermComponents: dict[int, int] = {}
+        self.nextComponent: int = 0
+        self.dirtyMinterms: set[int] = set(onset)
+        self.lastCover: Optional[list[tuple[int, int]]] = None
+
+        # Generated with the don't cares as on-set terms so the primes only covering don't cares are kept too
+        from generate_prime_implicants import iterate_prime_implicants
+        for value, mask, _ in iterate_prime_implicants(sorted(onset + dontCares), [], self.mintermLength, strategy):
+            self.add_prime((value, mask))
+
+        logger.debug("Incremental session over %d inputs: %d minterms, %d don't cares, %d primes", self.mintermLength, len(onset), len(dontCares), len(self.primes))
+
+    def add_minterms(
+            self,
+            minterms: MintermSet
+        ) -> MinimizationResult:
+
+        """
+        Move minterms to the on-set, from the off-set or the don't cares, and return the new cover.
+        """
+
+        def edit(minterm: int) -> None:
+            if minterm in self.onsetColumns:
+                return
+            if minterm in self.dontCares:
+                self.dontCares.remove(minterm)
+                self.claim_column(minterm)
+            else:
+                self.claim_column(minterm)
+                self.grow_care_set(minterm)
+
+        return self.apply_edits(minterms, edit)
+
+    def remove_minterms(
+            self,
+            minterms: MintermSet
+        ) -> MinimizationResult:
+
+        """
+        Move on-set minterms to the off-set and return the new cover. Minterms not in the on-set are left alone.
+        """
+
+        def edit(minterm: int) -> None:
+            if minterm in self.onsetColumns:
+                self.release_column(minterm)
+                self.shrink_care_set(minterm)
+
+        return self.apply_edits(minterms, edit)
+
+    def add_dont_cares(
+            self,
+            dontCares: MintermSet
+        ) -> MinimizationResult:
+
+        """
+        Turn minterms into don't cares, from the off-set or the on-set, and return the new cover.
+        """
+
+        def edit(minterm: int) -> None:
+            if minterm in self.dontCares:
+                return
+            if minterm in self.onsetColumns:
+                self.release_column(minterm)
+                self.dontCares.add(minterm)
+            else:
+                self.dontCares.add(minterm)
+                self.grow_care_set(minterm)
+
+        return self.apply_edits(dontCares, edit)
+
+    def remove_dont_cares(
+            self,
+            dontCares: MintermSet
+        ) -> MinimizationResult:
+
+        """
+        Move don't cares to the off-set and return the new cover. Minterms that are not don't cares are left alone.
+        """
+
+        def edit(minterm: int) -> None:
+            if minterm in self.dontCares:
+                self.dontCares.remove(minterm)
+                self.shrink_care_set(minterm)
+
+        return self.apply_edits(dontCares, edit)
+
+    def cover(self) -> MinimizationResult:
+
+        """
+        Minimum cover of the function as it is now, only selected again after an edit.
+        """
+
+        coverStart: float = time.perf_counter()
+        if self.lastCover is None:
+            self.solve_dirty_components()
+            self.lastCover = sorted(cube for _, componentCover in self.components.values() for cube in componentCover)
+
+        return MinimizationResult(list(self.lastCover), self.mintermLength, {"cover": time.perf_counter() - coverStart}, True)
+
+    def apply_edits(
+            self,
+            minterms: MintermSet,
+            edit: any
+        ) -> MinimizationResult:
+
+        updateStart: float = time.perf_counter()
+        editedMinterms: list[int] = minterm_list(minterms, "edited minterms")
+        if editedMinterms and editedMinterms[-1] >= 1 << self.mintermLength:
+            raise ValueError(f"Minterm index '{editedMinterms[-1]}' does not fit in the {self.mintermLength} inputs of the session.")
+
+        for minterm in editedMinterms:
+            edit(minterm)
+        if self.dirtyMinterms:
+            self.lastCover = None
+        updateSeconds: float = time.perf_counter() - updateStart
+
+        logger.debug("Edited %d minterms in %.6fs, %d primes", len(editedMinterms), updateSeconds, len(self.primes))
+
+        result: MinimizationResult = self.cover()
+        result.timings["update"] = updateSeconds
+
+        return result
+
+    def solve_dirty_components(self) -> None:
+
+        # The cost adds up over components sharing no prime, so their minimum covers together are a minimum cover.
+        # A component is solved again when one of its minterms was edited or had a row change, which also catches
+        # components that merged or split
+        staleMinterms: set[int] = set(self.dirtyMinterms)
+        for minterm in self.dirtyMinterms:
+            component: Optional[int] = self.mintermComponents.get(minterm)
+            if component in self.components:
+                staleMinterms.update(self.components.pop(component)[0])
+        for minterm in staleMinterms:
+            self.mintermComponents.pop(minterm, None)
+        self.dirtyMinterms.clear()
+
+        pendingMinterms: set[int] = {minterm for minterm in staleMinterms if minterm in self.onsetColumns}
+        solvedComponents: int = 0
+        while pendingMinterms:
+            componentMinterms, componentPrimes = self.connected_component(pendingMinterms.pop())
+            pendingMinterms.difference_update(componentMinterms)
+
+            localColumns: dict[int, int] = {minterm: column for column, minterm in enumerate(componentMinterms)}
+            primeImplicants: list[tuple[int, int, int]] = []
+            for cube in sorted(componentPrimes):
+                coverage: int = 0
+                for column in iterate_bits(self.primes[cube]):
+                    coverage |= 1 << localColumns[self.columnMinterms[column]]
+                primeImplicants.append((cube[0], cube[1], coverage))
+
+            self.components[self.nextComponent] = (componentMinterms, select_minimum_cover(primeImplicants, len(componentMinterms), self.mintermLength, self.solver))
+            for minterm in componentMinterms:
+                self.mintermComponents[minterm] = self.nextComponent
+            self.nextComponent += 1
+            solvedComponents += 1
+
+        logger.debug("Solved %d of %d chart components", solvedComponents, len(self.components))
+
+    def connected_component(
+            self,
+            minterm: int
+        ) -> tuple[list[int], set[tuple[int, int]]]:
+
+        # On-set minterms reachable from `minterm` through shared primes, and those primes
+        componentMinterms: list[int] = [minterm]
+        componentPrimes: set[tuple[int, int]] = set()
+        reached: set[int] = {minterm}
+        frontier: list[int] = [minterm]
+        while frontier:
+            for cube in self.mintermPrimes[frontier.pop()]:
+                if cube in componentPrimes:
+                    continue
+                componentPrimes.add(cube)
+                for column in iterate_bits(self.primes[cube]):
+                    coveredMinterm: int = self.columnMinterms[column]
+                    if coveredMinterm not in reached:
+                        reached.add(coveredMinterm)
+                        componentMinterms.append(coveredMinterm)
+                        frontier.append(coveredMinterm)
+
+        return componentMinterms, componentPrimes
+
+    def claim_column(
+            self,
+            minterm: int
+        ) -> None:
+
+        # New on-set minterms take the next column, the rows of the primes containing them get its bit
+        column: int = len(self.columnMinterms)
+        self.columnMinterms.append(minterm)
+        self.onsetColumns[minterm] = column
+        self.dirtyMinterms.add(minterm)
+        for cube in self.mintermPrimes.get(minterm, ()):
+            self.mark_dirty(self.primes[cube])
+            self.primes[cube] |= 1 << column
+
+    def release_column(
+            self,
+            minterm: int
+        ) -> None:
+
+        # The last column moves into the freed one, so the columns stay numbered 0 to on-set size - 1
+        column: int = self.onsetColumns.pop(minterm)
+        self.dirtyMinterms.add(minterm)
+        for cube in self.mintermPrimes.get(minterm, ()):
+            self.mark_dirty(self.primes[cube])
+            self.primes[cube] &= ~(1 << column)
+
+        lastMinterm: int = self.columnMinterms.pop()
+        if lastMinterm != minterm:
+            movedBits: int = 1 << len(self.columnMinterms) | 1 << column
+            self.columnMinterms[column] = lastMinterm
+            self.onsetColumns[lastMinterm] = column
+            for cube in self.mintermPrimes[lastMinterm]:
+                self.primes[cube] ^= movedBits
+
+    def grow_care_set(
+            self,
+            minterm: int
+        ) -> None:
+
+        # Only implicants containing the new minterm can be new primes, and the old primes they contain are not prime
+        # anymore. No old prime contains the minterm, it was in the off-set
+        newPrimes: list[tuple[int, int]] = self.maximal_implicants_containing(minterm)
+        containedPrimes: set[tuple[int, int]] = set()
+        for newValue, newMask in newPrimes:
+            for coveredMinterm in iterate_cube_minterms(newValue, newMask):
+                for value, mask in self.mintermPrimes.get(coveredMinterm, ()):
+                    if mask & ~newMask == 0 and (value ^ newValue) & ~newMask == 0:
+                        containedPrimes.add((value, mask))
+
+        for cube in containedPrimes:
+            self.remove_prime(cube)
+        for cube in newPrimes:
+            self.add_prime(cube)
+
+    def shrink_care_set(
+            self,
+            minterm: int
+        ) -> None:
+
+        # Primes containing the removed minterm split into their largest subcubes without it, one per "-" position
+        # with that input fixed to the opposite of the minterm's bit. A split cube is prime unless another prime or
+        # split cube contains it, and any prime containing it contains its lowest minterm
+        splitCubes: set[tuple[int, int]] = set()
+        for value, mask in list(self.mintermPrimes.get(minterm, ())):
+            self.remove_prime((value, mask))
+            for position in iterate_bits(mask):
+                bit: int = 1 << position
+                splitCubes.add((value | (minterm & bit) ^ bit, mask ^ bit))
+
+        def is_contained(cube: tuple[int, int], container: tuple[int, int]) -> bool:
+            return cube != container and cube[1] & ~container[1] == 0 and (cube[0] ^ container[0]) & ~container[1] == 0
+
+        for splitCube in splitCubes:
+            if any(is_contained(splitCube, other) for other in splitCubes):
+                continue
+            if any(is_contained(splitCube, prime) for prime in self.mintermPrimes.get(splitCube[0], ())):
+                continue
+            self.add_prime(splitCube)
+
+    def add_prime(
+            self,
+            cube: tuple[int, int]
+        ) -> None:
+
+        # Indexed under every minterm of the cube, the on-set ones give its coverage and need a new cover
+        coverage: int = 0
+        for minterm in iterate_cube_minterms(*cube):
+            self.mintermPrimes.setdefault(minterm, set()).add(cube)
+            column: Optional[int] = self.onsetColumns.get(minterm)
+            if column is not None:
+                coverage |= 1 << column
+                self.dirtyMinterms.add(minterm)
+        self.primes[cube] = coverage
+
+    def remove_prime(
+            self,
+            cube: tuple[int, int]
+        ) -> None:
+
+        self.mark_dirty(self.primes.pop(cube))
+        for minterm in iterate_cube_minterms(*cube):
+            containingPrimes: set[tuple[int, int]] = self.mintermPrimes[minterm]
+            containingPrimes.discard(cube)
+            if not containingPrimes:
+                del self.mintermPrimes[minterm]
+
+    def mark_dirty(
+            self,
+            coverage: int
+        ) -> None:
+
+        self.dirtyMinterms.update(self.columnMinterms[column] for column in iterate_bits(coverage))
+
+    def maximal_implicants_containing(
+            self,
+            minterm: int
+        ) -> list[tuple[int, int]]:
+
+        """
+        Every prime implicant of the current on-set plus don't cares that contains `minterm`, found by freeing one
+        input at a time: a set of free inputs is only tried once all its subsets one input smaller are implicants.
+        """
+
+        knownCubes: dict[tuple[int, int], bool] = {}
+
+        def is_implicant(value: int, mask: int) -> bool:
+            if mask == 0:
+                return value in self.onsetColumns or value in self.dontCares
+            cube: tuple[int, int] = (value, mask)
+            implicant: Optional[bool] = knownCubes.get(cube)
+            if implicant is None:
+                bit: int = mask & -mask
+                implicant = is_implicant(value, mask ^ bit) and is_implicant(value | bit, mask ^ bit)
+                knownCubes[cube] = implicant
+            return implicant
+
+        implicantMasks: set[int] = {0}
+        containedMasks: set[int] = set()
+        level: list[int] = [0]
+        while level:
+            nextLevel: list[int] = []
+            for mask in level:
+                # Inputs are only added above the highest free one, so every set of free inputs is built once
+                for position in range(mask.bit_length(), self.mintermLength):
+                    extendedMask: int = mask | 1 << position
+                    if not all(extendedMask ^ 1 << freeInput in implicantMasks for freeInput in iterate_bits(mask)):
+                        continue
+                    if is_implicant(minterm & ~extendedMask, extendedMask):
+                        nextLevel.append(extendedMask)
+
+            for mask in nextLevel:
+                implicantMasks.add(mask)
+                for freeInput in iterate_bits(mask):
+                    containedMasks.add(mask ^ 1 << freeInput)
+            level = nextLevel
+
+        return [(minterm & ~mask, mask) for mask in implicantMasks if mask not in containedMasks]
+
+
+def iterate_cube_minterms(
+        value: int,
+        mask: int
+    ) -> Iterator[int]:
+
+    # Every minterm of the cube, walking the subsets of its mask
+    subMask: int = mask
+    while True:
+        yield value | subMask
+        if subMask == 0:
+            return
+        subMask = (subMask - 1) & mask
@@ -11,60 +11,111 @@ LEVEL_DEFAULTS = {
     ERROR: BG_RED + WHITE
 }
 
+# Levels the command line runs with, applied by `configure_logging`
+MODULE_LEVELS = {
+    "quine_mccluskey": VERBOSE,
+    "sanitize_qm_input": WARNING,
+    "generate_prime_implicants": DEBUG,
+    "parse_sum_of_products_input": VERBOSE
+}
+
+configured = False
+
 
 def make_colored_method(level_no):
+    # Checks the level before anything else and goes straight to `_log`, a disabled call costs one method call
     def fn(self, msg, *args, color=None, **kwargs):
-        if not self.isEnabledFor(level_no):
+        if not self.logger.isEnabledFor(level_no):
             return
-        color = color or LEVEL_DEFAULTS.get(level_no, RESET)
-        extra = kwargs.setdefault("extra", {})
-        extra["color"] = color
-        kwargs.setdefault("stacklevel", 2)
-        self.log(level_no, msg, *args, **kwargs)
+        kwargs["extra"] = {**(kwargs.get("extra") or {}), "color": color or LEVEL_DEFAULTS[level_no]}
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 1
+        self.logger._log(level_no, msg, args, **kwargs)
     return fn
 
 
+class ColorLogger(LoggerAdapter):
+
+    """
+    Module logger with a `verbose` level and a `color` keyword on every level. Wraps the standard logger instead of
+    patching `Logger`, so importing a module that logs changes nothing outside of it.
+    """
+
+    def __init__(self, logger):
+        super().__init__(logger, {})
+
+    debug = make_colored_method(DEBUG)
+    verbose = make_colored_method(VERBOSE)
+    info = make_colored_method(INFO)
+    warning = make_colored_method(WARNING)
+    error = make_colored_method(ERROR)
+
+
+def get_logger(name):
+    return ColorLogger(getLogger(name))
+
+
+class LazyFormat:
+
+    """
+    Log argument that is only turned into text when the record is actually emitted, e.g.
+    `logger.debug("Table:\n%s", LazyFormat(pformat, table))`.
+    """
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __str__(self):
+        return str(self.function(*self.args))
+
+
+def pretty_format(obj):
+    # `pprint` is only loaded once something is actually pretty printed
+    from pprint import pformat
+    return pformat(obj)
+
+
+def lazy_pformat(obj):
+    return LazyFormat(pretty_format, obj)
+
+
 class ColorFormatter(Formatter):
     def format(self, record):
         color = getattr(record, "color", RESET)
         record.msg = f"{color}{record.getMessage()}{RESET}"
         record.args = ()
         return super().format(record)
-    
 
-addLevelName(VERBOSE, "VERBOSE")
-def verbose(self, msg, *args, **kwargs):
-    if self.isEnabledFor(VERBOSE):
-        kwargs.setdefault("stacklevel", 2)
-        self._log(VERBOSE, msg, args, **kwargs)
-Logger.verbose = verbose
 
+def configure_logging():
+
+    """
+    Route all records through one colored stderr handler and apply the per-module levels. Called by the command line
+    entry points, importing the modules leaves logging untouched. Calling it again does nothing.
+    """
+
+    global configured
 
-for name, level in [
-    ("debug", DEBUG),
-    ("verbose", VERBOSE),
-    ("info",  INFO),
-    ("warning", WARNING),
-    ("error", ERROR)
-    ]:
-    setattr(Logger, name, make_colored_method(level))
+    if configured:
+        return
+    configured = True
 
+    addLevelName(VERBOSE, "VERBOSE")
 
-root = getLogger()
-root.setLevel(DEBUG)
+    root = getLogger()
+    root.setLevel(DEBUG)
 
-for handler in list(root.handlers):
-    root.removeHandler(handler)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
 
-handler = StreamHandler()
-handler.setFormatter(
-    ColorFormatter("%(levelname)s [%(name)s:%(funcName)s]:\n%(message)s\n")
-    )
+    handler = StreamHandler()
+    handler.setFormatter(
+        ColorFormatter("%(levelname)s [%(name)s:%(funcName)s]:\n%(message)s\n")
+        )
 
-root.addHandler(handler)
+    root.addHandler(handler)
 
-getLogger("quine_mccluskey").setLevel(VERBOSE)
-getLogger("sanitize_qm_input").setLevel(WARNING)
-getLogger("generate_prime_implicants").setLevel(DEBUG)
-getLogger("generate_missing_rows").setLevel(DEBUG)
-getLogger("parse_sum_of_products_input").setLevel(VERBOSE)
\ No newline at end of file
+    for name, level in MODULE_LEVELS.items():
+        getLogger(name).setLevel(level)
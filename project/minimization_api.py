@@ -0,0 +1,164 @@
+import time
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from typing import Iterable, Optional, Union
+
+logger = get_logger(__name__)
+
+# An on-set or don't care set: minterm indices, or an int with bit i set for minterm i
+MintermSet = Union[int, Iterable[int]]
+
+
+class MinimizationResult:
+
+    """
+    Cover found by `minimize`. `cubes` are (value, mask) pairs with the first input as the most significant bit and
+    mask bits marking eliminated inputs, `cost` is (cube count, literal count), the order the cover solvers minimize
+    in. `timings` holds the seconds spent preparing the input and minimizing it. `optimal` is True when the cover is
+    known to be minimum.
+    """
+
+    __slots__ = ("cubes", "inputs", "cost", "timings", "optimal")
+
+    def __init__(
+            self,
+            cubes: list[tuple[int, int]],
+            inputs: int,
+            timings: dict[str, float],
+            optimal: bool
+        ) -> None:
+
+        self.cubes: list[tuple[int, int]] = cubes
+        self.inputs: int = inputs
+        self.cost: tuple[int, int] = (len(cubes), sum(inputs - mask.bit_count() for _, mask in cubes))
+        self.timings: dict[str, float] = timings
+        self.optimal: bool = optimal
+
+    def sop(
+            self,
+            labels: Optional[list[str]] = None
+        ) -> str:
+
+        from format_sum_of_products import format_sum_of_products
+        return format_sum_of_products(self.cubes, self.inputs, labels)
+
+    def __repr__(self) -> str:
+
+        return f"MinimizationResult(inputs={self.inputs}, cubes={self.cubes}, cost={self.cost}, optimal={self.optimal})"
+
+
+def minimize(
+        on: MintermSet,
+        dc: Optional[MintermSet] = None,
+        n: Optional[int] = None,
+        solver: str = "branch-and-bound",
+        engine: str = "exact",
+        strategy: str = "hash",
+        workers: int = 1,
+        cache: bool = False,
+        timeLimit: Optional[float] = None,
+        memoryLimit: Optional[int] = None
+    ) -> MinimizationResult:
+
+    """
+    Minimize a function given by its on-set and optional don't cares, each a list (any iterable) of minterm indices
+    or an int bitset. The input count `n` defaults to the fewest inputs that hold the highest index. Options are those
+    of the command line; the result cache is only used when `cache` is set. With a time limit in seconds or a memory
+    limit in bytes of resident memory the run may add, the best cover found within them comes back marked as not
+    optimal.
+    Nothing is configured, logged above the levels the caller set up, or printed.
+    """
+
+    from quine_mccluskey import minimize_minterms
+    from solve_limits import SolveLimits, solving_within, solve_limits_for
+
+    prepareStart: float = time.perf_counter()
+    onset: list[int] = minterm_list(on, "on-set")
+    dontCares: list[int] = minterm_list(dc, "don't care set") if dc is not None else []
+    mintermLength: int = check_minimization_input(onset, dontCares, n, solver, engine, strategy)
+    minimizeStart: float = time.perf_counter()
+
+    limits: Optional[SolveLimits] = solve_limits_for(timeLimit, memoryLimit)
+    with solving_within(limits):
+        cover: list[tuple[int, int]] = minimize_minterms(onset, dontCares, mintermLength, solver, engine, workers, strategy, cache) if onset else []
+    finish: float = time.perf_counter()
+
+    optimal: bool = engine == "exact" and (limits is None or limits.limitReached is None)
+    return MinimizationResult(cover, mintermLength, {"prepare": minimizeStart - prepareStart, "minimize": finish - minimizeStart}, optimal)
+
+
+def minimize_many(
+        functions: Iterable[any],
+        **options: any
+    ) -> list[MinimizationResult]:
+
+    """
+    Minimize every function in turn with the keyword options of `minimize` as shared defaults. A function is an
+    on-set, an (on-set, don't cares[, n]) tuple, or a dict of `minimize` arguments overriding the defaults.
+    The first invalid function raises, the results come back in input order.
+    """
+
+    results: list[MinimizationResult] = []
+    for function in functions:
+        if isinstance(function, dict):
+            results.append(minimize(**{**options, **function}))
+        elif isinstance(function, tuple):
+            results.append(minimize(**{**options, **dict(zip(("on", "dc", "n"), function))}))
+        else:
+            results.append(minimize(function, **options))
+
+    return results
+
+
+def minterm_list(
+        minterms: MintermSet,
+        name: str
+    ) -> list[int]:
+
+    # Bitsets are taken apart lowest bit first, so they come out sorted
+    if isinstance(minterms, int) and not isinstance(minterms, bool):
+        if minterms < 0:
+            raise ValueError(f"The {name} bitset cannot be negative.")
+        indices: list[int] = []
+        while minterms:
+            lowestBit: int = minterms & -minterms
+            indices.append(lowestBit.bit_length() - 1)
+            minterms ^= lowestBit
+        return indices
+
+    indices = sorted(set(minterms))
+    if indices and (not all(isinstance(minterm, int) and not isinstance(minterm, bool) for minterm in indices) or indices[0] < 0):
+        raise ValueError(f"The {name} must hold non-negative integer minterm indices.")
+
+    return indices
+
+
+def check_minimization_input(
+        onset: list[int],
+        dontCares: list[int],
+        inputCount: Optional[int],
+        solver: str,
+        engine: str,
+        strategy: str
+    ) -> int:
+
+    # Same checks as the command line, raised as ValueError. Returns the input count
+    if solver not in COVER_SOLVERS:
+        raise ValueError(f"Solver `{solver}` not supported, must be one of: {COVER_SOLVERS}")
+    if engine not in MINIMIZATION_ENGINES:
+        raise ValueError(f"Engine `{engine}` not supported, must be one of: {MINIMIZATION_ENGINES}")
+    if strategy not in COMBINATION_STRATEGIES:
+        raise ValueError(f"Combination strategy `{strategy}` not supported, must be one of: {COMBINATION_STRATEGIES}")
+    if not set(onset).isdisjoint(dontCares):
+        raise ValueError("Cannot specify the same term as a minterm and a don't care.")
+
+    highestInputValue: int = max(onset[-1] if onset else 0, dontCares[-1] if dontCares else 0)
+    if inputCount is None:
+        return max(1, highestInputValue.bit_length())
+    if not isinstance(inputCount, int) or inputCount < 1:
+        raise ValueError(f"Input count `{inputCount}` must be a positive integer.")
+    if highestInputValue >= 1 << inputCount:
+        raise ValueError(f"Minterm index '{highestInputValue}' does not fit in the {inputCount} inputs specified.")
+
+    return inputCount
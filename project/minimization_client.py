@@ -0,0 +1,31 @@
+import json
+import socket
+
+
+def request_minimization(
+        socketPath: str,
+        request: dict[str, any]
+    ) -> dict[str, any]:
+
+    """
+    Send one request to a minimization daemon and wait for its answer (see `run_minimization_daemon` for the fields).
+    Kept to the standard library's socket and json, so a client run does not load any of the minimizer.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socketPath)
+        connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        connection.shutdown(socket.SHUT_WR)
+
+        chunks: list[bytes] = []
+        while True:
+            chunk: bytes = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    response: bytes = b"".join(chunks)
+    if not response.strip():
+        raise ConnectionError(f"Daemon on `{socketPath}` closed the connection without answering.")
+
+    return json.loads(response)
@@ -0,0 +1,259 @@
+import os
+import json
+import signal
+import socket
+import asyncio
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from concurrent.futures import ProcessPoolExecutor
+from batch_minimize import parse_job_arguments, run_batch_job, silence_batch_logging
+from solve_limits import parse_time_limit, parse_memory_size
+
+logger = get_logger(__name__)
+
+
+def run_minimization_daemon(
+        socketPath: str,
+        workers: int,
+        defaults: dict[str, any]
+    ) -> None:
+
+    """
+    Serve minimization jobs on a Unix domain socket until SIGINT or SIGTERM.
+    The protocol is one JSON object per line each way. A request holds either `argv`, the flags of a single run as a
+    list (`["-m", "0,1,5", "-n", "3"]` or `["table.csv", "-s", "petrick"]`, relative paths resolved against `cwd`), or
+    the fields `minterms`, `dontcares` (comma separated strings or integer lists), `inputs` and `path`, plus optional
+    `labels`, `solver`, `engine`, `strategy`, `cache` (whether the job may use the result cache), `time_limit`
+    (seconds) and `memory_limit` (bytes, or a size like "512M"). An `id` is echoed back. The response is the batch job result, with `optimal` and `limit_reached`.
+    Jobs run in a pool of `workers` processes that stay up, so their in-memory caches and the cover library stay warm
+    between requests. Requests on one connection run concurrently and are answered as they finish.
+    """
+
+    asyncio.run(serve_minimization_daemon(socketPath, workers, defaults))
+
+
+async def serve_minimization_daemon(
+        socketPath: str,
+        workers: int,
+        defaults: dict[str, any]
+    ) -> None:
+
+    socketPath = os.path.abspath(os.path.expanduser(socketPath))
+    remove_stale_socket(socketPath)
+
+    jobDefaults: dict[str, any] = {
+        "labels": defaults.get("labels"),
+        "solver": defaults.get("solver", "branch-and-bound"),
+        "engine": defaults.get("engine", "exact"),
+        "strategy": defaults.get("strategy", "hash"),
+        "cache": defaults.get("cache", False),
+        "timeLimit": defaults.get("timeLimit"),
+        "memoryLimit": defaults.get("memoryLimit")
+    }
+    requestCounter: list[int] = [0]
+    # Open connections by handler task, with the writer and the answers still running
+    connections: dict[asyncio.Task, tuple[asyncio.StreamWriter, set[asyncio.Task]]] = {}
+
+    silence_batch_logging()
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    stopEvent: asyncio.Event = asyncio.Event()
+    for signalNumber in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signalNumber, stopEvent.set)
+
+    with ProcessPoolExecutor(max_workers = workers, initializer = silence_batch_logging) as executor:
+        # Workers have to be forked before the first connection is accepted, one forked later would inherit that
+        # connection's socket and keep it open after the daemon closes it. They load the cover library while at it
+        await asyncio.gather(*(loop.run_in_executor(executor, warm_daemon_worker) for _ in range(workers)))
+
+        server: asyncio.AbstractServer = await asyncio.start_unix_server(
+            lambda reader, writer: handle_daemon_connection(reader, writer, executor, workers, jobDefaults, requestCounter, connections),
+            path = socketPath,
+            limit = DAEMON_MAX_REQUEST_BYTES
+            )
+        logger.warning("Minimization daemon listening on `%s` with %d workers", socketPath, workers)
+
+        try:
+            await stopEvent.wait()
+        finally:
+            # Open connections are closed and their answers cancelled, so every handler sees the end of its stream
+            # and returns by itself instead of being cancelled mid-read
+            server.close()
+            for writer, answers in list(connections.values()):
+                for answer in answers:
+                    answer.cancel()
+                writer.close()
+            await asyncio.gather(*connections, return_exceptions = True)
+            await server.wait_closed()
+            try:
+                os.remove(socketPath)
+            except OSError:
+                pass
+
+    logger.warning("Minimization daemon stopped after %d requests", requestCounter[0])
+
+
+async def handle_daemon_connection(
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        executor: ProcessPoolExecutor,
+        workers: int,
+        jobDefaults: dict[str, any],
+        requestCounter: list[int],
+        connections: dict[asyncio.Task, tuple[asyncio.StreamWriter, set[asyncio.Task]]]
+    ) -> None:
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    # A client pipelining many requests only has a few per worker running at once
+    inFlight: asyncio.Semaphore = asyncio.Semaphore(workers * PARALLEL_TASKS_PER_WORKER)
+    tasks: set[asyncio.Task] = set()
+    handlerTask: asyncio.Task = asyncio.current_task()
+    connections[handlerTask] = (writer, tasks)
+
+    async def answer(requestId: any, job: dict[str, any], index: int) -> None:
+        try:
+            result: dict[str, any] = await loop.run_in_executor(executor, run_batch_job, index, job)
+        except Exception as e:
+            result = {"index": index, "job": job["name"], "status": "error", "error": f"{type(e).__name__}: {e}"}
+        finally:
+            inFlight.release()
+        write_daemon_response(writer, requestId, result)
+        await writer.drain()
+
+    try:
+        while True:
+            try:
+                line: bytes = await reader.readline()
+            except ValueError:
+                write_daemon_response(writer, None, {"status": "error", "error": f"Request longer than {DAEMON_MAX_REQUEST_BYTES} bytes."})
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+
+            index: int = requestCounter[0]
+            requestCounter[0] += 1
+            requestId: any = None
+            try:
+                request: dict[str, any] = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                requestId = request.get("id")
+                job: dict[str, any] = build_daemon_job(request, jobDefaults)
+            except Exception as e:
+                write_daemon_response(writer, requestId, {"index": index, "status": "error", "error": f"{type(e).__name__}: {e}"})
+                await writer.drain()
+                continue
+
+            await inFlight.acquire()
+            task: asyncio.Task = asyncio.create_task(answer(requestId, job, index))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions = True)
+    except ConnectionError:
+        pass
+    finally:
+        # A dropped client or the server shutting down leaves answers nobody will read, cancellation itself propagates
+        for task in tasks:
+            task.cancel()
+        connections.pop(handlerTask, None)
+        writer.close()
+
+
+def warm_daemon_worker() -> None:
+
+    from cover_library import load_cover_library
+    load_cover_library()
+
+
+def build_daemon_job(
+        request: dict[str, any],
+        jobDefaults: dict[str, any]
+    ) -> dict[str, any]:
+
+    # `argv` goes through the batch manifest parser, so a request takes exactly the flags of a single job
+    if "argv" in request:
+        arguments: any = request["argv"]
+        if not isinstance(arguments, list) or not all(isinstance(argument, str) for argument in arguments):
+            raise ValueError("`argv` must be a list of strings")
+        jobName: str = str(request.get("id", "request"))
+        return parse_job_arguments(arguments, f"Request {jobName}", jobName, request.get("cwd") or os.getcwd(), jobDefaults)
+
+    job: dict[str, any] = {**jobDefaults, "name": str(request.get("id", "request")), "path": None, "minterms": None, "dontcares": None, "inputs": None}
+    for field in ("labels", "solver", "engine", "strategy"):
+        if request.get(field) is not None:
+            job[field] = request[field]
+    if job["solver"] not in COVER_SOLVERS:
+        raise ValueError(f"Solver `{job['solver']}` not supported, must be one of: {COVER_SOLVERS}")
+    if job["engine"] not in MINIMIZATION_ENGINES:
+        raise ValueError(f"Engine `{job['engine']}` not supported, must be one of: {MINIMIZATION_ENGINES}")
+    if job["strategy"] not in COMBINATION_STRATEGIES:
+        raise ValueError(f"Combination strategy `{job['strategy']}` not supported, must be one of: {COMBINATION_STRATEGIES}")
+    if request.get("cache") is not None:
+        if not isinstance(request["cache"], bool):
+            raise ValueError("`cache` must be true or false.")
+        job["cache"] = request["cache"]
+    if request.get("time_limit") is not None:
+        job["timeLimit"] = parse_time_limit(str(request["time_limit"]))
+    if request.get("memory_limit") is not None:
+        job["memoryLimit"] = parse_memory_size(str(request["memory_limit"]))
+
+    if request.get("path") is not None:
+        job["path"] = os.path.join(request.get("cwd") or os.getcwd(), os.path.expanduser(request["path"]))
+        job["name"] = str(request.get("id", request["path"]))
+    elif request.get("minterms") is not None:
+        job["minterms"] = join_minterm_field(request["minterms"])
+        job["dontcares"] = join_minterm_field(request["dontcares"]) if request.get("dontcares") else None
+        if request.get("inputs") is not None:
+            if not isinstance(request["inputs"], int) or request["inputs"] < 1:
+                raise ValueError(f"Input count `{request['inputs']}` must be a positive integer.")
+            job["inputs"] = request["inputs"]
+    else:
+        raise ValueError("Request needs `argv`, `path` or `minterms`.")
+
+    return job
+
+
+def join_minterm_field(
+        field: any
+    ) -> str:
+
+    # Integer lists become the comma separated form `parse_sop_minterms` reads
+    if isinstance(field, str):
+        return field
+    if isinstance(field, list) and all(isinstance(minterm, int) for minterm in field):
+        return ",".join(map(str, field))
+    raise ValueError("Minterms must be a comma separated string or a list of integers.")
+
+
+def write_daemon_response(
+        writer: asyncio.StreamWriter,
+        requestId: any,
+        result: dict[str, any]
+    ) -> None:
+
+    writer.write((json.dumps({"id": requestId, **result}) + "\n").encode("utf-8"))
+
+
+def remove_stale_socket(
+        socketPath: str
+    ) -> None:
+
+    # A socket file nobody answers on is left over from a daemon that did not shut down cleanly
+    if not os.path.exists(socketPath):
+        os.makedirs(os.path.dirname(socketPath), exist_ok = True)
+        return
+
+    probe: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socketPath)
+    except OSError:
+        os.remove(socketPath)
+        return
+    finally:
+        probe.close()
+
+    raise FileExistsError(f"A daemon is already listening on `{socketPath}`.")
@@ -0,0 +1,184 @@
+from logger_setup import get_logger, LazyFormat
+from logging import *
+from global_constants import *
+from typing import Optional, Sequence
+from select_minimum_cover import select_minimum_cover, cover_with_largest_implicants
+from espresso_heuristic import espresso_minimize
+from generate_prime_implicants import format_bitmask_cover
+import solve_limits
+
+logger = get_logger(__name__)
+
+
+def minimize_multi_output(
+        onsets: Sequence[Sequence[int]],
+        dontCareSets: Sequence[Sequence[int]],
+        mintermLength: int,
+        solver: str = "branch-and-bound",
+        engine: str = "exact"
+    ) -> list[list[tuple[int, int]]]:
+
+    """
+    Minimize several outputs over the same inputs together, so that product terms are shared between them.
+    Implicants are generated once, each tagged with the bitset of outputs it is an implicant of. Two terms merge into
+    a term tagged with the intersection of their tags, and a term only stops being prime when it merges without
+    losing an output. The cover chart has one column per (output, on-set minterm) pair and each product term is paid
+    for once, however many outputs use it.
+    Returns one cover of (value, mask) cubes per output. The heuristic engine minimizes each output on its own.
+    """
+
+    if len(onsets) != len(dontCareSets):
+        raise ValueError(f"{len(onsets)} on-sets given with {len(dontCareSets)} don't care sets.")
+
+    if engine == "heuristic":
+        return [espresso_minimize(onset, dontCares, mintermLength) for onset, dontCares in zip(onsets, dontCareSets)]
+
+    taggedImplicants: list[tuple[int, int, int, int]]
+    outputColumns: list[int]
+    taggedImplicants, outputColumns = generate_tagged_prime_implicants(onsets, dontCareSets, mintermLength)
+    columnCount: int = sum(len(onset) for onset in onsets)
+
+    logger.info("%d multi-output prime implicants for %d outputs and %d chart columns", len(taggedImplicants), len(onsets), columnCount)
+
+    implicants: list[tuple[int, int, int]] = [(value, mask, coverage) for value, mask, _, coverage in taggedImplicants]
+    sharedCover: list[tuple[int, int]]
+    if solve_limits.activeLimits is not None and solve_limits.activeLimits.limitReached is not None:
+        # Generation was cut short and left implicants that are not all prime, too many to build a chart of
+        sharedCover = cover_with_largest_implicants(implicants, columnCount)
+    else:
+        sharedCover = select_minimum_cover(implicants, columnCount, mintermLength, solver)
+
+    coverageByCube: dict[tuple[int, int], int] = {(value, mask): coverage for value, mask, _, coverage in taggedImplicants}
+    covers: list[list[tuple[int, int]]] = [
+        assign_output_cover(sharedCover, coverageByCube, columns) for columns in outputColumns
+        ]
+
+    logger.info("%d product terms shared by %d outputs, %d output connections", len(sharedCover), len(onsets), sum(map(len, covers)))
+    for output, cover in enumerate(covers):
+        logger.verbose("Output %d cover: %s", output, LazyFormat(format_bitmask_cover, cover, mintermLength))
+
+    return covers
+
+
+def generate_tagged_prime_implicants(
+        onsets: Sequence[Sequence[int]],
+        dontCareSets: Sequence[Sequence[int]],
+        mintermLength: int
+    ) -> tuple[list[tuple[int, int, int, int]], list[int]]:
+
+    """
+    Multi-output counterpart of `generate_prime_implicants_bitmask`, using the same hashed partner lookup.
+    Returns the prime implicants as (value, mask, output tag, coverage), with coverage being a bitset over the
+    chart columns, and per output the bitset of its columns. Once the solve limits are reached, the implicants found
+    so far come back instead, like in the single output generation.
+    """
+
+    # Columns of output k follow those of output k - 1, one per on-set minterm
+    outputColumns: list[int] = []
+    terms: dict[int, list[int]] = {}
+    column: int = 0
+    for output, (onset, dontCares) in enumerate(zip(onsets, dontCareSets)):
+        outputBit: int = 1 << output
+        firstColumn: int = column
+        for minterm in onset:
+            entry: list[int] = terms.setdefault(minterm, [0, 0])
+            entry[0] |= outputBit
+            entry[1] |= 1 << column
+            column += 1
+        outputColumns.append(((1 << column) - 1) ^ ((1 << firstColumn) - 1))
+        for minterm in dontCares:
+            terms.setdefault(minterm, [0, 0])[0] |= outputBit
+
+    level: dict[tuple[int, int], tuple[int, int]] = {(minterm, 0): (tag, coverage) for minterm, (tag, coverage) in terms.items()}
+    del terms
+
+    # Column bitset of every output set met so far
+    tagColumns: dict[int, int] = {}
+
+    def columns_of_tag(tag: int) -> int:
+        columns: Optional[int] = tagColumns.get(tag)
+        if columns is None:
+            columns = 0
+            remainingTag: int = tag
+            while remainingTag:
+                outputBit: int = remainingTag & -remainingTag
+                remainingTag ^= outputBit
+                columns |= outputColumns[outputBit.bit_length() - 1]
+            tagColumns[tag] = columns
+        return columns
+
+    fullMask: int = (1 << mintermLength) - 1
+    primeImplicants: list[tuple[int, int, int, int]] = []
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.activeLimits
+    checkCountdown: int = LIMIT_CHECK_INTERVAL
+    levelCount: int = 0
+    while level:
+        logger.debug("Multi-output level %d: %d terms", levelCount, len(level))
+
+        nextLevel: dict[tuple[int, int], tuple[int, int]] = {}
+        usedTerms: set[tuple[int, int]] = set()
+        for (value, mask), (tag, coverage) in level.items():
+            if limits is not None:
+                checkCountdown -= 1
+                if not checkCountdown:
+                    if limits.reached():
+                        break
+                    checkCountdown = LIMIT_CHECK_INTERVAL
+            freeBits: int = fullMask & ~mask & ~value
+            while freeBits:
+                bit: int = freeBits & -freeBits
+                freeBits ^= bit
+                partner: tuple[int, int] = (value | bit, mask)
+                partnerTerm: Optional[tuple[int, int]] = level.get(partner)
+                if partnerTerm is None:
+                    continue
+                partnerTag, partnerCoverage = partnerTerm
+                mergedTag: int = tag & partnerTag
+                if not mergedTag:
+                    continue
+
+                nextLevel[(value, mask | bit)] = (mergedTag, (coverage | partnerCoverage) & columns_of_tag(mergedTag))
+                # A term is only covered by the merge when no output is lost on the way
+                if mergedTag == tag:
+                    usedTerms.add((value, mask))
+                if mergedTag == partnerTag:
+                    usedTerms.add(partner)
+
+        # Out of budget: every term of this level and of the next one built so far is an implicant of its outputs,
+        # together with the primes already found they still cover every column
+        if limits is not None and limits.reached():
+            for (value, mask), (tag, coverage) in (*level.items(), *nextLevel.items()):
+                if coverage:
+                    primeImplicants.append((value, mask, tag, coverage))
+            break
+
+        for (value, mask), (tag, coverage) in level.items():
+            if coverage and (value, mask) not in usedTerms:
+                primeImplicants.append((value, mask, tag, coverage))
+
+        level = nextLevel
+        levelCount += 1
+
+    return primeImplicants, outputColumns
+
+
+def assign_output_cover(
+        sharedCover: list[tuple[int, int]],
+        coverageByCube: dict[tuple[int, int], int],
+        columns: int
+    ) -> list[tuple[int, int]]:
+
+    # Connect an output to the shared terms covering its columns, leaving out the ones the others make redundant,
+    # smallest cubes first
+    candidates: list[tuple[int, int]] = [cube for cube in sharedCover if coverageByCube[cube] & columns]
+    candidates.sort(key=lambda cube: cube[1].bit_count())
+
+    outputCover: list[tuple[int, int]] = []
+    for idx, cube in enumerate(candidates):
+        othersCoverage: int = 0
+        for other in outputCover + candidates[idx + 1:]:
+            othersCoverage |= coverageByCube[other]
+        if columns & ~othersCoverage & coverageByCube[cube]:
+            outputCover.append(cube)
+
+    return outputCover
@@ -0,0 +1,225 @@
+from logger_setup import get_logger
+from math import factorial
+from functools import lru_cache
+from itertools import permutations, product
+from logging import *
+from global_constants import *
+from typing import Optional, Sequence
+from generate_prime_implicants import generate_prime_implicants_bitmask
+from select_minimum_cover import select_minimum_cover
+
+logger = get_logger(__name__)
+
+
+def np_minimize(
+        onset: Sequence[int],
+        dontCares: Sequence[int],
+        mintermLength: int,
+        solver: str = "branch-and-bound"
+    ) -> Optional[list[tuple[int, int]]]:
+
+    """
+    Minimum cover of a small function through its NP class: the function is mapped to the representative of all the
+    functions equal to it up to permuting and negating inputs, the representative's cover is looked up in an
+    in-memory memo (or computed once), and the cover is mapped back. Cube and literal counts do not change under
+    these transforms, so the cover stays minimal.
+    Negating the output is left out, a cover of the complement says nothing about the cover of the function.
+    Returns None when the function has too many inputs or too many equivalent transforms to try.
+    """
+
+    if mintermLength > NP_MAX_MINTERM_LENGTH:
+        return None
+
+    onsetTable: int = 0
+    for minterm in onset:
+        onsetTable |= 1 << minterm
+    dontCareTable: int = 0
+    for minterm in dontCares:
+        dontCareTable |= 1 << minterm
+    dontCareTable &= ~onsetTable
+
+    cover: Optional[tuple[tuple[int, int], ...]] = minimize_np_member(onsetTable, dontCareTable, mintermLength, solver)
+
+    return list(cover) if cover is not None else None
+
+
+@lru_cache(maxsize = NP_MEMO_SIZE)
+def minimize_np_member(
+        onsetTable: int,
+        dontCareTable: int,
+        mintermLength: int,
+        solver: str
+    ) -> Optional[tuple[tuple[int, int], ...]]:
+
+    # Memoized as well, so a function seen before does not even need its canonical form again
+    canonicalForm: Optional[tuple[int, int, tuple[int, ...], int]] = np_canonical_form(onsetTable, dontCareTable, mintermLength)
+    if canonicalForm is None:
+        return None
+    canonicalOnset, canonicalDontCares, positions, negationMask = canonicalForm
+
+    canonicalCover: tuple[tuple[int, int], ...] = minimize_np_representative(canonicalOnset, canonicalDontCares, mintermLength, solver)
+
+    # Back from the representative: undo the permutation, then the negation of the fixed bits
+    cover: list[tuple[int, int]] = []
+    for value, mask in canonicalCover:
+        originalValue: int = 0
+        originalMask: int = 0
+        for variable, position in enumerate(positions):
+            originalValue |= (value >> position & 1) << variable
+            originalMask |= (mask >> position & 1) << variable
+        cover.append((originalValue ^ (negationMask & ~originalMask), originalMask))
+
+    return tuple(cover)
+
+
+def np_canonical_form(
+        onsetTable: int,
+        dontCareTable: int,
+        mintermLength: int
+    ) -> Optional[tuple[int, int, tuple[int, ...], int]]:
+
+    """
+    Canonical representative of a function given as on-set and don't care truth tables (bit m stands for minterm m).
+    Each variable is first given a polarity and a place from its cofactor sizes, which do not depend on how the
+    inputs were permuted or negated. Only the choices those sizes leave open are tried, and the smallest resulting
+    (on-set, don't care) pair is the representative.
+    Returns (on-set, don't cares, new bit position per variable, negated variables), where minterm x of the
+    function is minterm positions(x ^ negated) of the representative. None when too many choices are left open.
+    """
+
+    variableMasks: list[int] = np_variable_masks(mintermLength)
+    onsetCount: int = onsetTable.bit_count()
+    dontCareCount: int = dontCareTable.bit_count()
+
+    # Per variable the (on-set, don't care) counts of both cofactors, heavier cofactor first
+    signatures: list[tuple] = []
+    negationChoices: list[tuple[int, ...]] = []
+    for variable in range(mintermLength):
+        oneCofactor: tuple[int, int] = ((onsetTable & variableMasks[variable]).bit_count(), (dontCareTable & variableMasks[variable]).bit_count())
+        zeroCofactor: tuple[int, int] = (onsetCount - oneCofactor[0], dontCareCount - oneCofactor[1])
+        if oneCofactor > zeroCofactor:
+            negationChoices.append((0,))
+        elif oneCofactor < zeroCofactor:
+            negationChoices.append((1,))
+        else:
+            negationChoices.append((0, 1))
+        signatures.append((max(oneCofactor, zeroCofactor), min(oneCofactor, zeroCofactor)))
+
+    # Tie breaking: per variable, the on-set counts of the four quadrants it forms with every other variable, each
+    # taken in the orientation that is smallest under negating either of the two
+    for variable in range(mintermLength):
+        quadrants: list[tuple[int, int, int, int]] = []
+        for other in range(mintermLength):
+            if other == variable:
+                continue
+            bothOnes: int = (onsetTable & variableMasks[variable] & variableMasks[other]).bit_count()
+            oneZero: int = (onsetTable & variableMasks[variable]).bit_count() - bothOnes
+            zeroOne: int = (onsetTable & variableMasks[other]).bit_count() - bothOnes
+            bothZeros: int = onsetCount - bothOnes - oneZero - zeroOne
+            quadrants.append(min(
+                (bothZeros, zeroOne, oneZero, bothOnes),
+                (zeroOne, bothZeros, bothOnes, oneZero),
+                (oneZero, bothOnes, bothZeros, zeroOne),
+                (bothOnes, oneZero, zeroOne, bothZeros)
+                ))
+        signatures[variable] += tuple(sorted(quadrants))
+
+    # Heaviest signature gets the most significant position, variables with equal signatures can take each other's
+    order: list[int] = sorted(range(mintermLength), key=lambda variable: signatures[variable], reverse = True)
+    groups: list[list[int]] = []
+    for variable in order:
+        if groups and signatures[groups[-1][0]] == signatures[variable]:
+            groups[-1].append(variable)
+        else:
+            groups.append([variable])
+
+    candidateCount: int = 1
+    for group in groups:
+        candidateCount *= factorial(len(group))
+    for choices in negationChoices:
+        candidateCount *= len(choices)
+    if candidateCount > NP_MAX_CANDIDATES:
+        logger.debug("NP canonical form skipped, %d candidate transforms", candidateCount)
+        return None
+
+    best: Optional[tuple[int, int, tuple[int, ...], int]] = None
+    for groupOrders in product(*(permutations(group) for group in groups)):
+        positions: list[int] = [0] * mintermLength
+        position: int = mintermLength
+        for groupOrder in groupOrders:
+            for variable in groupOrder:
+                position -= 1
+                positions[variable] = position
+
+        # x ^ negated permuted equals x permuted ^ negated permuted, so the permutation is applied once per order
+        permutedOnset: int = permute_truth_table(onsetTable, positions, variableMasks)
+        permutedDontCares: int = permute_truth_table(dontCareTable, positions, variableMasks)
+
+        for negations in product(*negationChoices):
+            negationMask: int = 0
+            imageOnset: int = permutedOnset
+            imageDontCares: int = permutedDontCares
+            for variable, negated in enumerate(negations):
+                if negated:
+                    negationMask |= 1 << variable
+                    imageOnset = negate_truth_table(imageOnset, positions[variable], variableMasks)
+                    imageDontCares = negate_truth_table(imageDontCares, positions[variable], variableMasks)
+            if best is None or (imageOnset, imageDontCares) < best[:2]:
+                best = (imageOnset, imageDontCares, tuple(positions), negationMask)
+
+    return best
+
+
+def permute_truth_table(
+        truthTable: int,
+        positions: list[int],
+        variableMasks: list[int]
+    ) -> int:
+
+    # Move every variable to its position with swaps of two variables, each a delta swap on the whole table
+    current: list[int] = list(range(len(positions)))
+    for variable, target in enumerate(positions):
+        source: int = current.index(variable)
+        if source == target:
+            continue
+        low, high = min(source, target), max(source, target)
+        shift: int = (1 << high) - (1 << low)
+        lowOnly: int = variableMasks[low] & ~variableMasks[high]
+        truthTable = (truthTable & ~(lowOnly | lowOnly << shift)) | (truthTable & lowOnly) << shift | (truthTable >> shift) & lowOnly
+        current[source], current[target] = current[target], current[source]
+    return truthTable
+
+
+def negate_truth_table(
+        truthTable: int,
+        position: int,
+        variableMasks: list[int]
+    ) -> int:
+
+    shift: int = 1 << position
+    return (truthTable & variableMasks[position]) >> shift | (truthTable & ~variableMasks[position]) << shift
+
+
+@lru_cache(maxsize = NP_MEMO_SIZE)
+def minimize_np_representative(
+        onsetTable: int,
+        dontCareTable: int,
+        mintermLength: int,
+        solver: str
+    ) -> tuple[tuple[int, int], ...]:
+
+    onset: list[int] = [minterm for minterm in range(1 << mintermLength) if onsetTable >> minterm & 1]
+    dontCares: list[int] = [minterm for minterm in range(1 << mintermLength) if dontCareTable >> minterm & 1]
+
+    primeImplicants: list[tuple[int, int, int]] = generate_prime_implicants_bitmask(onset, dontCares, mintermLength)
+
+    return tuple(select_minimum_cover(primeImplicants, len(onset), mintermLength, solver))
+
+
+@lru_cache(maxsize = None)
+def np_variable_masks(
+        mintermLength: int
+    ) -> list[int]:
+
+    # Truth table of every variable: bit m is set when variable i is 1 in minterm m
+    return [sum(1 << minterm for minterm in range(1 << mintermLength) if minterm >> variable & 1) for variable in range(mintermLength)]
@@ -10,10 +10,10 @@ import getopt
 import re
 from pprint import pformat, pprint
 from logging import *
-import logger_setup
+from logger_setup import get_logger
 from sanitize_qm_input import sanitize_file_input
 
-logger = getLogger(__name__)
+logger = get_logger(__name__)
 
 # Define global constants
 OPTIONS = "yh"
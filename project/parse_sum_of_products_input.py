@@ -4,9 +4,9 @@ from global_constants import *
 import re
 import heapq
 from typing import Optional
-from pprint import pformat
+from logger_setup import get_logger, lazy_pformat
 
-logger = getLogger(__name__)
+logger = get_logger(__name__)
 
 def parse_sop_input(
         mintermInputString: str,
@@ -14,18 +14,17 @@ def parse_sop_input(
         inputCount: int = None
         ) -> list[list[any]]:
     
-    logger.verbose(f"SoP minterm string:\n{mintermInputString}")
-    logger.verbose(f"SoP don't care string:\n{dontCareInputString}")
+    logger.verbose("SoP minterm string:\n%s", mintermInputString)
+    logger.verbose("SoP don't care string:\n%s", dontCareInputString)
 
     sanitizedDontCareInput: list[str] = None
     
-    # Remove duplicates, any value other than a digit, split by comma, sort ascending, cast final list values as integers
-    sanitizedMintermInput: list[int] = cast_str_list_as_int(sorted(list(filter(None, list(set(re.split(",", re.sub("[^0-9-]", ",", mintermInputString))))))))   
+    sanitizedMintermInput: list[int] = split_sop_string(mintermInputString)
     if dontCareInputString:
-        sanitizedDontCareInput: list[str] = cast_str_list_as_int(sorted(list(filter(None, list(set(re.split(",", re.sub("[^0-9-]", ",", dontCareInputString))))))))
+        sanitizedDontCareInput: list[int] = split_sop_string(dontCareInputString)
 
-    logger.verbose(f"Sanitized minterm string:\n{sanitizedMintermInput}")
-    logger.verbose(f"Sanitized don't care string:\n{sanitizedDontCareInput}")
+    logger.verbose("Sanitized minterm string:\n%s", sanitizedMintermInput)
+    logger.verbose("Sanitized don't care string:\n%s", sanitizedDontCareInput)
 
     if not sanitizedMintermInput:
         raise SyntaxError(f"Invalid minterm specification. Values must be integers separated by commas with no spaces or quotes.\n{USAGE_TEXT}")
@@ -44,13 +43,13 @@ def parse_sop_input(
                 raise SyntaxError(f"Cannot specify the same term as a minterm and a don't care.\n{USAGE_TEXT}")
             
             finalDontCareSpecification.append([DCMinterm, "x"])
-            combinedFinalSpecification = list(heapq.merge(finalMintermSpecification, finalDontCareSpecification))
+        combinedFinalSpecification = list(heapq.merge(finalMintermSpecification, finalDontCareSpecification))
     else:
         combinedFinalSpecification = finalMintermSpecification
 
-    logger.verbose(f"Final minterm list:\n{pformat(finalMintermSpecification)}")
-    logger.verbose(f"Final don't care list:\n{pformat(finalDontCareSpecification)}")
-    logger.verbose(f"Final combined list:\n{pformat(combinedFinalSpecification)}")
+    logger.verbose("Final minterm list:\n%s", lazy_pformat(finalMintermSpecification))
+    logger.verbose("Final don't care list:\n%s", lazy_pformat(finalDontCareSpecification))
+    logger.verbose("Final combined list:\n%s", lazy_pformat(combinedFinalSpecification))
 
     bitCount: int = None
     if not inputCount:
@@ -61,22 +60,63 @@ def parse_sop_input(
         bitCount = inputCount
     
     finalMintermTable: list[list[any]] = []
-    for idx, mintermSpecification in enumerate(*combinedFinalSpecification):
+    for idx, mintermSpecification in enumerate(combinedFinalSpecification):
         bitValue = generate_binary_representation_as_list(mintermSpecification[0], bitCount)
-        finalMintermTable.append(idx + bitValue + [mintermSpecification[1]])
+        finalMintermTable.append([idx] + bitValue + [mintermSpecification[1]])
 
-    logger.verbose(f"Final reconstructed minterm table:\n{finalMintermTable}")
+    logger.verbose("Final reconstructed minterm table:\n%s", finalMintermTable)
     
     return finalMintermTable
 
 
+def parse_sop_minterms(
+        mintermInputString: str,
+        dontCareInputString: Optional[str] = None,
+        inputCount: Optional[int] = None
+        ) -> tuple[int, list[int], list[int]]:
+
+    """
+    Sparse counterpart of `parse_sop_input`. Minterms and don't cares stay sorted integer lists and no row is built
+    for them. Every index that is not listed is in the off-set without ever being materialized, so the cost depends
+    on the number of listed terms and not on 2^n.
+    Returns (input count, minterms, don't cares).
+    """
+
+    onset: list[int] = split_sop_string(mintermInputString)
+    dontCares: list[int] = split_sop_string(dontCareInputString) if dontCareInputString else []
+
+    if not onset:
+        raise SyntaxError(f"Invalid minterm specification. Values must be integers separated by commas with no spaces or quotes.\n{USAGE_TEXT}")
+    elif dontCareInputString and not dontCares:
+        raise SyntaxError(f"Invalid don't care specification. Values must be integers separated by commas with no spaces or quotes.\n{USAGE_TEXT}")
+    if not set(onset).isdisjoint(dontCares):
+        raise SyntaxError(f"Cannot specify the same term as a minterm and a don't care.\n{USAGE_TEXT}")
+
+    highestInputValue: int = max(onset[-1], dontCares[-1] if dontCares else 0)
+    bitCount: int = inputCount if inputCount else max(1, highestInputValue.bit_length())
+    if highestInputValue >= 1 << bitCount:
+        raise ValueError(f"Minterm index '{highestInputValue}' does not fit in the {bitCount} inputs specified.")
+
+    logger.verbose("Sparse specification: %d minterms, %d don't cares, %d inputs", len(onset), len(dontCares), bitCount)
+
+    return bitCount, onset, dontCares
+
+
+def split_sop_string(
+        inputString: str
+    ) -> list[int]:
+
+    # Remove duplicates and any value other than a digit, split by comma, cast values as integers and sort ascending
+    return sorted(cast_str_list_as_int(list(filter(None, set(re.split(",", re.sub("[^0-9-]", ",", inputString)))))))
+
+
 def generate_binary_representation_as_list(
         number: int,
         bitCount: int
     ) -> list[int]:
 
     maxValue: int = int("".join(["1" for b in range(bitCount)]), 2) + 1
-    if number > maxValue:
+    if number >= maxValue:
         raise ValueError(f"Minterm index '{number}' is larger than max number of inputs specified '{maxValue}'.")
 
     binaryString: str = bin(number)[2:].zfill(bitCount)
@@ -98,7 +138,7 @@ def cast_str_list_as_int(
         try:
             value = int(value)
         except:
-            logger.warning(f"Value '{value}' from list '{pformat(stringListInput)}' cannot be cast as int. This message should never appear.")
+            logger.warning("Value '%s' from list '%s' cannot be cast as int. This message should never appear.", value, lazy_pformat(stringListInput))
             continue
 
         if value < 0:
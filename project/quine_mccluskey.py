@@ -3,25 +3,43 @@
 MODULE DATA
 """
 
+import time
+
+# Taken before anything else is loaded, for --startup-report. The CPU time spent so far is the interpreter's startup
+MODULE_START_CLOCK: float = time.perf_counter()
+INTERPRETER_CPU_SECONDS: float = time.process_time()
+
 from global_constants import *
 
-import logger_setup
+from logger_setup import get_logger, configure_logging, LazyFormat, lazy_pformat
 import os
 import sys
-import getopt
-from pprint import pformat, pprint
-from logging import getLogger
-from typing import Optional
-from sanitize_qm_input import sanitize_file_input
-from generate_prime_implicants import recursive_generate_prime_implicants
-from parse_sum_of_products_input import parse_sop_input
+from typing import Optional, Sequence
+from generate_prime_implicants import format_bitmask_cover
+from cover_library import lookup_library_cover, LIBRARY_MINTERM_LENGTH
+from format_sum_of_products import format_sum_of_products, parse_label_input
+from stats_collector import stats_stage
+import solve_limits
+
+# Only what every run needs is imported above. Readers, engines, the cache and batch mode are imported where they
+# are first used, so a run only loads the modules its path goes through
+
+MODULE_IMPORTED_CLOCK: float = time.perf_counter()
+
+logger = get_logger("quine_mccluskey")
+
 
-logger = getLogger("quine_mccluskey")
+def main() -> None:
 
-logger.info(f"----------------------------------------------------------------------------------------------------------------------------------\n----------------------------------------------------------------------------------------------------------------------------------\n----------------------------------------------------------------------------------------------------------------------------------", color = RED)
+    configure_logging()
+
+    logger.info(f"----------------------------------------------------------------------------------------------------------------------------------\n----------------------------------------------------------------------------------------------------------------------------------\n----------------------------------------------------------------------------------------------------------------------------------", color = RED)
+
+    parse_options()
 
 
 def parse_options() -> None:
+    import getopt
     argumentlist: list[str] = sys.argv[1:]
     try:
         options, arguments = getopt.getopt(argumentlist, OPTIONS, LONG_OPTIONS)
@@ -31,13 +49,29 @@ def parse_options() -> None:
     
     parsed: dict[str, bool] = {
         "overwrite": False,
-        "help": False
+        "help": False,
+        "convert": False,
+        "clearCache": False,
+        "startupReport": False
     }
 
-    optionArguments: dict[str, Optional[str]] = {
+    optionArguments: dict[str, any] = {
         "minterms": None,
         "dontcares": None,
-        "labels": None
+        "labels": None,
+        "inputs": None,
+        "solver": "branch-and-bound",
+        "engine": "exact",
+        "jobs": 1,
+        "strategy": "hash",
+        "batch": None,
+        "outputs": 1,
+        "cache": True,
+        "stats": None,
+        "serve": None,
+        "connect": None,
+        "timeLimit": None,
+        "memoryLimit": None
     }
 
     for argument, value in options:
@@ -47,9 +81,71 @@ def parse_options() -> None:
         elif argument in ("-d", "--dontcares"):
             optionArguments["dontcares"] = value
             logger.debug(f"Don't cares specified")
-        elif argument in ("-l", "labels="):
+        elif argument in ("-l", "--labels"):
             optionArguments["labels"] = value
             logger.debug(f"Labels specified")
+        elif argument in ("-n", "--inputs"):
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Input count `{value}` must be a positive integer.")
+            optionArguments["inputs"] = int(value)
+            logger.debug(f"Input count specified")
+        elif argument in ("-s", "--solver"):
+            if value not in COVER_SOLVERS:
+                raise ValueError(f"Solver `{value}` not supported, must be one of: {COVER_SOLVERS}")
+            optionArguments["solver"] = value
+            logger.debug(f"Solver specified")
+        elif argument in ("-e", "--engine"):
+            if value not in MINIMIZATION_ENGINES:
+                raise ValueError(f"Engine `{value}` not supported, must be one of: {MINIMIZATION_ENGINES}")
+            optionArguments["engine"] = value
+            logger.debug(f"Engine specified")
+        elif argument in ("-j", "--jobs"):
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Job count `{value}` must be a positive integer.")
+            optionArguments["jobs"] = int(value)
+            logger.debug(f"Job count specified")
+        elif argument == "--strategy":
+            if value not in COMBINATION_STRATEGIES:
+                raise ValueError(f"Combination strategy `{value}` not supported, must be one of: {COMBINATION_STRATEGIES}")
+            optionArguments["strategy"] = value
+            logger.debug(f"Combination strategy specified")
+        elif argument == "--outputs":
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Output count `{value}` must be a positive integer.")
+            optionArguments["outputs"] = int(value)
+            logger.debug(f"Output count specified")
+        elif argument in ("-b", "--batch"):
+            optionArguments["batch"] = value
+            logger.debug(f"Batch source specified")
+        elif argument == "--no-cache":
+            optionArguments["cache"] = False
+            logger.debug(f"Result cache bypass specified")
+        elif argument == "--stats":
+            if value not in STATS_FORMATS:
+                raise ValueError(f"Stats format `{value}` not supported, must be one of: {STATS_FORMATS}")
+            optionArguments["stats"] = value
+            logger.debug(f"Stats format specified")
+        elif argument == "--serve":
+            optionArguments["serve"] = value
+            logger.debug(f"Daemon socket to serve on specified")
+        elif argument == "--connect":
+            optionArguments["connect"] = value
+            logger.debug(f"Daemon socket to connect to specified")
+        elif argument == "--time-limit":
+            optionArguments["timeLimit"] = solve_limits.parse_time_limit(value)
+            logger.debug(f"Time limit specified")
+        elif argument == "--memory-limit":
+            optionArguments["memoryLimit"] = solve_limits.parse_memory_size(value)
+            logger.debug(f"Memory limit specified")
+        elif argument == "--clear-cache":
+            parsed["clearCache"] = True
+            logger.debug(f"Result cache clear specified")
+        elif argument == "--startup-report":
+            parsed["startupReport"] = True
+            logger.debug(f"Startup report specified")
+        elif argument in ("-c", "--convert"):
+            parsed["convert"] = True
+            logger.debug(f"Conversion to packed truth table specified")
         elif argument in ("-y", "--yes"):
             parsed["overwrite"] = True
             logger.debug(f"OVerwrite output file specified")
@@ -57,12 +153,109 @@ def parse_options() -> None:
             parsed["help"] = True
             logger.debug(f"Help specified")
 
+    setupClock: float = time.perf_counter()
+
     if parsed["help"]:
         print(f"Sending help")
+        if parsed["startupReport"]:
+            print_startup_report(setupClock, setupClock)
         sys.exit(0)
 
+    exitStatus: int
+    if optionArguments["stats"] is None:
+        exitStatus = run_options(arguments, optionArguments, parsed)
+    else:
+        # Stats go to stderr so that stdout still only carries the result. Memory is traced, which slows the run down
+        from stats_collector import StatsCollector, collecting_stats
+        with collecting_stats(StatsCollector(traceMemory = True)) as statsCollector:
+            exitStatus = run_options(arguments, optionArguments, parsed)
+        print(statsCollector.format_json() if optionArguments["stats"] == "json" else statsCollector.format_table(), file = sys.stderr)
+
+    if parsed["startupReport"]:
+        print_startup_report(setupClock, time.perf_counter())
+
+    if exitStatus:
+        sys.exit(exitStatus)
+
+
+def print_startup_report(
+        setupClock: float,
+        finishClock: float
+    ) -> None:
+
+    """
+    Where the time of this invocation went, on stderr: interpreter startup (CPU time before this module ran), module
+    imports, setup (logging and option parsing) and the run itself, which includes the modules its path imported.
+    Imports and setup together are held against STARTUP_BUDGET_SECONDS. `python -X importtime` breaks the imports down.
+    """
+
+    startupSeconds: float = setupClock - MODULE_START_CLOCK
+    lines: list[str] = [
+        f"{'interpreter':<12}{INTERPRETER_CPU_SECONDS * 1000:>10.2f} ms (cpu)",
+        f"{'imports':<12}{(MODULE_IMPORTED_CLOCK - MODULE_START_CLOCK) * 1000:>10.2f} ms",
+        f"{'setup':<12}{(setupClock - MODULE_IMPORTED_CLOCK) * 1000:>10.2f} ms",
+        f"{'run':<12}{(finishClock - setupClock) * 1000:>10.2f} ms",
+        f"{'total':<12}{(finishClock - MODULE_START_CLOCK) * 1000:>10.2f} ms",
+        f"Imports and setup took {startupSeconds * 1000:.2f} ms of a {STARTUP_BUDGET_SECONDS * 1000:.0f} ms budget"
+        + ("" if startupSeconds <= STARTUP_BUDGET_SECONDS else ", over budget")
+    ]
+    print("\n".join(lines), file = sys.stderr)
+
+
+def run_options(
+        arguments: list[str],
+        optionArguments: dict[str, any],
+        parsed: dict[str, bool]
+    ) -> int:
+
+    """
+    Run what the options ask for and return the exit status: 0, 1 when batch jobs failed, or
+    LIMIT_REACHED_EXIT_STATUS when a time or memory limit cut the minimization short. Batch and daemon jobs apply
+    the limits each on its own and report them in their result lines instead.
+    """
+
     argumentCount: int = len(arguments)
-    sanitizedInputData: Optional[list[list[any]]] = None
+
+    if parsed["clearCache"]:
+        from result_cache import clear_result_cache
+        print(f"Removed {clear_result_cache()} cached results")
+        if argumentCount == 0 and not optionArguments["minterms"] and not optionArguments["batch"]:
+            return 0
+
+    if optionArguments["serve"]:
+        if argumentCount or optionArguments["minterms"] or optionArguments["batch"] or optionArguments["connect"]:
+            raise SyntaxError(f"The daemon takes its jobs from its socket only.\n{USAGE_TEXT}")
+        from minimization_daemon import run_minimization_daemon
+        run_minimization_daemon(optionArguments["serve"], optionArguments["jobs"], optionArguments)
+        return 0
+
+    if optionArguments["connect"]:
+        if optionArguments["batch"] or optionArguments["outputs"] > 1:
+            raise SyntaxError(f"A daemon client runs a single output job.\n{USAGE_TEXT}")
+        # Stats, worker count and conversion happen inside the daemon or not at all, they are not silently dropped
+        if optionArguments["stats"] is not None or optionArguments["jobs"] > 1 or parsed["convert"]:
+            raise SyntaxError(f"A daemon client cannot take --stats, --jobs or --convert.\n{USAGE_TEXT}")
+        return minimize_with_daemon(arguments, optionArguments, parsed["overwrite"])
+
+    if optionArguments["batch"]:
+        if argumentCount or optionArguments["minterms"]:
+            raise SyntaxError(f"Batch mode takes its jobs from the batch source only.\n{USAGE_TEXT}")
+        if optionArguments["stats"]:
+            logger.warning("Stats are not collected in batch mode, the jobs run in other processes.")
+        from batch_minimize import collect_batch_jobs, run_batch
+        jobs: list[dict[str, any]] = collect_batch_jobs(optionArguments["batch"], optionArguments)
+        failed: int = run_batch(jobs, optionArguments["jobs"], sys.stdout)
+        return 1 if failed else 0
+
+    if optionArguments["outputs"] > 1:
+        if optionArguments["minterms"] or argumentCount == 0:
+            raise SyntaxError(f"Multiple outputs can only be read from an input file.\n{USAGE_TEXT}")
+        return minimize_multi_output_file(arguments, optionArguments, parsed["overwrite"])
+
+    mintermLength: int
+    onset: Sequence[int]
+    dontCares: Sequence[int]
+    fileLabels: Optional[list[str]] = None
 
     if argumentCount > 2:
         raise SyntaxError(f"Too many arguments passed.\n{USAGE_TEXT}")
@@ -70,30 +263,180 @@ def parse_options() -> None:
     if optionArguments["minterms"]:
         if argumentCount == 2:
             raise SyntaxError(f"You cannot specify both an input file and minterms.\n{USAGE_TEXT}")
-        sanitizedInputData = parse_sop_input(optionArguments["minterms"], optionArguments["dontcares"])
+        from parse_sum_of_products_input import parse_sop_minterms
+        with stats_stage("parse"):
+            mintermLength, onset, dontCares = parse_sop_minterms(optionArguments["minterms"], optionArguments["dontcares"], optionArguments["inputs"])
     else:
         if argumentCount == 0:
             raise SyntaxError(f"No input file specified.\n{USAGE_TEXT}")
 
         inputFilePath: str = arguments[0]
         _, fileExtension = os.path.splitext(inputFilePath)
-        if fileExtension.lower() not in ALLOWED_EXTENSIONS:
-            raise ValueError(f"Filetype {fileExtension} not supported, must be one of: {ALLOWED_EXTENSIONS}")
-        sanitizedInputData = sanitize_file_input(inputFilePath)
+        if parsed["convert"]:
+            if fileExtension.lower() not in ALLOWED_EXTENSIONS:
+                raise ValueError(f"Filetype {fileExtension} cannot be converted, must be one of: {ALLOWED_EXTENSIONS}")
+            if argumentCount != 2:
+                raise SyntaxError(f"Converting needs an input file and an output file.\n{USAGE_TEXT}")
+            convertedFilePath: str = set_output_file_path(arguments[1], BINARY_EXTENSION, parsed["overwrite"], [BINARY_EXTENSION])
+            from binary_truth_table import convert_truth_table_to_binary
+            convert_truth_table_to_binary(inputFilePath, convertedFilePath)
+            print(convertedFilePath)
+            return 0
+
+        with stats_stage("parse"):
+            mintermLength, onset, dontCares, fileLabels = load_input_file(inputFilePath)
 
     outputLocation: Optional[str] = None
     if argumentCount == 2:
         outputLocation = set_output_file_path(arguments[1], fileExtension, parsed["overwrite"])
-    if sanitizedInputData:
-        outputData: list[list[any]] = quine_mccluskey(sanitizedInputData)
+
+    # The limits count from here, reading the input is not part of them
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.solve_limits_for(optionArguments["timeLimit"], optionArguments["memoryLimit"])
+
+    with solve_limits.solving_within(limits):
+        outputData: list[tuple[int, int]] = minimize_minterms(
+            onset,
+            dontCares,
+            mintermLength,
+            optionArguments["solver"],
+            optionArguments["engine"],
+            optionArguments["jobs"],
+            optionArguments["strategy"],
+            optionArguments["cache"]
+            )
+
+    labels: Optional[list[str]] = parse_label_input(optionArguments["labels"]) if optionArguments["labels"] else fileLabels
+    sumOfProducts: str = format_sum_of_products(outputData, mintermLength, labels)
+    print(sumOfProducts)
+
+    if outputLocation:
+        with open(outputLocation, "w") as f:
+            f.write(sumOfProducts + "\n")
+
+    return limit_exit_status(limits.limitReached if limits is not None else None)
+
+
+def limit_exit_status(
+        limitReached: Optional[str]
+    ) -> int:
+
+    # The cover is still printed, the exit status is what tells scripts that it may not be minimum
+    if limitReached is None:
+        return 0
+    logger.warning("The %s limit was reached, the cover is the best one found within it and may not be minimum.", limitReached)
+    return LIMIT_REACHED_EXIT_STATUS
+
+
+def minimize_with_daemon(
+        arguments: list[str],
+        optionArguments: dict[str, any],
+        overwriteFile: bool
+    ) -> int:
+
+    # Same arguments as a local run, the job is sent to the daemon as fields and only its answer is printed
+    from minimization_client import request_minimization
+
+    request: dict[str, any] = {
+        "id": os.getpid(),
+        "labels": optionArguments["labels"],
+        "solver": optionArguments["solver"],
+        "engine": optionArguments["engine"],
+        "strategy": optionArguments["strategy"],
+        "cache": optionArguments["cache"],
+        "time_limit": optionArguments["timeLimit"],
+        "memory_limit": optionArguments["memoryLimit"]
+    }
+
+    if len(arguments) > 2:
+        raise SyntaxError(f"Too many arguments passed.\n{USAGE_TEXT}")
+    if optionArguments["minterms"]:
+        if len(arguments) == 2:
+            raise SyntaxError(f"You cannot specify both an input file and minterms.\n{USAGE_TEXT}")
+        request.update({"minterms": optionArguments["minterms"], "dontcares": optionArguments["dontcares"], "inputs": optionArguments["inputs"]})
+    elif arguments:
+        request["path"] = os.path.abspath(os.path.expanduser(arguments[0]))
     else:
-        raise RuntimeError(f"This should never happen. Internal script error.")
+        raise SyntaxError(f"No input file specified.\n{USAGE_TEXT}")
+
+    outputLocation: Optional[str] = None
+    if len(arguments) == 2:
+        outputLocation = set_output_file_path(arguments[1], os.path.splitext(arguments[0])[1], overwriteFile)
+
+    result: dict[str, any] = request_minimization(os.path.expanduser(optionArguments["connect"]), request)
+    if result.get("status") != "ok":
+        raise RuntimeError(f"Daemon job failed: {result.get('error')}")
+
+    print(result["sop"])
+
+    if outputLocation:
+        with open(outputLocation, "w") as f:
+            f.write(result["sop"] + "\n")
+
+    return limit_exit_status(result.get("limit_reached"))
+
+
+def minimize_multi_output_file(
+        arguments: list[str],
+        optionArguments: dict[str, any],
+        overwriteFile: bool
+    ) -> int:
+
+    inputFilePath: str = arguments[0]
+    _, fileExtension = os.path.splitext(inputFilePath)
+    if fileExtension.lower() not in ALLOWED_EXTENSIONS:
+        raise ValueError(f"Filetype {fileExtension} not supported for multiple outputs, must be one of: {ALLOWED_EXTENSIONS}")
+
+    outputLocation: Optional[str] = None
+    if len(arguments) == 2:
+        outputLocation = set_output_file_path(arguments[1], fileExtension, overwriteFile)
+
+    from sanitize_qm_input import stream_multi_output_truth_table
+    from multi_output import minimize_multi_output
+    with stats_stage("parse"):
+        mintermLength, onsets, dontCareSets, fileLabels, outputLabels = stream_multi_output_truth_table(inputFilePath, optionArguments["outputs"])
+
+    limits: Optional[solve_limits.SolveLimits] = solve_limits.solve_limits_for(optionArguments["timeLimit"], optionArguments["memoryLimit"])
+    with stats_stage("multi-output"), solve_limits.solving_within(limits):
+        covers: list[list[tuple[int, int]]] = minimize_multi_output(
+            onsets,
+            dontCareSets,
+            mintermLength,
+            optionArguments["solver"],
+            optionArguments["engine"]
+            )
+
+    labels: Optional[list[str]] = parse_label_input(optionArguments["labels"]) if optionArguments["labels"] else fileLabels
+    if outputLabels is None:
+        outputLabels = [f"F{output}" for output in range(len(covers))]
+    outputLines: list[str] = [f"{outputLabel} = {format_sum_of_products(cover, mintermLength, labels)}" for outputLabel, cover in zip(outputLabels, covers)]
+    print("\n".join(outputLines))
+
+    if outputLocation:
+        with open(outputLocation, "w") as f:
+            f.write("\n".join(outputLines) + "\n")
+
+    return limit_exit_status(limits.limitReached if limits is not None else None)
+
+
+def load_input_file(
+        inputFilePath: str
+    ) -> tuple[int, Sequence[int], Sequence[int], Optional[list[str]]]:
+
+    _, fileExtension = os.path.splitext(inputFilePath)
+    if fileExtension.lower() == BINARY_EXTENSION:
+        from binary_truth_table import read_binary_truth_table
+        return read_binary_truth_table(inputFilePath)
+    if fileExtension.lower() in ALLOWED_EXTENSIONS:
+        from sanitize_qm_input import stream_truth_table
+        return stream_truth_table(inputFilePath)
+    raise ValueError(f"Filetype {fileExtension} not supported, must be one of: {ALLOWED_EXTENSIONS + [BINARY_EXTENSION]}")
 
 
 def set_output_file_path(
         outputFilePath: str,
         outputFileExtension: str,
-        overwriteFile: bool
+        overwriteFile: bool,
+        allowedExtensions: list[str] = ALLOWED_EXTENSIONS
     ) -> str:
 
     file: Optional[str] = None
@@ -103,8 +446,8 @@ def set_output_file_path(
     file = os.path.basename(resolvedPath)
     fileName, fileExtension = os.path.splitext(file)
 
-    if fileExtension.lower() not in ALLOWED_EXTENSIONS:
-        raise ValueError(f"Filetype {fileExtension} not supported, must must be one of: {ALLOWED_EXTENSIONS}")
+    if fileExtension.lower() not in allowedExtensions:
+        raise ValueError(f"Filetype {fileExtension} not supported, must must be one of: {allowedExtensions}")
     
     if os.path.exists(outputFilePath) and not overwriteFile:
         userInput: str = input(f"\033[33mWARNING: A file with the name \033[0m`{file}`\033[33m already exists at that location. Overwrite? (\033[31my\033[33m/\033[32mn\033[33m): \033[0m") + " "
@@ -129,18 +472,98 @@ def set_output_file_path(
 
 
 def quine_mccluskey(
-        completeImplicantTable: list[list[any]]
-    ) -> list[list[any]]:
+        completeImplicantTable: list[list[any]],
+        solver: str = "branch-and-bound",
+        engine: str = "exact",
+        workers: int = 1,
+        strategy: str = "hash",
+        useCache: bool = False
+    ) -> list[tuple[int, int]]:
+
+    logger.info("Sanitized input data:\n%s", lazy_pformat(completeImplicantTable))
+
+    # Tables placed by index can start with an empty slot
+    mintermLength: int = len(next(row for row in completeImplicantTable if row is not None)) - 2
+
+    from generate_prime_implicants import split_minterm_table
+    onset: list[int]
+    dontCares: list[int]
+    onset, dontCares = split_minterm_table(completeImplicantTable, mintermLength)
+
+    return minimize_minterms(onset, dontCares, mintermLength, solver, engine, workers, strategy, useCache)
+
+
+def minimize_minterms(
+        onset: Sequence[int],
+        dontCares: Sequence[int],
+        mintermLength: int,
+        solver: str = "branch-and-bound",
+        engine: str = "exact",
+        workers: int = 1,
+        strategy: str = "hash",
+        useCache: bool = False
+    ) -> list[tuple[int, int]]:
+
+    logger.info("Minimizing %d minterms and %d don't cares over %d inputs", len(onset), len(dontCares), mintermLength)
+
+    if mintermLength <= LIBRARY_MINTERM_LENGTH:
+        with stats_stage("library"):
+            libraryCover: Optional[list[tuple[int, int]]] = lookup_library_cover(onset, dontCares, mintermLength)
+        if libraryCover is not None:
+            logger.info("Minimum cover from the cover library:\n%s", LazyFormat(format_bitmask_cover, libraryCover, mintermLength))
+            return libraryCover
+
+    # Covers of the NP path are memoized, so under solve limits that might cut them short it is left out
+    if engine == "exact" and mintermLength <= NP_MAX_MINTERM_LENGTH and solve_limits.activeLimits is None:
+        from np_canonical import np_minimize
+        with stats_stage("np-class"):
+            canonicalCover: Optional[list[tuple[int, int]]] = np_minimize(onset, dontCares, mintermLength, solver)
+        if canonicalCover is not None:
+            logger.info("Minimum cover through the NP class representative:\n%s", LazyFormat(format_bitmask_cover, canonicalCover, mintermLength))
+            return canonicalCover
+
+    # Workers and combination strategy do not change the cover, only engine and solver are part of the key
+    cacheKey: Optional[str] = None
+    if useCache:
+        from result_cache import result_cache_key, load_cached_cover, store_cached_cover
+        cacheKey = result_cache_key(mintermLength, onset, dontCares, (engine,) if engine == "heuristic" else (engine, solver))
+        if cacheKey is not None:
+            with stats_stage("cache"):
+                cachedCover: Optional[list[tuple[int, int]]] = load_cached_cover(cacheKey)
+            if cachedCover is not None:
+                logger.info("Cover of %d cubes loaded from the result cache", len(cachedCover))
+                return cachedCover
+
+    if engine == "heuristic":
+        from espresso_heuristic import espresso_minimize
+        with stats_stage("heuristic"):
+            heuristicCover: list[tuple[int, int]] = espresso_minimize(onset, dontCares, mintermLength)
+        logger.info("Heuristic cover:\n%s", LazyFormat(format_bitmask_cover, heuristicCover, mintermLength))
+        if cacheKey is not None:
+            store_cached_cover(cacheKey, mintermLength, heuristicCover)
+        return heuristicCover
+
+    from generate_prime_implicants import generate_prime_implicants_bitmask
+    from select_minimum_cover import select_minimum_cover, cover_with_largest_implicants
+    with stats_stage("primes"):
+        primeImplicants: list[tuple[int, int, int]] = generate_prime_implicants_bitmask(onset, dontCares, mintermLength, strategy, workers)
 
-    logger.info(f"Sanitized input data:\n{pformat(completeImplicantTable)}")
+    logger.info("Prime implicants:\n%s", LazyFormat(format_bitmask_cover, primeImplicants, mintermLength))
 
-    mintermLength = len(completeImplicantTable[0]) - 2
+    with stats_stage("cover"):
+        if solve_limits.activeLimits is not None and solve_limits.activeLimits.limitReached is not None:
+            # Prime generation was cut short and left implicants that are not all prime, too many to build a chart of
+            minimumCover: list[tuple[int, int]] = cover_with_largest_implicants(primeImplicants, len(onset))
+        else:
+            minimumCover = select_minimum_cover(primeImplicants, len(onset), mintermLength, solver)
 
-    primeImplicants: list[list[any]] = recursive_generate_prime_implicants(completeImplicantTable, mintermLength)
+    logger.info("Minimum cover:\n%s", LazyFormat(format_bitmask_cover, minimumCover, mintermLength))
 
-    logger.info(f"Prime implicants:\n{primeImplicants}")
+    # A cover cut short by the solve limits is not the one the cache key promises
+    if cacheKey is not None and (solve_limits.activeLimits is None or solve_limits.activeLimits.limitReached is None):
+        store_cached_cover(cacheKey, mintermLength, minimumCover)
 
-    return completeImplicantTable
+    return minimumCover
 
 
 if __name__ == "__main__":
@@ -150,4 +573,4 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\033[91mError: {e}\033[0m")
     """
-    parse_options()
\ No newline at end of file
+    main()
\ No newline at end of file
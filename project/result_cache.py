@@ -0,0 +1,276 @@
+import os
+import sys
+import time
+import struct
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from logger_setup import get_logger
+from array import array
+from logging import *
+from global_constants import *
+from typing import Iterator, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# Entry layout, little endian: magic (4 bytes) | version (u8) | input count (u8) | cube count (u32), then the cube
+# values and the cube masks as two runs of u64
+ENTRY_MAGIC: bytes = b"QMRC"
+ENTRY_VERSION: int = 1
+ENTRY_HEADER: struct.Struct = struct.Struct("<4sBBI")
+ENTRY_SUFFIX: str = ".qmc"
+TEMPORARY_SUFFIX: str = ".tmp"
+
+# Running total of the entry sizes, so that a store does not have to walk the whole cache
+SIZE_FILE_NAME: str = "size"
+LOCK_FILE_NAME: str = "lock"
+
+
+def result_cache_directory() -> str:
+
+    return os.path.expanduser(os.environ.get(RESULT_CACHE_ENVIRONMENT_VARIABLE, RESULT_CACHE_DEFAULT_DIRECTORY))
+
+
+def result_cache_key(
+        mintermLength: int,
+        onset: Sequence[int],
+        dontCares: Sequence[int],
+        options: Sequence[str]
+    ) -> Optional[str]:
+
+    """
+    Hex sha256 of the function and the options that shape its cover. The minterm lists are sorted and packed as
+    u64 so that the same function always gives the same key, whichever way it was read.
+    Returns None for functions that do not fit the entry format.
+    """
+
+    if mintermLength > 64:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(ENTRY_MAGIC + struct.pack("<BBQQ", ENTRY_VERSION, mintermLength, len(onset), len(dontCares)))
+    for minterms in (onset, dontCares):
+        packed: array = array("Q", minterms if is_sorted(minterms) else sorted(minterms))
+        if sys.byteorder == "big":
+            packed.byteswap()
+        digest.update(packed.tobytes())
+    digest.update("\0".join(options).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def load_cached_cover(
+        key: str
+    ) -> Optional[list[tuple[int, int]]]:
+
+    path: str = entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            data: bytes = f.read()
+    except OSError:
+        return None
+
+    try:
+        magic, version, mintermLength, cubeCount = ENTRY_HEADER.unpack_from(data, 0)
+        if magic != ENTRY_MAGIC or version != ENTRY_VERSION or len(data) != ENTRY_HEADER.size + 16 * cubeCount:
+            raise ValueError("malformed entry")
+    except (struct.error, ValueError) as e:
+        logger.warning("Dropping unreadable cache entry `%s`: %s", path, e)
+        remove_quietly(path)
+        return None
+
+    words: array = array("Q")
+    words.frombytes(data[ENTRY_HEADER.size:])
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    # Touching the entry keeps it recently used for eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    logger.debug("Cache hit for %s", key[:12])
+
+    return list(zip(words[:cubeCount], words[cubeCount:]))
+
+
+def store_cached_cover(
+        key: str,
+        mintermLength: int,
+        cover: list[tuple[int, int]]
+    ) -> None:
+
+    """
+    Write an entry next to its final place and move it there with `os.replace`, so readers in other processes see
+    either no entry or a complete one. Eviction runs under an exclusive lock once the cache grows past its cap.
+    """
+
+    words: array = array("Q", [value for value, _ in cover] + [mask for _, mask in cover])
+    if sys.byteorder == "big":
+        words.byteswap()
+    data: bytes = ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, mintermLength, len(cover)) + words.tobytes()
+
+    path: str = entry_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        # An entry stored again replaces the old one, whose size has to come off the running total
+        try:
+            replacedSize: int = os.stat(path).st_size
+        except FileNotFoundError:
+            replacedSize = 0
+        fileDescriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(path), suffix = TEMPORARY_SUFFIX)
+        try:
+            with os.fdopen(fileDescriptor, "wb") as f:
+                f.write(data)
+            os.replace(temporaryPath, path)
+        except BaseException:
+            remove_quietly(temporaryPath)
+            raise
+
+        with cache_lock():
+            cacheSize: int = max(0, read_cache_size() + len(data) - replacedSize)
+            if cacheSize > RESULT_CACHE_MAX_BYTES:
+                cacheSize = evict_cache_entries()
+            write_cache_size(cacheSize)
+    except OSError as e:
+        # A cache that cannot be written is only a slower run
+        logger.warning("Could not store cache entry `%s`: %s", path, e)
+
+
+def evict_cache_entries() -> int:
+
+    # Least recently used entries go first, down to the low water mark so that eviction does not run on every store.
+    # Returns the size left. Must be called with the cache lock held
+    entries: list[tuple[float, int, str]] = []
+    for path in iterate_entry_paths():
+        try:
+            status = os.stat(path)
+        except OSError:
+            continue
+        entries.append((status.st_mtime, status.st_size, path))
+
+    cacheSize: int = sum(size for _, size, _ in entries)
+    target: int = int(RESULT_CACHE_MAX_BYTES * RESULT_CACHE_LOW_WATER_MARK)
+    entries.sort()
+    evicted: int = 0
+    for _, size, path in entries:
+        if cacheSize <= target:
+            break
+        remove_quietly(path)
+        cacheSize -= size
+        evicted += 1
+
+    logger.info("Evicted %d cache entries, %d bytes left", evicted, cacheSize)
+
+    return cacheSize
+
+
+def clear_result_cache() -> int:
+
+    """
+    Remove every cache entry. Returns the number of entries removed.
+    """
+
+    removed: int = 0
+    if not os.path.isdir(result_cache_directory()):
+        return removed
+
+    with cache_lock():
+        for path in iterate_entry_paths():
+            remove_quietly(path)
+            removed += 1
+        write_cache_size(0)
+
+    logger.info("Cleared %d cache entries from `%s`", removed, result_cache_directory())
+
+    return removed
+
+
+def iterate_entry_paths() -> Iterator[str]:
+
+    # Writers create and rename their temporary file before taking the lock, so only temporary files old enough to
+    # have been left behind by a crashed writer are listed, never one that is still being written
+    cacheDirectory: str = result_cache_directory()
+    staleBefore: float = time.time() - RESULT_CACHE_STALE_TEMPORARY_SECONDS
+    for shard in os.scandir(cacheDirectory):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                yield entry.path
+            elif entry.name.endswith(TEMPORARY_SUFFIX):
+                try:
+                    if entry.stat().st_mtime < staleBefore:
+                        yield entry.path
+                except OSError:
+                    continue
+
+
+@contextmanager
+def cache_lock() -> Iterator[None]:
+
+    """
+    Exclusive `flock` on the cache's lock file. Where `fcntl` does not exist the cache runs unlocked, entries are
+    still written atomically but the size total may drift until the next eviction recounts it.
+    """
+
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(result_cache_directory(), exist_ok = True)
+    with open(os.path.join(result_cache_directory(), LOCK_FILE_NAME), "a") as lockFile:
+        fcntl.flock(lockFile, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+
+def read_cache_size() -> int:
+
+    try:
+        with open(os.path.join(result_cache_directory(), SIZE_FILE_NAME), "r") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def write_cache_size(
+        cacheSize: int
+    ) -> None:
+
+    os.makedirs(result_cache_directory(), exist_ok = True)
+    with open(os.path.join(result_cache_directory(), SIZE_FILE_NAME), "w") as f:
+        f.write(str(cacheSize))
+
+
+def entry_path(
+        key: str
+    ) -> str:
+
+    # Two hex digits of fan-out keep directories small
+    return os.path.join(result_cache_directory(), key[:2], key[2:] + ENTRY_SUFFIX)
+
+
+def remove_quietly(
+        path: str
+    ) -> None:
+
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def is_sorted(
+        values: Sequence[int]
+    ) -> bool:
+
+    return all(values[idx] < values[idx + 1] for idx in range(len(values) - 1))
@@ -1,10 +1,15 @@
 import os
 import re
-from pprint import pformat
+import sys
+from array import array
+from typing import Optional
 from logging import *
-from generate_missing_rows import generate_missing_rows
+from logger_setup import get_logger, lazy_pformat
+from stats_collector import stats_stage
 
-logger = getLogger(__name__)
+logger = get_logger(__name__)
+
+BINARY_CELLS: frozenset[str] = frozenset({"0", "1"})
 
 
 def sanitize_file_input(inputFilePath):
@@ -25,7 +30,7 @@ def sanitize_file_input(inputFilePath):
                     integerCastedData.append(item)
             sanitizedInput.append(integerCastedData)
         
-    logger.info(f"Starting data:\n{pformat(sanitizedInput)}")
+    logger.info("Starting data:\n%s", lazy_pformat(sanitizedInput))
 
     numRows: int = len(sanitizedInput)
 
@@ -36,23 +41,19 @@ def sanitize_file_input(inputFilePath):
 
     # Remove header label row if it exists
     if sanitizedInput[0][0] not in {0, 1, "x"}:
-        logger.info(f"Remove header row. Data at [1, 1] `{sanitizedInput[0][0]}` is not 0, 1, or x")
+        logger.info("Remove header row. Data at [1, 1] `%s` is not 0, 1, or x", sanitizedInput[0][0])
         sanitizedInput.pop(0)
         numRows -= 1
 
     # Remove row labels if they exist (assuming that if the first column is not 01x, all rows are labeled)
     if sanitizedInput[0][0] not in {0, 1, "x"}:
-        logger.info(f"Remove first column. Data at [1, 1] `{sanitizedInput[0][0]}` is not 0, 1, or x")
+        logger.info("Remove first column. Data at [1, 1] `%s` is not 0, 1, or x", sanitizedInput[0][0])
         for row in sanitizedInput:
             row.pop(0)
 
     # Check row length and set maxRows after possibly removing header/label rows
     rowLength = len(sanitizedInput[0])
-    maxBinaryValue = ""
-    for _ in range(rowLength - 1):
-        maxBinaryValue += "1"
-    maxBinaryValue = int(maxBinaryValue, 2)
-    maxRows = maxBinaryValue + 1
+    maxRows: int = 1 << (rowLength - 1)
     
     if numRows > maxRows:
         raise ValueError(f"Input table contains {numRows} rows. Maximum number of rows for this table is {maxRows}. Remove duplicate or conflicting rows.")
@@ -67,23 +68,39 @@ def sanitize_file_input(inputFilePath):
             elif cell == "x" and y != rowLength - 1:
                 raise ValueError(f"Table data in row {i + 1}, cell {y + 1} is invalid. `x` may only exist in last column.")
         
-    logger.debug(f"Original input:\n{pformat(sanitizedInput)}")
+    logger.debug("Original input:\n%s", lazy_pformat(sanitizedInput))
 
-    sortedInput: list[list[any]] = recursive_binary_partition_sort(sanitizedInput)
+    with stats_stage("sort"):
+        placedInput: list[Optional[list[any]]] = place_rows_by_index(sanitizedInput, maxRows)
 
-    logger.debug(f"Sorted input data:\n{pformat(sortedInput)}")
-    
-    # Generate missing rows (as "don't care" minterms)
-    if numRows < maxRows:
-        logger.debug(f"Actual rows: {numRows}\nMax rows:    {maxRows}")
-        sortedInput = generate_missing_rows(sortedInput, maxRows)
+    logger.debug("Final list:\n%s", lazy_pformat(placedInput))
+    return placedInput
+
+
+def place_rows_by_index(
+        rows: list[list[any]],
+        maxRows: int
+    ) -> list[Optional[list[any]]]:
 
-    # Add index value at start of each term in the table. This will be used later in the recursive minterm combination/reduction
-    for idx, term in enumerate(sortedInput):
-        term.insert(0, idx)
+    """
+    Put every row at the slot given by its input bits, with that index added at the start of the row.
+    This is the sorted order without sorting. Slots of missing rows stay None and are implied don't cares.
+    """
 
-    logger.debug(f"Final list:\n{pformat(sortedInput)}")
-    return sortedInput
+    placedRows: list[Optional[list[any]]] = [None] * maxRows
+    for i, row in enumerate(rows):
+        index: int = 0
+        for bit in row[:-1]:
+            index = (index << 1) | bit
+        if placedRows[index] is not None:
+            raise ValueError(f"Input table row {i + 1} repeats input combination {index}. Remove duplicate or conflicting rows.")
+        row.insert(0, index)
+        placedRows[index] = row
+
+    if len(rows) < maxRows:
+        logger.debug("Actual rows: %d\nMax rows:    %d", len(rows), maxRows)
+
+    return placedRows
 
 
 def resolve_input_file_path(inputFilePath):
@@ -94,45 +111,161 @@ def resolve_input_file_path(inputFilePath):
     return resolvedPath
 
 
-def recursive_binary_partition_sort(
-        rows: int, 
-        col: int = 0
-    ) -> list[list[any]]:
+def stream_truth_table(
+        inputFilePath: str
+    ) -> tuple[int, array, array, Optional[list[str]]]:
 
-    logger.verbose(f"Rows to sort by column {col}:\n{pformat(rows)}")
+    """
+    Bounded-memory alternative to `sanitize_file_input`. Rows are validated one at a time and only recorded as bits
+    in on-set, don't care and seen bitmaps of 2^n bits; the table itself is never held in memory.
+    Rows missing from the file are don't cares, as in `sanitize_file_input`.
+    Returns (input count, sorted on-set indices, sorted don't care indices, header labels or None).
+    """
 
-    if rows == []:
-        logger.verbose(f"Missing row.")
-        return []
+    mintermLength, onsets, dontCareSets, labels, _ = stream_multi_output_truth_table(inputFilePath, 1)
 
-    termMax: int = len(rows[0]) - 1
-    sortedList: list[list[any]] = sorted(rows, key=lambda x: x[col])
+    return mintermLength, onsets[0], dontCareSets[0], labels
 
-    logger.verbose(f"Sorted rows:\n{pformat(sortedList)}")
 
-    if col >= termMax or len(rows) <= 1:
-        return sortedList
-    
-    zeroSubSplitList: list[list[any]]
-    oneSubSplitList: list[list[any]]
-    
-    zeroSubSplitList, oneSubSplitList = binary_split_nested_list(sortedList, col)
-
-    zeroSubSortedList: list[list[any]] = recursive_binary_partition_sort(zeroSubSplitList, col + 1)
-    oneSubSortedList: list[list[any]] = recursive_binary_partition_sort(oneSubSplitList, col + 1)
-
-    return zeroSubSortedList + oneSubSortedList
-
-
-def binary_split_nested_list(
-        nestedList: list[list[int]],
-        index: int
-    ) -> list[list[int]]:
-    zeroSubList: list[int] = []
-    oneSubList: list[int] = []
-    for i in nestedList:
-        if i[index] == 0:
-            zeroSubList.append(i)
-        else:
-            oneSubList.append(i)
-    return zeroSubList, oneSubList
+def stream_multi_output_truth_table(
+        inputFilePath: str,
+        outputCount: int
+    ) -> tuple[int, list[array], list[array], Optional[list[str]], Optional[list[str]]]:
+
+    """
+    `stream_truth_table` for tables whose last `outputCount` columns are outputs, all read in the same pass.
+    Returns (input count, on-set indices per output, don't care indices per output, input labels or None,
+    output labels or None).
+    """
+
+    file = resolve_input_file_path(inputFilePath)
+
+    mintermLength: Optional[int] = None
+    labels: Optional[list[str]] = None
+    hasRowLabels: bool = False
+    onsetBits: list[bytearray] = []
+    dontCareBits: list[bytearray] = []
+    seenBits: Optional[bytearray] = None
+    numRows: int = 0
+    outputColumns: str = "last column" if outputCount == 1 else f"last {outputCount} columns"
+
+    with open(file, "r") as f:
+        for lineNumber, line in enumerate(f, start = 1):
+            # Same separators as `sanitize_file_input`, but runs of them count as one
+            cells: list[str] = line.replace(",", " ").replace("\t", " ").split()
+            if not cells:
+                continue
+
+            if mintermLength is None:
+                # Header label row, recognized like in `sanitize_file_input`
+                if labels is None and cells[0] not in {"0", "1", "x"}:
+                    labels = cells
+                    continue
+                # Row labels: if the first column of the first data row is not 01x, all rows are labeled
+                hasRowLabels = cells[0] not in {"0", "1", "x"}
+                if hasRowLabels:
+                    cells = cells[1:]
+                mintermLength = len(cells) - outputCount
+                if mintermLength < 1:
+                    raise ValueError(f"Input table is malformed. Row {lineNumber} has no input columns.")
+                bitmapLength: int = bitmap_length(mintermLength)
+                onsetBits = [bytearray(bitmapLength) for _ in range(outputCount)]
+                dontCareBits = [bytearray(bitmapLength) for _ in range(outputCount)]
+                seenBits = bytearray(bitmapLength)
+                logger.info("Streaming a %d input, %d output truth table from `%s`", mintermLength, outputCount, file)
+            elif hasRowLabels:
+                cells = cells[1:]
+
+            if len(cells) != mintermLength + outputCount:
+                raise ValueError(f"Input table is malformed. Row {lineNumber} is not the same length as the first row.")
+
+            inputCells: list[str] = cells[:mintermLength]
+            if not BINARY_CELLS.issuperset(inputCells):
+                for column, cell in enumerate(inputCells):
+                    if cell == "x":
+                        raise ValueError(f"Table data in row {lineNumber}, cell {column + 1} is invalid. `x` may only exist in {outputColumns}.")
+                    elif cell not in BINARY_CELLS:
+                        raise ValueError(f"Table data in row {lineNumber}, cell {column + 1} is invalid. `{cell}` is not 0, 1, or x")
+            index: int = int("".join(inputCells), 2)
+
+            byteIndex: int = index >> 3
+            bit: int = 1 << (index & 7)
+            if seenBits[byteIndex] & bit:
+                raise ValueError(f"Input table row {lineNumber} repeats input combination {index}. Remove duplicate or conflicting rows.")
+            seenBits[byteIndex] |= bit
+            numRows += 1
+
+            for output in range(outputCount):
+                outputCell: str = cells[mintermLength + output]
+                if outputCell == "1":
+                    onsetBits[output][byteIndex] |= bit
+                elif outputCell == "x":
+                    dontCareBits[output][byteIndex] |= bit
+                elif outputCell != "0":
+                    raise ValueError(f"Table data in row {lineNumber}, cell {mintermLength + output + 1} is invalid. `{outputCell}` is not 0, 1, or x")
+
+    if mintermLength is None:
+        raise ValueError(f"Input file contains no content.")
+    elif numRows == 1:
+        raise ValueError(f"Input file contains only one line. Each row must be separated by a new line.")
+
+    # Missing rows are don't cares of every output
+    maxRows: int = 1 << mintermLength
+    if numRows < maxRows:
+        logger.debug("Actual rows: %d\nMax rows:    %d", numRows, maxRows)
+        tableBytes: int = (maxRows + 7) // 8
+        for byteIndex in range(tableBytes):
+            seen: int = seenBits[byteIndex]
+            if seen != 0xFF:
+                for bits in dontCareBits:
+                    bits[byteIndex] |= ~seen & 0xFF
+        # The last table byte may hold bits past the end of the table
+        if maxRows & 7:
+            for bits in dontCareBits:
+                bits[tableBytes - 1] &= (1 << (maxRows & 7)) - 1
+
+    onsets: list[array] = [bitmap_to_indices(bits) for bits in onsetBits]
+    dontCareSets: list[array] = [bitmap_to_indices(bits) for bits in dontCareBits]
+    logger.info("Loaded %d rows: %d on-set and %d don't care minterms", numRows, sum(map(len, onsets)), sum(map(len, dontCareSets)))
+
+    outputLabels: Optional[list[str]] = None
+    if labels is not None:
+        # Drop the row label header when it is there
+        if hasRowLabels and len(labels) == mintermLength + outputCount + 1:
+            labels = labels[1:]
+        if len(labels) == mintermLength + outputCount:
+            outputLabels = labels[mintermLength:]
+        labels = labels[:mintermLength] if len(labels) >= mintermLength else None
+
+    return mintermLength, onsets, dontCareSets, labels, outputLabels
+
+
+def bitmap_to_indices(
+        bitmap: bytes
+    ) -> array:
+
+    # Positions of all set bits, in ascending order. Bit i of the bitmap lives in byte i // 8 at bit i % 8.
+    # The bitmap is walked 64 bits at a time so that empty stretches cost one comparison per word
+    words: array = array("Q")
+    words.frombytes(bitmap)
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    indices: array = array("Q")
+    for wordIndex, word in enumerate(words):
+        if not word:
+            continue
+        base: int = wordIndex << 6
+        while word:
+            lowestBit: int = word & -word
+            indices.append(base + lowestBit.bit_length() - 1)
+            word ^= lowestBit
+    return indices
+
+
+def bitmap_length(
+        mintermLength: int
+    ) -> int:
+
+    # Bytes needed for one bit per row of a 2^n row table, rounded up to whole 64 bit words
+    return ((1 << mintermLength) + 63) // 64 * 8
@@ -0,0 +1,401 @@
+from logger_setup import get_logger, VERBOSE, lazy_pformat
+from logging import *
+from global_constants import *
+from typing import Iterator, Optional
+from solve_limits import limits_reached
+
+logger = get_logger(__name__)
+
+
+def select_minimum_cover(
+        primeImplicants: list[tuple[int, int, int]],
+        onsetCount: int,
+        mintermLength: int,
+        solver: str = "branch-and-bound"
+    ) -> list[tuple[int, int]]:
+
+    """
+    Pick a minimum cost set of prime implicants (value, mask, coverage) that covers all `onsetCount` on-set minterms.
+    Essential primes are taken first and the chart is reduced by row and column dominance until nothing changes.
+    Only the cyclic core left after that is solved exactly, with `solver` being "branch-and-bound" or "petrick".
+    Cost is the number of cubes, with the literal count breaking ties. Returns the selected cubes as (value, mask).
+    Once the solve limits are reached, whatever is left of the chart is covered greedily.
+    """
+
+    if solver not in COVER_SOLVERS:
+        raise ValueError(f"Unknown cover solver `{solver}`, must be one of: {COVER_SOLVERS}")
+
+    if onsetCount == 0:
+        return []
+
+    rowCoverage: list[int]
+    rowWeights: list[int]
+    columnRows: list[int]
+    rowCoverage, rowWeights, columnRows = build_prime_implicant_chart(primeImplicants, onsetCount, mintermLength)
+
+    selectedRows: list[int]
+    remainingRows: int
+    remainingColumns: int
+    selectedRows, remainingRows, remainingColumns = reduce_prime_implicant_chart(rowCoverage, rowWeights, columnRows)
+
+    if remainingColumns:
+        logger.debug("Cyclic core left after reduction: %d rows, %d columns", remainingRows.bit_count(), remainingColumns.bit_count())
+        if limits_reached():
+            selectedRows += greedy_cover(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+        elif solver == "petrick":
+            selectedRows += solve_cyclic_core_petrick(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+        else:
+            selectedRows += solve_cyclic_core_branch_and_bound(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+
+    cover: list[tuple[int, int]] = [(primeImplicants[row][0], primeImplicants[row][1]) for row in sorted(selectedRows)]
+
+    logger.debug("Selected cover:\n%s", lazy_pformat(cover))
+
+    return cover
+
+
+def cover_with_largest_implicants(
+        implicants: list[tuple[int, int, int]],
+        onsetCount: int
+    ) -> list[tuple[int, int]]:
+
+    """
+    Quick valid cover for when the solve limits cut prime generation short and the implicants are far too many for a
+    chart: largest cubes first, each one taken when it covers an on-set minterm none of the cubes taken so far does.
+    """
+
+    uncoveredColumns: int = (1 << onsetCount) - 1
+    cover: list[tuple[int, int]] = []
+    for value, mask, coverage in sorted(implicants, key=lambda implicant: -implicant[1].bit_count()):
+        if coverage & uncoveredColumns:
+            cover.append((value, mask))
+            uncoveredColumns &= ~coverage
+            if not uncoveredColumns:
+                break
+
+    return cover
+
+
+def build_prime_implicant_chart(
+        primeImplicants: list[tuple[int, int, int]],
+        onsetCount: int,
+        mintermLength: int
+    ) -> tuple[list[int], list[int], list[int]]:
+
+    # Rows are primes with their coverage over on-set ranks, columns are on-set ranks with the rows covering them
+    rowCoverage: list[int] = [coverage for _, _, coverage in primeImplicants]
+
+    # Fewer cubes always wins, literals only break ties: one cube outweighs the literals of every prime put together
+    cubeWeight: int = mintermLength * len(primeImplicants) + 1
+    rowWeights: list[int] = [cubeWeight + mintermLength - mask.bit_count() for _, mask, _ in primeImplicants]
+
+    columnRows: list[int] = [0] * onsetCount
+    for row, coverage in enumerate(rowCoverage):
+        rowBit: int = 1 << row
+        while coverage:
+            columnBit: int = coverage & -coverage
+            coverage ^= columnBit
+            columnRows[columnBit.bit_length() - 1] |= rowBit
+
+    for column, rows in enumerate(columnRows):
+        if not rows:
+            raise ValueError(f"On-set minterm {column} is not covered by any prime implicant.")
+
+    return rowCoverage, rowWeights, columnRows
+
+
+def reduce_prime_implicant_chart(
+        rowCoverage: list[int],
+        rowWeights: list[int],
+        columnRows: list[int],
+        remainingRows: Optional[int] = None,
+        remainingColumns: Optional[int] = None
+    ) -> tuple[list[int], int, int]:
+
+    """
+    Repeatedly take essential rows and drop dominated rows and columns, starting from the whole chart unless the
+    remaining rows and columns (as bitsets) are given. Every remaining column must still be covered by some row.
+    Returns the selected rows plus the rows and columns still left once the chart stops shrinking, or once the solve
+    limits are reached, every step leaves a chart whose remaining columns are all still covered.
+    """
+
+    if remainingRows is None:
+        remainingRows = (1 << len(rowCoverage)) - 1
+    if remainingColumns is None:
+        remainingColumns = (1 << len(columnRows)) - 1
+    selectedRows: list[int] = []
+
+    # Checked once, the loops below stay free of logging calls unless tracing
+    traceEnabled: bool = logger.isEnabledFor(VERBOSE)
+
+    changed: bool = True
+    while changed and remainingColumns and not limits_reached():
+        changed = False
+
+        # Essential rows: the only remaining row covering some remaining column
+        columns: int = remainingColumns
+        while columns:
+            columnBit: int = columns & -columns
+            columns ^= columnBit
+            if not remainingColumns & columnBit:
+                continue
+            rows: int = columnRows[columnBit.bit_length() - 1] & remainingRows
+            if rows & (rows - 1) == 0:
+                row: int = rows.bit_length() - 1
+                if traceEnabled:
+                    logger.verbose("Essential row %d", row)
+                selectedRows.append(row)
+                remainingRows &= ~rows
+                remainingColumns &= ~rowCoverage[row]
+                changed = True
+
+        if not remainingColumns:
+            break
+
+        # Row dominance: drop a row when another remaining row covers everything it does for no more cost.
+        # Such a row has to cover the row's first column, so only the rows of that column are checked
+        for row in list(iterate_bits(remainingRows)):
+            if limits_reached():
+                break
+            coverage: int = rowCoverage[row] & remainingColumns
+            if not coverage:
+                remainingRows &= ~(1 << row)
+                changed = True
+                continue
+            firstColumn: int = (coverage & -coverage).bit_length() - 1
+            for otherRow in iterate_bits(columnRows[firstColumn] & remainingRows & ~(1 << row)):
+                otherCoverage: int = rowCoverage[otherRow] & remainingColumns
+                if coverage & ~otherCoverage:
+                    continue
+                # Equal rows are broken by index so exactly one of them survives
+                if rowWeights[otherRow] < rowWeights[row] or (
+                        rowWeights[otherRow] == rowWeights[row] and (coverage != otherCoverage or otherRow < row)):
+                    if traceEnabled:
+                        logger.verbose("Row %d dominates row %d", otherRow, row)
+                    remainingRows &= ~(1 << row)
+                    changed = True
+                    break
+
+        # Column dominance: a column whose rows are a superset of another column's rows is covered for free.
+        # Supersets of a column's rows all contain its first row, so only the columns of that row are checked
+        for column in list(iterate_bits(remainingColumns)):
+            if limits_reached():
+                break
+            if not remainingColumns & (1 << column):
+                continue
+            rows = columnRows[column] & remainingRows
+            firstRow: int = (rows & -rows).bit_length() - 1
+            for otherColumn in iterate_bits(rowCoverage[firstRow] & remainingColumns & ~(1 << column)):
+                otherRows: int = columnRows[otherColumn] & remainingRows
+                if rows & ~otherRows:
+                    continue
+                if rows != otherRows or column < otherColumn:
+                    if traceEnabled:
+                        logger.verbose("Column %d dominates column %d", otherColumn, column)
+                    remainingColumns &= ~(1 << otherColumn)
+                    changed = True
+
+    logger.verbose("Rows selected during reduction: %s", selectedRows)
+
+    return selectedRows, remainingRows, remainingColumns
+
+
+def solve_cyclic_core_petrick(
+        rowCoverage: list[int],
+        rowWeights: list[int],
+        columnRows: list[int],
+        remainingRows: int,
+        remainingColumns: int
+    ) -> list[int]:
+
+    # Petrick's method: multiply out the product of sums (one sum of rows per column), each product being a row bitset
+    products: list[int] = [0]
+    for column in iterate_bits(remainingColumns):
+        # The expansion cannot be cut short with a usable result, out of budget the core is covered greedily
+        if limits_reached():
+            return greedy_cover(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+        rows: int = columnRows[column] & remainingRows
+        expanded: set[int] = set()
+        for product in products:
+            if product & rows:
+                expanded.add(product)
+                continue
+            for row in iterate_bits(rows):
+                expanded.add(product | (1 << row))
+
+        # Absorption: X + XY = X
+        products = []
+        for product in sorted(expanded, key=int.bit_count):
+            # Each product is checked against all kept ones, the limits are checked as often at little extra cost
+            if limits_reached():
+                return greedy_cover(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+            if not any(kept & product == kept for kept in products):
+                products.append(product)
+
+    bestProduct: Optional[int] = None
+    bestWeight: int = 0
+    for product in products:
+        weight: int = sum(rowWeights[row] for row in iterate_bits(product))
+        if bestProduct is None or weight < bestWeight:
+            bestProduct, bestWeight = product, weight
+
+    return list(iterate_bits(bestProduct))
+
+
+def solve_cyclic_core_branch_and_bound(
+        rowCoverage: list[int],
+        rowWeights: list[int],
+        columnRows: list[int],
+        remainingRows: int,
+        remainingColumns: int
+    ) -> list[int]:
+
+    """
+    Exact minimum weight cover of the remaining chart by branch and bound.
+    The greedy cover is the first incumbent, every node is reduced like the full chart and pruned with an
+    independent set lower bound, and subproblems keyed by their (rows, columns) bitsets are memoized.
+    When the solve limits are reached the search stops and the best cover found so far is returned.
+    """
+
+    greedyRows: list[int] = greedy_cover(rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns)
+    greedyWeight: int = sum(rowWeights[row] for row in greedyRows)
+
+    memo: dict[tuple[int, int], tuple[int, Optional[int]]] = {}
+    solution: Optional[tuple[int, int]] = branch_and_bound_search(
+        rowCoverage, rowWeights, columnRows, remainingRows, remainingColumns, greedyWeight, memo)
+
+    logger.debug("Branch and bound explored %d subproblems, greedy weight %d, best weight %d", len(memo), greedyWeight, solution[0] if solution else greedyWeight)
+
+    if solution is None:
+        return greedyRows
+    return list(iterate_bits(solution[1]))
+
+
+def branch_and_bound_search(
+        rowCoverage: list[int],
+        rowWeights: list[int],
+        columnRows: list[int],
+        rows: int,
+        columns: int,
+        budget: int,
+        memo: dict[tuple[int, int], tuple[int, Optional[int]]]
+    ) -> Optional[tuple[int, int]]:
+
+    # Returns (weight, row bitset) of the cheapest cover lighter than `budget`, or None if there is none.
+    # The memo holds either the optimum of a subproblem or a lower bound on it (with no solution attached)
+    if not columns:
+        return 0, 0
+    # Out of budget nothing new is searched, the callers keep the best cover they already have
+    if limits_reached():
+        return None
+
+    key: tuple[int, int] = (rows, columns)
+    cached: Optional[tuple[int, Optional[int]]] = memo.get(key)
+    if cached:
+        bound, cachedSolution = cached
+        if cachedSolution is not None:
+            return (bound, cachedSolution) if bound < budget else None
+        if bound >= budget:
+            return None
+
+    for column in iterate_bits(columns):
+        if not columnRows[column] & rows:
+            memo[key] = (1 << 62, None)
+            return None
+
+    selectedRows: list[int]
+    reducedRows: int
+    reducedColumns: int
+    selectedRows, reducedRows, reducedColumns = reduce_prime_implicant_chart(rowCoverage, rowWeights, columnRows, rows, columns)
+    selectedWeight: int = sum(rowWeights[row] for row in selectedRows)
+    selectedBits: int = 0
+    for row in selectedRows:
+        selectedBits |= 1 << row
+
+    best: Optional[tuple[int, int]] = None
+    if not reducedColumns:
+        if selectedWeight < budget:
+            best = (selectedWeight, selectedBits)
+    else:
+        lowerBound: int = selectedWeight + independent_set_lower_bound(rowWeights, columnRows, reducedRows, reducedColumns)
+        if lowerBound >= budget:
+            memo[key] = (max(lowerBound, cached[0] if cached else 0), None)
+            return None
+
+        # Branch on the hardest column: one of its rows has to be in the cover. Rows already tried are excluded
+        # from the later branches so no cover is visited twice
+        branchColumn: int = min(iterate_bits(reducedColumns), key=lambda c: (columnRows[c] & reducedRows).bit_count())
+        candidateRows: list[int] = sorted(
+            iterate_bits(columnRows[branchColumn] & reducedRows),
+            key=lambda r: (rowWeights[r], -(rowCoverage[r] & reducedColumns).bit_count()))
+
+        excludedRows: int = 0
+        for row in candidateRows:
+            rowBit: int = 1 << row
+            limit: int = (best[0] if best else budget) - selectedWeight - rowWeights[row]
+            if limit > 0:
+                subSolution: Optional[tuple[int, int]] = branch_and_bound_search(
+                    rowCoverage, rowWeights, columnRows,
+                    reducedRows & ~excludedRows & ~rowBit, reducedColumns & ~rowCoverage[row],
+                    limit, memo)
+                if subSolution:
+                    best = (selectedWeight + rowWeights[row] + subSolution[0], selectedBits | rowBit | subSolution[1])
+            excludedRows |= rowBit
+
+    if best:
+        memo[key] = best
+    else:
+        memo[key] = (max(budget, cached[0] if cached else 0), None)
+    return best
+
+
+def independent_set_lower_bound(
+        rowWeights: list[int],
+        columnRows: list[int],
+        rows: int,
+        columns: int
+    ) -> int:
+
+    # Columns that share no rows each need their own row, so the cheapest row of each one adds up to a lower bound
+    lowerBound: int = 0
+    usedRows: int = 0
+    for column in sorted(iterate_bits(columns), key=lambda c: (columnRows[c] & rows).bit_count()):
+        candidateRows: int = columnRows[column] & rows
+        if candidateRows & usedRows:
+            continue
+        usedRows |= candidateRows
+        lowerBound += min(rowWeights[row] for row in iterate_bits(candidateRows))
+    return lowerBound
+
+
+def greedy_cover(
+        rowCoverage: list[int],
+        rowWeights: list[int],
+        columnRows: list[int],
+        rows: int,
+        columns: int
+    ) -> list[int]:
+
+    # Keep taking the row covering the most remaining columns per unit of weight. Every pick scans all rows, once the
+    # solve limits are reached only the rows of the first uncovered column are compared
+    selectedRows: list[int] = []
+    while columns:
+        candidateRows: int = rows
+        if limits_reached():
+            candidateRows = columnRows[(columns & -columns).bit_length() - 1] & rows
+        row: int = max(iterate_bits(candidateRows), key=lambda r: (rowCoverage[r] & columns).bit_count() / rowWeights[r])
+        selectedRows.append(row)
+        columns &= ~rowCoverage[row]
+        rows &= ~(1 << row)
+    return selectedRows
+
+
+def iterate_bits(
+        bitset: int
+    ) -> Iterator[int]:
+
+    # Yield the position of every set bit, lowest first
+    while bitset:
+        bit: int = bitset & -bitset
+        bitset ^= bit
+        yield bit.bit_length() - 1
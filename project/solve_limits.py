@@ -0,0 +1,138 @@
+import sys
+import time
+import resource
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = get_logger(__name__)
+
+# Limits the prime generation and cover selection check, None when the run is unbounded. Like the stats collector,
+# the engines read it once per call
+activeLimits: Optional["SolveLimits"] = None
+
+
+class SolveLimits:
+
+    """
+    Time and memory budget of one minimization. The engines call `reached` between units of work and wind down once
+    it returns True: prime generation hands over the implicants it has so far and cover selection keeps the best
+    cover found so far, so the result is always a valid cover. `limitReached` names the limit that stopped the run,
+    it stays None when the cover is the exact minimum.
+    The memory limit caps how far resident memory grows above what the process held when the limits were created, so
+    the interpreter and earlier work in a long-lived process do not count against it.
+    """
+
+    __slots__ = ("deadline", "memoryLimit", "memoryBaseline", "nextMemoryCheck", "limitReached")
+
+    def __init__(
+            self,
+            timeLimit: Optional[float] = None,
+            memoryLimit: Optional[int] = None
+        ) -> None:
+
+        self.deadline: Optional[float] = time.perf_counter() + timeLimit if timeLimit is not None else None
+        self.memoryLimit: Optional[int] = memoryLimit
+        self.memoryBaseline: int = resident_memory_bytes() if memoryLimit is not None else 0
+        self.nextMemoryCheck: float = 0.0
+        self.limitReached: Optional[str] = None
+
+    def reached(self) -> bool:
+
+        if self.limitReached is not None:
+            return True
+        now: float = time.perf_counter()
+        if self.deadline is not None and now >= self.deadline:
+            self.limitReached = "time"
+        elif self.memoryLimit is not None and now >= self.nextMemoryCheck and self.memory_exceeded(now):
+            self.limitReached = "memory"
+        else:
+            return False
+
+        logger.info("%s limit reached, finishing with the best cover found so far", self.limitReached.capitalize())
+        return True
+
+    def memory_exceeded(
+            self,
+            now: float
+        ) -> bool:
+
+        # Sampling memory costs a file read, the engines check far more often than it is worth sampling
+        self.nextMemoryCheck = now + LIMIT_MEMORY_CHECK_SECONDS
+        return resident_memory_bytes() - self.memoryBaseline >= self.memoryLimit
+
+
+@contextmanager
+def solving_within(
+        limits: Optional[SolveLimits]
+    ) -> Iterator[Optional[SolveLimits]]:
+
+    """
+    Install the limits for the duration of the block, the previous ones are restored after.
+    """
+
+    global activeLimits
+
+    previousLimits: Optional[SolveLimits] = activeLimits
+    activeLimits = limits
+    try:
+        yield limits
+    finally:
+        activeLimits = previousLimits
+
+
+def solve_limits_for(
+        timeLimit: Optional[float],
+        memoryLimit: Optional[int]
+    ) -> Optional[SolveLimits]:
+
+    # Unbounded runs get no limits at all, so the engines skip the checks
+    if timeLimit is None and memoryLimit is None:
+        return None
+    return SolveLimits(timeLimit, memoryLimit)
+
+
+def limits_reached() -> bool:
+
+    return activeLimits is not None and activeLimits.reached()
+
+
+def resident_memory_bytes() -> int:
+
+    # Current resident set size where /proc has it. Elsewhere only the peak is available, reported in KiB on Linux and
+    # in bytes on macOS, which still tracks growth while the run is setting new peaks
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def parse_time_limit(
+        seconds: str
+    ) -> float:
+
+    try:
+        timeLimit: float = float(seconds)
+    except ValueError:
+        timeLimit = 0.0
+    if not timeLimit > 0:
+        raise ValueError(f"Time limit `{seconds}` must be a positive number of seconds.")
+
+    return timeLimit
+
+
+def parse_memory_size(
+        size: str
+    ) -> int:
+
+    # Plain bytes or a K, M or G suffix (powers of 1024), e.g. `512M`
+    multiplier: int = MEMORY_SIZE_SUFFIXES.get(size[-1:].upper(), 1)
+    digits: str = size[:-1] if size[-1:].upper() in MEMORY_SIZE_SUFFIXES else size
+    if not digits.isdigit() or int(digits) < 1:
+        raise ValueError(f"Memory limit `{size}` must be a positive number of bytes, optionally with a K, M or G suffix.")
+
+    return int(digits) * multiplier
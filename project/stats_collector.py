@@ -0,0 +1,194 @@
+import time
+from logger_setup import get_logger
+from logging import *
+from global_constants import *
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, Optional
+
+logger = get_logger(__name__)
+
+# Collector the engines report to, None when nobody asked for stats. The engines read it once per call, so with no
+# collector installed the only cost is that read. `json` and `tracemalloc` are only imported once stats are collected
+activeCollector: Optional["StatsCollector"] = None
+
+
+class StatsCollector:
+
+    """
+    Structured counterpart of the DEBUG dumps: wall time (and traced memory) of every stage, and per combination level
+    of the prime implicant engines the input terms, groups, pair comparisons, merges, duplicates removed, primes
+    emitted, wall time and memory allocated. Install one with `collecting_stats` to have the engines report to it.
+    """
+
+    __slots__ = ("stages", "levels", "traceMemory", "openMarks")
+
+    def __init__(
+            self,
+            traceMemory: bool = False
+        ) -> None:
+
+        self.stages: list[dict[str, any]] = []
+        self.levels: list[dict[str, any]] = []
+        self.traceMemory: bool = traceMemory
+        # [traced bytes at the mark, highest peak seen since] of every stage and level still running
+        self.openMarks: list[list[int]] = []
+
+    @contextmanager
+    def stage(
+            self,
+            name: str
+        ) -> Iterator[None]:
+
+        start: float = time.perf_counter()
+        memoryMark: Optional[list[int]] = self.memory_mark()
+        try:
+            yield
+        finally:
+            self.stages.append({
+                "stage": name,
+                "seconds": time.perf_counter() - start,
+                "allocated_bytes": self.memory_since(memoryMark)
+            })
+
+    def start_level(self) -> tuple[float, Optional[list[int]]]:
+
+        return time.perf_counter(), self.memory_mark()
+
+    def record_level(
+            self,
+            start: tuple[float, Optional[list[int]]],
+            engine: str,
+            level: int,
+            terms: int,
+            groups: int,
+            comparisons: int,
+            merges: int,
+            duplicates: int,
+            primes: int
+        ) -> None:
+
+        # Time and memory are taken first, the counting the caller did for this record is not part of the level
+        seconds: float = time.perf_counter() - start[0]
+        self.levels.append({
+            "engine": engine,
+            "level": level,
+            "terms": terms,
+            "groups": groups,
+            "comparisons": comparisons,
+            "merges": merges,
+            "duplicates": duplicates,
+            "primes": primes,
+            "seconds": seconds,
+            "allocated_bytes": self.memory_since(start[1])
+        })
+
+    def memory_mark(self) -> Optional[list[int]]:
+
+        # Resetting the peak would hide it from the stages already running, so it is handed to their marks first
+        if not self.traceMemory:
+            return None
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return None
+        self.carry_peak()
+        tracemalloc.reset_peak()
+        current: int = tracemalloc.get_traced_memory()[0]
+        memoryMark: list[int] = [current, current]
+        self.openMarks.append(memoryMark)
+        return memoryMark
+
+    def memory_since(
+            self,
+            memoryMark: Optional[list[int]]
+        ) -> Optional[int]:
+
+        # Peak growth over the mark, memory freed again within the stage still counts as allocated
+        if memoryMark is None:
+            return None
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return None
+        self.carry_peak()
+        self.openMarks.remove(memoryMark)
+        return max(0, memoryMark[1] - memoryMark[0])
+
+    def carry_peak(self) -> None:
+
+        import tracemalloc
+        peak: int = tracemalloc.get_traced_memory()[1]
+        for memoryMark in self.openMarks:
+            if peak > memoryMark[1]:
+                memoryMark[1] = peak
+
+    def as_dict(self) -> dict[str, any]:
+
+        return {"stages": self.stages, "levels": self.levels}
+
+    def format_json(self) -> str:
+
+        import json
+        return json.dumps(self.as_dict(), indent = 2)
+
+    def format_table(self) -> str:
+
+        lines: list[str] = [f"{'stage':<24}{'seconds':>12}{'allocated':>14}"]
+        for stage in self.stages:
+            lines.append(f"{stage['stage']:<24}{stage['seconds']:>12.6f}{format_bytes(stage['allocated_bytes']):>14}")
+
+        if self.levels:
+            lines.append("")
+            lines.append(
+                f"{'engine':<10}{'level':>6}{'terms':>10}{'groups':>8}{'compared':>12}{'merges':>10}"
+                f"{'dupes':>10}{'primes':>8}{'seconds':>12}{'allocated':>14}"
+                )
+            for level in self.levels:
+                lines.append(
+                    f"{level['engine']:<10}{level['level']:>6}{level['terms']:>10}{level['groups']:>8}{level['comparisons']:>12}"
+                    f"{level['merges']:>10}{level['duplicates']:>10}{level['primes']:>8}{level['seconds']:>12.6f}"
+                    f"{format_bytes(level['allocated_bytes']):>14}"
+                    )
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def collecting_stats(
+        collector: Optional[StatsCollector] = None
+    ) -> Iterator[StatsCollector]:
+
+    """
+    Install a collector (a new one unless given) for the duration of the block, the previous one is restored after.
+    With memory tracing asked for, `tracemalloc` runs for the block unless it was already running.
+    """
+
+    global activeCollector
+
+    if collector is None:
+        collector = StatsCollector()
+    import tracemalloc
+    startedTracing: bool = collector.traceMemory and not tracemalloc.is_tracing()
+    if startedTracing:
+        tracemalloc.start()
+
+    previousCollector: Optional[StatsCollector] = activeCollector
+    activeCollector = collector
+    try:
+        yield collector
+    finally:
+        activeCollector = previousCollector
+        if startedTracing:
+            tracemalloc.stop()
+
+
+def stats_stage(
+        name: str
+    ) -> ContextManager:
+
+    return activeCollector.stage(name) if activeCollector is not None else nullcontext()
+
+
+def format_bytes(
+        byteCount: Optional[int]
+    ) -> str:
+
+    return "-" if byteCount is None else str(byteCount)
@@ -0,0 +1,38 @@
+import io
+import os
+import json
+import batch_minimize
+from batch_minimize import run_batch
+
+originalRunBatchJob = batch_minimize.run_batch_job
+
+
+def run_or_kill_worker(
+        index: int,
+        job: dict[str, any]
+    ) -> dict[str, any]:
+
+    if job["name"] == "kill":
+        os._exit(1)
+    return originalRunBatchJob(index, job)
+
+
+def test_dead_worker_does_not_stop_the_batch(
+        monkeypatch: any
+    ) -> None:
+
+    # Forked workers see the patched job function, the first job takes its worker and the pool down
+    monkeypatch.setattr(batch_minimize, "run_batch_job", run_or_kill_worker)
+    jobDefaults: dict[str, any] = {"labels": None, "solver": "branch-and-bound", "engine": "exact", "strategy": "hash", "cache": False, "timeLimit": None, "memoryLimit": None, "path": None, "dontcares": None, "inputs": 3}
+    jobs: list[dict[str, any]] = [{**jobDefaults, "name": "kill" if index == 0 else f"job {index}", "minterms": "0,1,5"} for index in range(30)]
+
+    output: io.StringIO = io.StringIO()
+    failed: int = run_batch(jobs, 2, output)
+    results: list[dict[str, any]] = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert sorted(result["index"] for result in results) == list(range(30))
+    byIndex: dict[int, dict[str, any]] = {result["index"]: result for result in results}
+    assert byIndex[0]["status"] == "error" and "BrokenProcessPool" in byIndex[0]["error"]
+    # Jobs submitted after the worker died ran in a new pool
+    assert byIndex[29]["status"] == "ok" and byIndex[29]["sop"]
+    assert failed == sum(result["status"] != "ok" for result in results) < 30
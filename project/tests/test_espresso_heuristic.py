@@ -0,0 +1,54 @@
+import random
+import pytest
+from espresso_heuristic import espresso_minimize
+from minimization_api import minimize
+from incremental_minimization import iterate_cube_minterms
+
+
+def check_cover(
+        cover: list[tuple[int, int]],
+        onset: list[int],
+        dontCares: list[int]
+    ) -> None:
+
+    covered: set[int] = set()
+    for cube in cover:
+        covered.update(iterate_cube_minterms(*cube))
+    assert covered >= set(onset)
+    assert covered <= set(onset) | set(dontCares)
+
+
+@pytest.mark.parametrize("mintermLength", [3, 5, 6])
+def test_random_functions(
+        mintermLength: int
+    ) -> None:
+
+    rng: random.Random = random.Random(mintermLength)
+    for _ in range(20):
+        minterms: list[int] = rng.sample(range(1 << mintermLength), rng.randint(1, 1 << mintermLength))
+        dontCareCount: int = rng.randint(0, len(minterms) - 1)
+        onset: list[int] = sorted(minterms[dontCareCount:])
+        dontCares: list[int] = sorted(minterms[:dontCareCount])
+
+        cover: list[tuple[int, int]] = espresso_minimize(onset, dontCares, mintermLength)
+        check_cover(cover, onset, dontCares)
+        exactCost: tuple[int, int] = minimize(onset, dontCares, mintermLength).cost
+        assert (len(cover), sum(mintermLength - mask.bit_count() for _, mask in cover)) >= exactCost
+
+
+def test_wide_sparse_function() -> None:
+
+    # Few minterms over many inputs give a large off-set, every cube is checked against it through the literal index
+    rng: random.Random = random.Random(20)
+    onset: list[int] = sorted(rng.sample(range(1 << 20), 300))
+    onset += [minterm ^ 1 for minterm in onset[:50] if minterm ^ 1 not in onset]
+    onset.sort()
+
+    cover: list[tuple[int, int]] = espresso_minimize(onset, [], 20)
+    check_cover(cover, onset, [])
+    assert len(cover) == len(minimize(onset, n = 20).cubes)
+
+
+def test_empty_onset() -> None:
+
+    assert espresso_minimize([], [1], 3) == []
@@ -0,0 +1,84 @@
+import random
+import pytest
+from minimization_api import minimize
+from incremental_minimization import IncrementalSession, iterate_cube_minterms
+
+
+def check_against_fresh(
+        result: any,
+        onset: set[int],
+        dontCares: set[int],
+        mintermLength: int
+    ) -> None:
+
+    covered: set[int] = set()
+    for cube in result.cubes:
+        covered.update(iterate_cube_minterms(*cube))
+    assert covered >= onset
+    assert covered <= onset | dontCares
+    assert result.cost == minimize(sorted(onset), sorted(dontCares), mintermLength).cost
+
+
+@pytest.mark.parametrize("solver", ["branch-and-bound", "petrick"])
+@pytest.mark.parametrize("mintermLength", [3, 4, 5])
+def test_random_edits_match_fresh_minimize(
+        solver: str,
+        mintermLength: int
+    ) -> None:
+
+    rng: random.Random = random.Random(mintermLength)
+    minterms: list[int] = list(range(1 << mintermLength))
+    onset: set[int] = set(rng.sample(minterms, len(minterms) // 3))
+    dontCares: set[int] = set(rng.sample([minterm for minterm in minterms if minterm not in onset], len(minterms) // 8))
+    session: IncrementalSession = IncrementalSession(sorted(onset), sorted(dontCares), mintermLength, solver)
+    check_against_fresh(session.cover(), onset, dontCares, mintermLength)
+
+    for _ in range(60):
+        edited: list[int] = rng.sample(minterms, rng.randint(1, 3))
+        operation: str = rng.choice(["add_minterms", "remove_minterms", "add_dont_cares", "remove_dont_cares"])
+        result: any = getattr(session, operation)(edited)
+        if operation == "add_minterms":
+            onset |= set(edited)
+            dontCares -= set(edited)
+        elif operation == "remove_minterms":
+            onset -= set(edited)
+        elif operation == "add_dont_cares":
+            dontCares |= set(edited)
+            onset -= set(edited)
+        else:
+            dontCares -= set(edited)
+        check_against_fresh(result, onset, dontCares, mintermLength)
+
+
+def test_edits_between_onset_and_dont_cares() -> None:
+
+    # The classic cyclic function, then its gaps turned into don't cares and back
+    session: IncrementalSession = IncrementalSession([0, 1, 2, 5, 6, 7], n = 3)
+    assert session.cover().cost == (3, 6)
+    check_against_fresh(session.add_dont_cares([3]), {0, 1, 2, 5, 6, 7}, {3}, 3)
+    assert session.add_dont_cares([4]).cost == (1, 0)
+    check_against_fresh(session.add_minterms([3]), {0, 1, 2, 3, 5, 6, 7}, {4}, 3)
+    check_against_fresh(session.remove_minterms([3]), {0, 1, 2, 5, 6, 7}, {4}, 3)
+    assert session.remove_dont_cares([4]).cost == (3, 6)
+    assert session.remove_minterms([0, 1, 2, 5, 6, 7]).cubes == []
+    assert session.add_minterms([7]).cubes == [(7, 0)]
+
+
+def test_edit_only_solves_touched_component() -> None:
+
+    # Minterms 0-1 and 14-15 share no prime, editing one group keeps the other group's cover
+    session: IncrementalSession = IncrementalSession([0, 1, 14, 15], n = 4)
+    session.cover()
+    farComponent: int = session.mintermComponents[15]
+
+    result: any = session.add_minterms([3])
+    assert session.mintermComponents[15] == farComponent
+    assert session.mintermComponents[0] != farComponent
+    assert result.cost == minimize([0, 1, 3, 14, 15], n = 4).cost
+
+
+def test_edit_out_of_range() -> None:
+
+    session: IncrementalSession = IncrementalSession([0, 1], n = 2)
+    with pytest.raises(ValueError):
+        session.add_minterms([4])
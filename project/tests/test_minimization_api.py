@@ -0,0 +1,154 @@
+import random
+import pytest
+from minimization_api import minimize, minimize_many
+from result_cache import ENTRY_SUFFIX
+from incremental_minimization import iterate_cube_minterms
+
+
+def random_function(
+        seed: int,
+        mintermLength: int
+    ) -> tuple[list[int], list[int]]:
+
+    # Past the cover library and the NP path, so the result cache is used
+    rng: random.Random = random.Random(seed)
+    minterms: list[int] = rng.sample(range(1 << mintermLength), 1 << mintermLength - 1)
+    return sorted(minterms[:-8]), sorted(minterms[-8:])
+
+
+def check_cover(
+        cubes: list[tuple[int, int]],
+        onset: list[int],
+        dontCares: list[int]
+    ) -> None:
+
+    covered: set[int] = set()
+    for cube in cubes:
+        covered.update(iterate_cube_minterms(*cube))
+    assert covered >= set(onset)
+    assert covered <= set(onset) | set(dontCares)
+
+
+@pytest.fixture
+def cacheDirectory(
+        tmp_path: any,
+        monkeypatch: any
+    ) -> any:
+
+    monkeypatch.setenv("QM_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_result_fields() -> None:
+
+    result: any = minimize([0, 1, 2, 5, 6, 7])
+    assert result.inputs == 3
+    assert result.optimal
+    assert result.cost == (3, 6)
+    assert result.cost == (len(result.cubes), sum(result.inputs - mask.bit_count() for _, mask in result.cubes))
+    assert set(result.timings) == {"prepare", "minimize"}
+    check_cover(result.cubes, [0, 1, 2, 5, 6, 7], [])
+
+
+def test_bitset_input_and_dont_cares() -> None:
+
+    result: any = minimize(0b11100111, dc = [3, 4])
+    assert result.cost == (1, 0)
+    assert result.sop() == "1"
+    assert minimize([0, 1, 2, 5, 6, 7]).cost == minimize(0b11100111).cost
+
+
+def test_heuristic_is_not_optimal() -> None:
+
+    onset, dontCares = random_function(1, 8)
+    result: any = minimize(onset, dontCares, 8, engine = "heuristic")
+    assert not result.optimal
+    check_cover(result.cubes, onset, dontCares)
+    assert result.cost >= minimize(onset, dontCares, 8).cost
+
+
+def test_empty_onset() -> None:
+
+    result: any = minimize([], n = 4)
+    assert result.cubes == []
+    assert result.cost == (0, 0)
+    assert result.optimal
+
+
+@pytest.mark.parametrize("arguments", [
+    {"on": [-1]},
+    {"on": [1], "dc": [1]},
+    {"on": [8], "n": 3},
+    {"on": [1], "n": 0},
+    {"on": [1], "solver": "simplex"},
+    {"on": [1], "engine": "annealing"},
+    {"on": [1], "strategy": "sorted"}
+])
+def test_invalid_input(
+        arguments: dict[str, any]
+    ) -> None:
+
+    with pytest.raises(ValueError):
+        minimize(**arguments)
+
+
+def test_cache_only_used_when_asked(
+        cacheDirectory: any
+    ) -> None:
+
+    onset, dontCares = random_function(2, 8)
+    uncached: any = minimize(onset, dontCares, 8)
+    assert not list(cacheDirectory.rglob("*" + ENTRY_SUFFIX))
+
+    stored: any = minimize(onset, dontCares, 8, cache = True)
+    assert len(list(cacheDirectory.rglob("*" + ENTRY_SUFFIX))) == 1
+    loaded: any = minimize(onset, dontCares, 8, cache = True)
+    assert stored.cubes == loaded.cubes
+    assert loaded.optimal
+    assert uncached.cost == loaded.cost
+
+
+def test_cache_hit_skips_minimizing(
+        cacheDirectory: any,
+        caplog: any
+    ) -> None:
+
+    onset, dontCares = random_function(3, 8)
+    minimize(onset, dontCares, 8, cache = True)
+    with caplog.at_level("INFO"):
+        minimize(onset, dontCares, 8, cache = True)
+    assert "loaded from the result cache" in caplog.text
+
+
+def test_generous_limits_stay_optimal() -> None:
+
+    onset, dontCares = random_function(4, 8)
+    result: any = minimize(onset, dontCares, 8, timeLimit = 60, memoryLimit = 1 << 30)
+    assert result.optimal
+    assert result.cost == minimize(onset, dontCares, 8).cost
+
+
+def test_reached_time_limit_gives_valid_cover(
+        cacheDirectory: any
+    ) -> None:
+
+    onset, dontCares = random_function(5, 10)
+    result: any = minimize(onset, dontCares, 10, timeLimit = 0, cache = True)
+    assert not result.optimal
+    check_cover(result.cubes, onset, dontCares)
+    # A cover cut short is not what the cache key promises
+    assert not list(cacheDirectory.rglob("*" + ENTRY_SUFFIX))
+
+
+def test_limits_do_not_outlive_the_call() -> None:
+
+    onset, dontCares = random_function(6, 8)
+    minimize(onset, dontCares, 8, timeLimit = 0)
+    assert minimize(onset, dontCares, 8).optimal
+
+
+def test_minimize_many() -> None:
+
+    results: list[any] = minimize_many([[0, 1, 2, 5, 6, 7], ([1, 3], [5], 3), {"on": [0, 3], "solver": "petrick"}], n = 3)
+    assert [result.cost for result in results] == [(3, 6), (1, 2), (2, 6)]
+    assert all(result.inputs == 3 for result in results)
@@ -0,0 +1,52 @@
+import os
+import sys
+import subprocess
+import pytest
+import minimization_client
+from quine_mccluskey import minimize_with_daemon
+from minimization_daemon import build_daemon_job
+
+PROJECT_DIRECTORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_DEFAULTS: dict[str, any] = {"labels": None, "solver": "branch-and-bound", "engine": "exact", "strategy": "hash", "cache": True, "timeLimit": None, "memoryLimit": None}
+
+
+def test_cache_field_is_honored() -> None:
+
+    assert build_daemon_job({"minterms": [0, 1]}, JOB_DEFAULTS)["cache"]
+    assert not build_daemon_job({"minterms": [0, 1], "cache": False}, JOB_DEFAULTS)["cache"]
+    assert not build_daemon_job({"argv": ["-m", "0,1", "--no-cache"]}, JOB_DEFAULTS)["cache"]
+    with pytest.raises(ValueError, match = "cache"):
+        build_daemon_job({"minterms": [0, 1], "cache": "no"}, JOB_DEFAULTS)
+
+
+def test_client_forwards_no_cache(
+        monkeypatch: any,
+        capsys: any
+    ) -> None:
+
+    requests: list[dict[str, any]] = []
+
+    def answer(socketPath: str, request: dict[str, any]) -> dict[str, any]:
+        requests.append(request)
+        return {"status": "ok", "sop": "a", "limit_reached": None}
+
+    monkeypatch.setattr(minimization_client, "request_minimization", answer)
+    optionArguments: dict[str, any] = {
+        "connect": "daemon.sock", "labels": None, "solver": "petrick", "engine": "exact", "strategy": "hash", "cache": False,
+        "timeLimit": None, "memoryLimit": None, "minterms": "1", "dontcares": None, "inputs": 1
+    }
+    assert minimize_with_daemon([], optionArguments, False) == 0
+    assert requests[0]["cache"] is False and requests[0]["solver"] == "petrick"
+    assert capsys.readouterr().out.strip() == "a"
+
+
+@pytest.mark.parametrize("option", [["--stats", "json"], ["--jobs", "2"], ["--convert"]])
+def test_client_rejects_options_the_daemon_cannot_apply(
+        option: list[str]
+    ) -> None:
+
+    # Rejected before any connection is made, the socket does not have to exist
+    command: list[str] = [sys.executable, os.path.join(PROJECT_DIRECTORY, "quine_mccluskey.py"), "--connect", "/nonexistent/daemon.sock", "-m", "0,1", *option]
+    completed: subprocess.CompletedProcess = subprocess.run(command, capture_output = True, text = True)
+    assert completed.returncode != 0
+    assert "daemon client cannot take" in completed.stderr + completed.stdout
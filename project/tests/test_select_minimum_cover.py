@@ -0,0 +1,135 @@
+import random
+import pytest
+from itertools import combinations
+from generate_prime_implicants import generate_prime_implicants_bitmask
+from select_minimum_cover import select_minimum_cover
+
+
+def cube_minterms(
+        cube: tuple[int, int]
+    ) -> set[int]:
+
+    value, mask = cube
+    minterms: set[int] = set()
+    subMask: int = mask
+    while True:
+        minterms.add(value | subMask)
+        if subMask == 0:
+            return minterms
+        subMask = (subMask - 1) & mask
+
+
+def cover_cost(
+        cover: list[tuple[int, int]],
+        mintermLength: int
+    ) -> tuple[int, int]:
+
+    return len(cover), sum(mintermLength - mask.bit_count() for _, mask in cover)
+
+
+def brute_force_cost(
+        primeImplicants: list[tuple[int, int, int]],
+        onsetCount: int,
+        mintermLength: int
+    ) -> tuple[int, int]:
+
+    # Smallest cube count first, the fewest literals among the covers of that size
+    allColumns: int = (1 << onsetCount) - 1
+    for size in range(len(primeImplicants) + 1):
+        literalCounts: list[int] = [
+            sum(mintermLength - mask.bit_count() for _, mask, _ in chosen)
+            for chosen in combinations(primeImplicants, size)
+            if sum_coverage(chosen) == allColumns
+            ]
+        if literalCounts:
+            return size, min(literalCounts)
+
+    raise AssertionError("The prime implicants do not cover the on-set")
+
+
+def sum_coverage(
+        chosen: tuple[tuple[int, int, int], ...]
+    ) -> int:
+
+    coverage: int = 0
+    for _, _, rowCoverage in chosen:
+        coverage |= rowCoverage
+    return coverage
+
+
+def check_cover(
+        cover: list[tuple[int, int]],
+        onset: list[int],
+        dontCares: list[int]
+    ) -> None:
+
+    covered: set[int] = set().union(*(cube_minterms(cube) for cube in cover))
+    assert covered >= set(onset)
+    assert covered <= set(onset) | set(dontCares)
+
+
+@pytest.mark.parametrize("solver", ["branch-and-bound", "petrick"])
+@pytest.mark.parametrize("mintermLength", [2, 3, 4])
+def test_random_functions_match_brute_force(
+        solver: str,
+        mintermLength: int
+    ) -> None:
+
+    rng: random.Random = random.Random(mintermLength)
+    for _ in range(40):
+        minterms: list[int] = list(range(1 << mintermLength))
+        rng.shuffle(minterms)
+        onsetCount: int = rng.randint(1, len(minterms))
+        dontCareCount: int = rng.randint(0, len(minterms) - onsetCount)
+        onset: list[int] = sorted(minterms[:onsetCount])
+        dontCares: list[int] = sorted(minterms[onsetCount:onsetCount + dontCareCount])
+
+        primeImplicants: list[tuple[int, int, int]] = generate_prime_implicants_bitmask(onset, dontCares, mintermLength)
+        cover: list[tuple[int, int]] = select_minimum_cover(primeImplicants, len(onset), mintermLength, solver)
+
+        check_cover(cover, onset, dontCares)
+        assert cover_cost(cover, mintermLength) == brute_force_cost(primeImplicants, len(onset), mintermLength)
+
+
+@pytest.mark.parametrize("solver", ["branch-and-bound", "petrick"])
+def test_cyclic_core(
+        solver: str
+    ) -> None:
+
+    # No essential primes and no dominance: six two-literal primes around a cycle, three of them cover it
+    onset: list[int] = [0, 1, 2, 5, 6, 7]
+    primeImplicants: list[tuple[int, int, int]] = generate_prime_implicants_bitmask(onset, [], 3)
+    assert len(primeImplicants) == 6
+
+    cover: list[tuple[int, int]] = select_minimum_cover(primeImplicants, len(onset), 3, solver)
+
+    check_cover(cover, onset, [])
+    assert cover_cost(cover, 3) == (3, 6)
+
+
+@pytest.mark.parametrize("solver", ["branch-and-bound", "petrick"])
+def test_cyclic_core_with_dont_care_only_rows(
+        solver: str
+    ) -> None:
+
+    # Over 4 inputs the don't cares 11 and 12 touch no on-set minterm, their primes get a row without any column
+    onset: list[int] = [0, 1, 2, 5, 6, 7]
+    dontCareOnly: list[tuple[int, int, int]] = [(11, 0, 0), (12, 0, 0)]
+    primeImplicants: list[tuple[int, int, int]] = dontCareOnly + generate_prime_implicants_bitmask(onset, [11, 12], 4)
+
+    cover: list[tuple[int, int]] = select_minimum_cover(primeImplicants, len(onset), 4, solver)
+
+    check_cover(cover, onset, [11, 12])
+    assert cover_cost(cover, 4) == (3, 9)
+    assert not set(cover) & {(value, mask) for value, mask, _ in dontCareOnly}
+
+
+def test_empty_onset() -> None:
+
+    assert select_minimum_cover([], 0, 3) == []
+
+
+def test_unknown_solver() -> None:
+
+    with pytest.raises(ValueError):
+        select_minimum_cover([(0, 0, 1)], 1, 1, "simplex")
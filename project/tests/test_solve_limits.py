@@ -0,0 +1,90 @@
+import os
+import sys
+import random
+import subprocess
+import pytest
+from global_constants import *
+from batch_minimize import parse_job_arguments, run_batch_job
+from multi_output import minimize_multi_output
+from minimization_daemon import build_daemon_job
+from solve_limits import SolveLimits, solving_within
+from incremental_minimization import iterate_cube_minterms
+
+PROJECT_DIRECTORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_minterms(
+        seed: int,
+        mintermLength: int
+    ) -> list[int]:
+
+    rng: random.Random = random.Random(seed)
+    return sorted(rng.sample(range(1 << mintermLength), 1 << mintermLength - 1))
+
+
+def covered_minterms(
+        cubes: list[tuple[int, int]]
+    ) -> set[int]:
+
+    covered: set[int] = set()
+    for cube in cubes:
+        covered.update(iterate_cube_minterms(*cube))
+    return covered
+
+
+def test_batch_job_limits() -> None:
+
+    jobDefaults: dict[str, any] = {"labels": None, "solver": "branch-and-bound", "engine": "exact", "strategy": "hash", "cache": False, "timeLimit": None, "memoryLimit": 1 << 40}
+    onset: list[int] = random_minterms(1, 10)
+    job: dict[str, any] = parse_job_arguments(["-m", ",".join(map(str, onset)), "-n", "10", "--time-limit", "0.000001"], "Test", "job", ".", jobDefaults)
+    assert job["timeLimit"] == 0.000001 and job["memoryLimit"] == 1 << 40
+
+    result: dict[str, any] = run_batch_job(0, job)
+    assert result["status"] == "ok"
+    assert result["limit_reached"] == "time" and not result["optimal"]
+    assert len(result["cubes"]) > 0
+
+    unlimited: dict[str, any] = run_batch_job(1, {**job, "minterms": "0,1,2,3", "inputs": 3, "timeLimit": None, "memoryLimit": None})
+    assert unlimited["optimal"] and unlimited["limit_reached"] is None
+
+    with pytest.raises(ValueError, match = "Test: Time limit"):
+        parse_job_arguments(["-m", "1", "--time-limit", "0"], "Test", "job", ".", jobDefaults)
+
+
+def test_daemon_request_limits() -> None:
+
+    jobDefaults: dict[str, any] = {"labels": None, "solver": "branch-and-bound", "engine": "exact", "strategy": "hash", "cache": False, "timeLimit": 5.0, "memoryLimit": None}
+    job: dict[str, any] = build_daemon_job({"minterms": [0, 1], "time_limit": 0.5, "memory_limit": "64M"}, jobDefaults)
+    assert job["timeLimit"] == 0.5 and job["memoryLimit"] == 64 << 20
+    assert build_daemon_job({"minterms": [0, 1]}, jobDefaults)["timeLimit"] == 5.0
+    with pytest.raises(ValueError):
+        build_daemon_job({"minterms": [0, 1], "time_limit": -1}, jobDefaults)
+
+
+def test_multi_output_cut_short_covers_every_output() -> None:
+
+    onsets: list[list[int]] = [random_minterms(seed, 9) for seed in (2, 3, 4)]
+    limits: SolveLimits = SolveLimits(0, None)
+    with solving_within(limits):
+        covers: list[list[tuple[int, int]]] = minimize_multi_output(onsets, [[], [], []], 9)
+    assert limits.limitReached == "time"
+    for onset, cover in zip(onsets, covers):
+        assert covered_minterms(cover) == set(onset)
+
+
+def test_limit_reached_exit_status(
+        tmp_path: any
+    ) -> None:
+
+    # The cover is still printed, only the exit status tells that it may not be minimum
+    environment: dict[str, str] = {**os.environ, "QM_CACHE_DIR": str(tmp_path)}
+    command: list[str] = [sys.executable, os.path.join(PROJECT_DIRECTORY, "quine_mccluskey.py"), "--no-cache"]
+    cutShort: subprocess.CompletedProcess = subprocess.run(
+        command + ["-m", ",".join(map(str, random_minterms(5, 10))), "-n", "10", "--time-limit", "0.000001"],
+        capture_output = True, text = True, env = environment
+        )
+    assert cutShort.returncode == LIMIT_REACHED_EXIT_STATUS
+    assert cutShort.stdout.strip()
+
+    finished: subprocess.CompletedProcess = subprocess.run(command + ["-m", "0,1,2,5", "-n", "3", "--time-limit", "600"], capture_output = True, text = True, env = environment)
+    assert finished.returncode == 0